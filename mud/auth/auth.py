@@ -4,32 +4,51 @@ Sistema de autenticação (login/registro)
 
 import asyncio
 from mud.utils.ansi import ANSI
-from mud.core.database import Database
+from typing import Callable, Optional
+from mud.core.storage import PlayerLoad, StorageBackend
+from mud.core.passwords import run_in_hash_pool
+from mud.utils.screens import screens
 
-async def authenticate(writer: asyncio.StreamWriter, reader: asyncio.StreamReader, database: Database) -> tuple[bool, str]:
+# Telas fixas do login/registro (renderizadas uma vez por perfil de cliente)
+screens.register('auth.welcome', lambda: (
+    f"\r\n{ANSI.BOLD}{ANSI.BRIGHT_CYAN}=== Bem-vindo ao MUD! ==={ANSI.RESET}\r\n"
+    f"{ANSI.BRIGHT_YELLOW}Você precisa fazer login ou criar uma conta.{ANSI.RESET}\r\n"
+))
+screens.register('auth.menu', lambda: (
+    f"\r\n{ANSI.BRIGHT_GREEN}1.{ANSI.RESET} Login\r\n"
+    f"{ANSI.BRIGHT_GREEN}2.{ANSI.RESET} Registrar\r\n"
+    f"{ANSI.BRIGHT_YELLOW}Escolha uma opção:{ANSI.RESET} "
+))
+screens.register('auth.login', lambda: f"\r\n{ANSI.BOLD}=== Login ==={ANSI.RESET}\r\n")
+screens.register('auth.register', lambda: f"\r\n{ANSI.BOLD}=== Registrar Nova Conta ==={ANSI.RESET}\r\n")
+screens.register('auth.username', lambda: f"{ANSI.BRIGHT_GREEN}Username:{ANSI.RESET} ")
+screens.register('auth.password', lambda: f"{ANSI.BRIGHT_GREEN}Senha:{ANSI.RESET} ")
+screens.register('auth.choose_username', lambda: f"{ANSI.BRIGHT_GREEN}Escolha um username:{ANSI.RESET} ")
+screens.register('auth.choose_password', lambda: f"{ANSI.BRIGHT_GREEN}Escolha uma senha:{ANSI.RESET} ")
+
+async def authenticate(writer: asyncio.StreamWriter, reader: asyncio.StreamReader, database: StorageBackend,
+                       in_memory: Optional[Callable[[str], bool]] = None) -> tuple[bool, str, Optional[PlayerLoad]]:
     """
     Processa autenticação (login/registro)
-    Retorna (sucesso, username)
+    in_memory(nome) indica jogadores com sessão já carregada: o login só autentica
+    Retorna (sucesso, username, dados carregados no login)
     """
-    writer.write(f"\r\n{ANSI.BOLD}{ANSI.BRIGHT_CYAN}=== Bem-vindo ao MUD! ==={ANSI.RESET}\r\n".encode())
-    writer.write(f"{ANSI.BRIGHT_YELLOW}Você precisa fazer login ou criar uma conta.{ANSI.RESET}\r\n".encode())
+    writer.write(screens.for_writer('auth.welcome', writer))
     await writer.drain()
     
     while True:
-        writer.write(f"\r\n{ANSI.BRIGHT_GREEN}1.{ANSI.RESET} Login\r\n".encode())
-        writer.write(f"{ANSI.BRIGHT_GREEN}2.{ANSI.RESET} Registrar\r\n".encode())
-        writer.write(f"{ANSI.BRIGHT_YELLOW}Escolha uma opção:{ANSI.RESET} ".encode())
+        writer.write(screens.for_writer('auth.menu', writer))
         await writer.drain()
         
         try:
             choice_data = await asyncio.wait_for(reader.readline(), timeout=30.0)
             if not choice_data:
-                return False, ""
+                return False, "", None
             
             choice = choice_data.decode().strip()
             
             if choice == "1":
-                return await login(writer, reader, database)
+                return await login(writer, reader, database, in_memory)
             elif choice == "2":
                 return await register(writer, reader, database)
             else:
@@ -38,61 +57,66 @@ async def authenticate(writer: asyncio.StreamWriter, reader: asyncio.StreamReade
         except asyncio.TimeoutError:
             writer.write(f"{ANSI.RED}Tempo esgotado.{ANSI.RESET}\r\n".encode())
             await writer.drain()
-            return False, ""
+            return False, "", None
 
-async def login(writer: asyncio.StreamWriter, reader: asyncio.StreamReader, database: Database) -> tuple[bool, str]:
-    """Processa login"""
-    writer.write(f"\r\n{ANSI.BOLD}=== Login ==={ANSI.RESET}\r\n".encode())
+async def login(writer: asyncio.StreamWriter, reader: asyncio.StreamReader, database: StorageBackend,
+                in_memory: Optional[Callable[[str], bool]] = None) -> tuple[bool, str, Optional[PlayerLoad]]:
+    """Processa login (conta e jogador são carregados em uma única consulta)"""
+    writer.write(screens.for_writer('auth.login', writer))
     await writer.drain()
     
     for attempt in range(3):
-        writer.write(f"{ANSI.BRIGHT_GREEN}Username:{ANSI.RESET} ".encode())
+        writer.write(screens.for_writer('auth.username', writer))
         await writer.drain()
         
         username_data = await asyncio.wait_for(reader.readline(), timeout=30.0)
         if not username_data:
-            return False, ""
+            return False, "", None
         
         username = username_data.decode().strip()
         
-        if not database.account_exists(username):
-            writer.write(f"{ANSI.RED}Conta não encontrada. Tente novamente.{ANSI.RESET}\r\n".encode())
-            await writer.drain()
-            continue
-        
-        writer.write(f"{ANSI.BRIGHT_GREEN}Senha:{ANSI.RESET} ".encode())
+        writer.write(screens.for_writer('auth.password', writer))
         await writer.drain()
         
         password_data = await asyncio.wait_for(reader.readline(), timeout=30.0)
         if not password_data:
-            return False, ""
+            return False, "", None
         
         password = password_data.decode().strip()
         
-        if database.verify_login(username, password):
+        # Consulta + KDF rodam no pool de hash, fora do loop do jogo.
+        # Sessão já em memória (link-dead/aberta): não carrega o jogador de novo
+        load_player = not (in_memory and in_memory(username))
+        load = await run_in_hash_pool(database.load_login, username, password, None, load_player)
+        if load is None:
+            writer.write(f"{ANSI.RED}Conta não encontrada. Tente novamente.{ANSI.RESET}\r\n".encode())
+            await writer.drain()
+            continue
+        
+        if load.authenticated:
             writer.write(f"{ANSI.BRIGHT_GREEN}Login realizado com sucesso!{ANSI.RESET}\r\n".encode())
             await writer.drain()
-            return True, username
+            return True, username, load
         
         writer.write(f"{ANSI.RED}Senha incorreta. Tentativas restantes: {2 - attempt}{ANSI.RESET}\r\n".encode())
         await writer.drain()
     
     writer.write(f"{ANSI.RED}Muitas tentativas falhas.{ANSI.RESET}\r\n".encode())
     await writer.drain()
-    return False, ""
+    return False, "", None
 
-async def register(writer: asyncio.StreamWriter, reader: asyncio.StreamReader, database: Database) -> tuple[bool, str]:
+async def register(writer: asyncio.StreamWriter, reader: asyncio.StreamReader, database: StorageBackend) -> tuple[bool, str, Optional[PlayerLoad]]:
     """Processa registro"""
-    writer.write(f"\r\n{ANSI.BOLD}=== Registrar Nova Conta ==={ANSI.RESET}\r\n".encode())
+    writer.write(screens.for_writer('auth.register', writer))
     await writer.drain()
     
     while True:
-        writer.write(f"{ANSI.BRIGHT_GREEN}Escolha um username:{ANSI.RESET} ".encode())
+        writer.write(screens.for_writer('auth.choose_username', writer))
         await writer.drain()
         
         username_data = await asyncio.wait_for(reader.readline(), timeout=30.0)
         if not username_data:
-            return False, ""
+            return False, "", None
         
         username = username_data.decode().strip()
         
@@ -106,21 +130,22 @@ async def register(writer: asyncio.StreamWriter, reader: asyncio.StreamReader, d
             await writer.drain()
             continue
         
-        writer.write(f"{ANSI.BRIGHT_GREEN}Escolha uma senha:{ANSI.RESET} ".encode())
+        writer.write(screens.for_writer('auth.choose_password', writer))
         await writer.drain()
         
         password_data = await asyncio.wait_for(reader.readline(), timeout=30.0)
         if not password_data:
-            return False, ""
+            return False, "", None
         
         password = password_data.decode().strip()
         
-        success, message = database.register_account(username, password)
+        success, message = await run_in_hash_pool(database.register_account, username, password)
         writer.write(f"{ANSI.BRIGHT_GREEN if success else ANSI.RED}{message}{ANSI.RESET}\r\n".encode())
         await writer.drain()
         
         if success:
-            return True, username
+            # Conta nova: sem jogador e sem teste de compatibilidade
+            return True, username, PlayerLoad(username=username, authenticated=True)
         
         # Permite tentar novamente
         writer.write(f"{ANSI.YELLOW}Tente novamente.{ANSI.RESET}\r\n".encode())
@@ -6,13 +6,206 @@ import unicodedata
 
 from typing import Optional, Dict, List
 from mud.core.models import Player, Monster, Room
-from mud.utils.ansi import ANSI, Colors
+from mud.utils.ansi import ANSI, ANSIBytes, Colors
 from mud.managers.world_manager import WorldManager
-from mud.core.database import Database
+from mud.core.storage import StorageBackend, lore_key, write_in_background
 from mud.managers.game_data import GameDataManager
 from mud.managers.lore_manager import LoreManager
 from mud.systems.combat import CombatSystem
 from mud.managers.quest_manager import QuestManager
+from mud.core.metrics import metrics
+from mud.net.capabilities import COLOR_NONE, capabilities_of
+from mud.utils.render_cache import room_render_cache
+from mud.utils.screens import screens
+from mud.utils.pager import Pager, line_pages, page_size_for
+from mud.utils.output import (
+    ANIMATION_FRAME_DELAY, ANIMATIONS_ENABLED, COMBAT_PAUSE, Fragment, OutputBuilder, OutputTimeline, encode_message
+)
+from mud.core.rate_limit import (
+    CATEGORY_CHAT, CATEGORY_COMBAT, CATEGORY_DEFAULT, CATEGORY_MOVEMENT,
+    CHAT_COMMANDS, COMBAT_COMMANDS, MOVEMENT_COMMANDS
+)
+
+# Comandos exclusivos do lobby (texto fixo, montado uma vez)
+LOBBY_COMMANDS = (
+    f"\r\n{Colors.SECTION}=== Comandos Exclusivos do Lobby ==={Colors.RESET}\r\n"
+    f"{Colors.COMMAND}afk [mensagem]{Colors.RESET} - Marca como AFK\r\n"
+    f"{Colors.COMMAND}voltar / back{Colors.RESET} - Volta do AFK\r\n"
+    f"{Colors.COMMAND}lobby{Colors.RESET} - Volta ao Hall de Entrada (de qualquer lugar)\r\n"
+    f"{Colors.COMMAND}respawn{Colors.RESET} - Regenera completamente HP e Stamina\r\n"
+    f"{Colors.COMMAND}server / status_server{Colors.RESET} - Mostra status do servidor\r\n"
+)
+
+# Comandos da ajuda organizados por categoria
+HELP_CATEGORIES = {
+    'movimento': {
+        'name': 'Movimento e Exploração',
+        'icon': '🚶',
+        'commands': [
+            ('look, l', 'Olha ao redor'),
+            ('norte, n / sul, s / leste, e / oeste, o', 'Move nas direções'),
+            ('entrar <porta>', 'Entra em uma dungeon/porta'),
+            ('sair', 'Sai da dungeon atual'),
+        ]
+    },
+    'comunicacao': {
+        'name': 'Comunicação',
+        'icon': '💬',
+        'commands': [
+            ('say <mensagem>', 'Fala algo na sala (local)'),
+            ('shout <mensagem>', 'Fala globalmente para todos'),
+            ('talk <nome>', 'Fala com NPC'),
+        ]
+    },
+    'combate': {
+        'name': 'Combate',
+        'icon': '⚔️',
+        'commands': [
+            ('attack <nome/id>', 'Ataca um monstro'),
+            ('use <nome>', 'Usa um item (pode usar durante combate!)'),
+            ('cast <magia> [alvo]', 'Lança uma magia'),
+        ]
+    },
+    'personagem': {
+        'name': 'Personagem',
+        'icon': '👤',
+        'commands': [
+            ('stats', 'Mostra suas estatísticas'),
+            ('inventory, inv, i [busca] [página]', 'Mostra inventário (com busca e paginação)'),
+            ('who, players, online', 'Lista jogadores online'),
+        ]
+    },
+    'magias': {
+        'name': 'Magias e Perks',
+        'icon': '✨',
+        'commands': [
+            ('spells, magias', 'Mostra suas magias'),
+            ('equipar <magia>', 'Equipa uma magia (max 3)'),
+            ('desequipar <magia>', 'Desequipa uma magia'),
+            ('melhorar <magia>', 'Melhora uma magia'),
+            ('aprender <magia>', 'Aprende uma nova magia'),
+            ('perks', 'Mostra seus perks'),
+            ('pontos magia <nome>', 'Distribui ponto em magia'),
+            ('pontos perk <nome>', 'Distribui ponto em perk'),
+        ]
+    },
+    'itens': {
+        'name': 'Itens e Inventário',
+        'icon': '🎒',
+        'commands': [
+            ('get <nome>', 'Pega item do chão'),
+            ('drop <nome>', 'Larga item'),
+            ('use <nome>', 'Usa um item'),
+        ]
+    },
+    'npc': {
+        'name': 'NPCs e Comércio',
+        'icon': '🏪',
+        'commands': [
+            ('shop <npc>', 'Lista itens à venda'),
+            ('buy <item> <npc>', 'Compra item de NPC'),
+            ('sell <item> <npc>', 'Vende item para NPC'),
+            ('trade <npc>', 'Troca itens com NPC'),
+        ]
+    },
+    'quests': {
+        'name': 'Quests',
+        'icon': '📜',
+        'commands': [
+            ('quest <npc>', 'Lista quests disponíveis'),
+            ('accept <quest> <npc>', 'Aceita uma quest'),
+            ('complete <quest> <npc>', 'Completa uma quest'),
+            ('cancel <quest>', 'Cancela uma quest ativa'),
+        ]
+    },
+    'informacao': {
+        'name': 'Informação',
+        'icon': '📖',
+        'commands': [
+            ('read <nome>', 'Lê lore de monstro/NPC'),
+            ('lore, world, intro', 'Lê a lore/introdução do mundo'),
+        ]
+    },
+    'lobby': {
+        'name': 'Comandos do Lobby',
+        'icon': '🏛️',
+        'commands': [
+            ('afk [mensagem]', 'Marca como AFK (só no lobby)'),
+            ('voltar / back', 'Volta do AFK (só no lobby)'),
+            ('lobby', 'Volta ao Hall de Entrada de qualquer lugar'),
+            ('respawn', 'Regenera HP e Stamina (só no lobby)'),
+            ('server / status_server', 'Mostra status do servidor (só no lobby)'),
+        ]
+    },
+    'sistema': {
+        'name': 'Sistema',
+        'icon': '⚙️',
+        'commands': [
+            ('help, ? [página]', 'Mostra esta ajuda'),
+            ('more, next', 'Próxima página da última listagem'),
+            ('quit, exit', 'Sai do jogo'),
+        ]
+    }
+}
+
+# Categorias por página da ajuda
+HELP_PAGE_SIZE = 3
+HELP_PAGES = [
+    list(HELP_CATEGORIES.items())[i:i + HELP_PAGE_SIZE]
+    for i in range(0, len(HELP_CATEGORIES), HELP_PAGE_SIZE)
+]
+
+
+def render_help_page(page_num: int) -> str:
+    """Página da ajuda com todas as categorias"""
+    total_pages = len(HELP_PAGES)
+    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Comandos Disponíveis ==={ANSI.RESET}\r\n"
+    message += f"{ANSI.BRIGHT_BLACK}Página {page_num}/{total_pages}{ANSI.RESET}\r\n\r\n"
+    
+    for cat_id, cat_data in HELP_PAGES[page_num - 1]:
+        message += f"{ANSI.BOLD}{cat_data['icon']} {cat_data['name']}{ANSI.RESET}\r\n"
+        for cmd, desc in cat_data['commands']:
+            message += f"  {ANSI.BRIGHT_GREEN}{cmd:<28}{ANSI.RESET} - {desc}\r\n"
+        message += "\r\n"
+    
+    # Navegação
+    if total_pages > 1:
+        message += f"{ANSI.BRIGHT_CYAN}Navegação:{ANSI.RESET}\r\n"
+        if page_num > 1:
+            message += f"  {ANSI.BRIGHT_GREEN}help {page_num - 1}{ANSI.RESET} - Página anterior\r\n"
+        if page_num < total_pages:
+            message += f"  {ANSI.BRIGHT_GREEN}help {page_num + 1}{ANSI.RESET} - Próxima página\r\n"
+        message += f"  {ANSI.BRIGHT_GREEN}help <categoria>{ANSI.RESET} - Ver categoria específica\r\n"
+    
+    message += f"\r\n{ANSI.BRIGHT_YELLOW}Dica: Use 'help <categoria>' para ver apenas uma categoria específica{ANSI.RESET}\r\n"
+    message += f"{ANSI.BRIGHT_YELLOW}Exemplo: help movimento, help combate, help magias{ANSI.RESET}\r\n"
+    return message
+
+
+def render_help_category(cat_id: str) -> str:
+    """Ajuda de uma única categoria"""
+    cat = HELP_CATEGORIES[cat_id]
+    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}{cat['icon']} {cat['name']}{ANSI.RESET}\r\n\r\n"
+    for cmd, desc in cat['commands']:
+        message += f"{ANSI.BRIGHT_GREEN}{cmd:<30}{ANSI.RESET} - {desc}\r\n"
+    message += f"\r\n{ANSI.BRIGHT_CYAN}Use: help [página] para ver todas as categorias{ANSI.RESET}\r\n"
+    return message
+
+
+def render_inventory_footer() -> str:
+    """Dicas do menu de categorias do inventário"""
+    message = f"\r\n{Colors.HINT}Digite o número da categoria ou: {Colors.COMMAND}inventory <categoria> [busca] [página]{Colors.RESET}\r\n"
+    message += f"{Colors.HINT}Exemplos:{Colors.RESET}\r\n"
+    message += f"  {Colors.COMMAND}inventory 1{Colors.RESET} - Ver armas\r\n"
+    message += f"  {Colors.COMMAND}inventory consumable{Colors.RESET} - Ver consumíveis\r\n"
+    message += f"  {Colors.COMMAND}inventory 2 poção{Colors.RESET} - Buscar 'poção' em armaduras\r\n"
+    return message
+
+
+screens.register('help.page', render_help_page, variants=[(n,) for n in range(1, len(HELP_PAGES) + 1)])
+screens.register('help.category', render_help_category, variants=[(cat_id,) for cat_id in HELP_CATEGORIES])
+screens.register('inventory.header', lambda: f"\r\n{Colors.TITLE}=== Inventário - Escolha uma Categoria ==={Colors.RESET}\r\n\r\n")
+screens.register('inventory.footer', render_inventory_footer)
 
 class CommandHandler:
     """Processa comandos dos jogadores"""
@@ -445,7 +638,7 @@ class CommandHandler:
         'baixo': 'cima',
     }
     
-    def __init__(self, game, world_manager: WorldManager, database: Database, 
+    def __init__(self, game, world_manager: WorldManager, database: StorageBackend, 
                  game_data: GameDataManager, lore_manager: LoreManager, quest_manager: QuestManager, world_lore_manager=None, dungeon_manager=None):
         self.game = game
         self.world_manager = world_manager
@@ -473,6 +666,12 @@ class CommandHandler:
         self.in_combat: dict[str, str] = {}  # player_name -> monster_id
         # Estado do combate estilo Pokémon (armazena informações do combate atual)
         self.combat_state: dict[str, dict] = {}  # player_name -> {monster_instance_id, turn_waiting, etc}
+        # Saída agendada (animações) por jogador
+        self.timelines: Dict[str, OutputTimeline] = {}
+        # Listagens paginadas em andamento (cursor do 'more') por jogador
+        self.pagers: Dict[str, Pager] = {}
+        # Saída do comando em execução, enviada junto com o prompt (flush_output)
+        self.pending_output: Dict[str, bytearray] = {}
         
         # Sistema de identificadores de monstros (estilo MUD tradicional)
         # {world_id: {room_id: {monster_instance_id: Monster}}}
@@ -491,6 +690,9 @@ class CommandHandler:
             'online': (self.cmd_who, False, False),  # alias adicional
             'help': (self.cmd_help, True, False),  # Aceita args opcionais (página/categoria)
             '?': (self.cmd_help, True, False),
+            'more': (self.cmd_more, False, False),  # Próxima página da última listagem
+            'mais': (self.cmd_more, False, False),
+            'next': (self.cmd_more, False, False),
             'afk': (self.cmd_afk, True, False),  # Comando exclusivo do lobby
             'voltar': (self.cmd_voltar, False, False),  # Comando exclusivo do lobby
             'back': (self.cmd_voltar, False, False),  # alias
@@ -571,6 +773,25 @@ class CommandHandler:
             'distribute': (self.cmd_distribute_points, True, True),
         }
     
+    def get_command_category(self, player: Player, command: str) -> str:
+        """Classifica um comando para o controle de taxa (chat, movimento, combate ou padrão)"""
+        parts = command.strip().lower().split()
+        if not parts:
+            return CATEGORY_DEFAULT
+        cmd = parts[0]
+        
+        # Escolhas do menu de combate contam como combate
+        if player.name in self.in_combat or cmd in COMBAT_COMMANDS:
+            return CATEGORY_COMBAT
+        if cmd in CHAT_COMMANDS:
+            return CATEGORY_CHAT
+        if cmd in self.directions or cmd in MOVEMENT_COMMANDS:
+            return CATEGORY_MOVEMENT
+        room = self.world_manager.get_room(player.world_id, player.room_id, self.dungeon_manager)
+        if room and cmd in room.exits:
+            return CATEGORY_MOVEMENT
+        return CATEGORY_DEFAULT
+    
     async def handle_command(self, player: Player, command: str):
         """
         Processa um comando do jogador usando dispatch table para melhor performance.
@@ -665,27 +886,26 @@ class CommandHandler:
         if self.dungeon_manager and self.dungeon_manager.is_dungeon_room(player.world_id, player.room_id):
             await self._spawn_dungeon_entities(player, player.room_id)
         
-        message = f"\r\n{Colors.TITLE}{room.name}{Colors.RESET}\r\n"
-        message += f"{Colors.SEPARATOR}{'=' * len(room.name)}{Colors.RESET}\r\n\r\n"
+        # Cabeçalho da sala (igual para todos os jogadores): vem do cache de renderização
+        message = room_render_cache.get_or_render(
+            ('header', player.world_id, player.room_id),
+            lambda: self._render_room_header(room)
+        )
         
-        # Descrição da sala + lore (apenas se ainda não foi vista)
-        message += f"{Colors.DESCRIPTION}{room.description}{Colors.RESET}\r\n"
+        # Lore da sala (apenas se ainda não foi vista)
         room_lore = self.lore_manager.get_room_lore(player.world_id, player.room_id)
         if room_lore and 'story' in room_lore:
-            # Verifica se o jogador já viu esta lore
-            if not self.database.has_viewed_lore(player.name, player.world_id, player.room_id):
+            # Verifica se o jogador já viu esta lore (conjunto carregado no login)
+            viewed = lore_key(player.world_id, player.room_id)
+            if viewed not in player.viewed_lores:
                 message += f"\r\n{Colors.INFO}{room_lore['story']}{Colors.RESET}\r\n"
-                # Marca como vista
-                self.database.mark_lore_as_viewed(player.name, player.world_id, player.room_id)
+                # Marca como vista; a gravação no banco roda em segundo plano
+                player.viewed_lores.add(viewed)
+                write_in_background(self.database.mark_lore_as_viewed, player.name, player.world_id, player.room_id)
         
         # Informações especiais do lobby
         if player.room_id == "lobby":
-            message += f"\r\n{Colors.SECTION}=== Comandos Exclusivos do Lobby ==={Colors.RESET}\r\n"
-            message += f"{Colors.COMMAND}afk [mensagem]{Colors.RESET} - Marca como AFK\r\n"
-            message += f"{Colors.COMMAND}voltar / back{Colors.RESET} - Volta do AFK\r\n"
-            message += f"{Colors.COMMAND}lobby{Colors.RESET} - Volta ao Hall de Entrada (de qualquer lugar)\r\n"
-            message += f"{Colors.COMMAND}respawn{Colors.RESET} - Regenera completamente HP e Stamina\r\n"
-            message += f"{Colors.COMMAND}server / status_server{Colors.RESET} - Mostra status do servidor\r\n"
+            message += LOBBY_COMMANDS
         
         message += "\r\n"
         
@@ -712,8 +932,49 @@ class CommandHandler:
         
         monster_instances = self.monster_instances[player.world_id].get(player.room_id, {})
         
+        # Texto ao lado do ASCII art ajustado à largura informada pelo cliente (NAWS)
+        side_text_width = min(55, capabilities_of(player.writer).layout_width - 22 - 2)
+        
+        # Versão do estado da sala: muda quando monstros (vida, nível...), NPCs ou itens mudam
+        state_version = (
+            bool(monster_instances),
+            tuple(
+                (instance_id, monster.id, monster.name, monster.level, monster.current_hp,
+                 monster.max_hp, monster.weapon, monster.race_id)
+                for instance_id, monster in sorted(monster_instances.items())
+                if monster and monster.is_alive()
+            ),
+            tuple(entities['npcs']),
+            tuple(entities['items']),
+        )
+        message += room_render_cache.get_or_render(
+            ('entities', player.world_id, player.room_id, side_text_width, state_version),
+            lambda: self._render_room_entities(player.world_id, monster_instances, entities, side_text_width)
+        )
+        message += room_render_cache.get_or_render(
+            ('exits', player.world_id, player.room_id),
+            lambda: self._render_room_exits(player.world_id, player.room_id, room)
+        )
+        
+        # Mostra outros jogadores na sala
+        other_players = [p.name for p in self.game.get_players_in_room(player.world_id, player.room_id) if p.name != player.name]
+        if other_players:
+            message += f"\r\n{Colors.WARNING}Também aqui:{Colors.RESET} {Colors.PLAYER}{', '.join(other_players)}{Colors.RESET}\r\n"
+        
+        await self.send_message(player, message)
+    
+    def _render_room_header(self, room: Room) -> str:
+        """Título e descrição da sala"""
+        text = f"\r\n{Colors.TITLE}{room.name}{Colors.RESET}\r\n"
+        text += f"{Colors.SEPARATOR}{'=' * len(room.name)}{Colors.RESET}\r\n\r\n"
+        text += f"{Colors.DESCRIPTION}{room.description}{Colors.RESET}\r\n"
+        return text
+    
+    def _render_room_entities(self, world_id: str, monster_instances: Dict[int, Monster], entities: Dict, side_text_width: int) -> str:
+        """Monstros (ASCII art + vida), NPCs e itens no chão"""
+        text = ""
         if monster_instances:
-            message += f"{Colors.MONSTER}Monstros aqui:{Colors.RESET}\r\n"
+            text += f"{Colors.MONSTER}Monstros aqui:{Colors.RESET}\r\n"
             # Ordena por ID para mostrar em ordem
             from mud.utils.visuals import get_monster_ascii, format_hp_bar, format_ascii_with_text
             for monster_instance_id in sorted(monster_instances.keys()):
@@ -739,52 +1000,52 @@ class CommandHandler:
                     monster_info += f"\r\n{format_monster_hp_bar(monster.current_hp, monster.max_hp, 'HP')}"
                     
                     # Formata monstro com ASCII à esquerda e informações à direita
-                    formatted_monster = format_ascii_with_text(monster_ascii, monster_info, ascii_width=22)
-                    message += f"{formatted_monster}\r\n\r\n"
+                    formatted_monster = format_ascii_with_text(monster_ascii, monster_info, ascii_width=22, max_text_width=side_text_width)
+                    text += f"{formatted_monster}\r\n\r\n"
         
         # NPCs
         if entities['npcs']:
-            message += f"{Colors.NPC}NPCs aqui:{Colors.RESET}\r\n"
+            text += f"{Colors.NPC}NPCs aqui:{Colors.RESET}\r\n"
             from mud.utils.visuals import get_npc_ascii, format_ascii_with_text
             for npc_id in entities['npcs']:
-                npc = self.game_data.get_npc(player.world_id, npc_id)
+                npc = self.game_data.get_npc(world_id, npc_id)
                 if npc:
                     npc_ascii = get_npc_ascii(npc.npc_type)
                     # Formata NPC com ASCII à esquerda e informações à direita
                     npc_info = f"{Colors.NPC}{npc.name}{Colors.RESET}"
                     if npc.description:
                         npc_info += f" {Colors.DESCRIPTION}{npc.description}{Colors.RESET}"
-                    formatted_npc = format_ascii_with_text(npc_ascii, npc_info, ascii_width=22)
-                    message += f"{formatted_npc}\r\n\r\n"
+                    formatted_npc = format_ascii_with_text(npc_ascii, npc_info, ascii_width=22, max_text_width=side_text_width)
+                    text += f"{formatted_npc}\r\n\r\n"
         
         # Itens no chão
         if entities['items']:
-            message += f"\r\n{Colors.ITEM}Itens aqui:{Colors.RESET} "
+            text += f"\r\n{Colors.ITEM}Itens aqui:{Colors.RESET} "
             item_names = []
             for item_id in entities['items']:
                 item = self.game_data.get_item(item_id)
                 if item:
                     item_names.append(f"{Colors.ITEM}{item.name}{Colors.RESET}")
-            message += f"{', '.join(item_names)}\r\n"
+            text += f"{', '.join(item_names)}\r\n"
         
+        return text
+    
+    def _render_room_exits(self, world_id: str, room_id: str, room: Room) -> str:
+        """Saídas e porta de dungeon da sala"""
+        text = ""
         # Mostra saídas disponíveis
         if room.exits:
             exits = list(room.exits.keys())
-            message += f"\r\n{Colors.INFO}Saídas:{Colors.RESET} {Colors.COMMAND}{', '.join(exits)}{Colors.RESET}\r\n"
+            text += f"\r\n{Colors.INFO}Saídas:{Colors.RESET} {Colors.COMMAND}{', '.join(exits)}{Colors.RESET}\r\n"
         
         # Mostra portas de dungeon se houver
         if self.dungeon_manager:
-            dungeon = self.dungeon_manager.get_dungeon_by_entry_room(player.world_id, player.room_id)
+            dungeon = self.dungeon_manager.get_dungeon_by_entry_room(world_id, room_id)
             if dungeon:
-                message += f"\r\n{Colors.CATEGORY}Porta:{Colors.RESET} {Colors.ITEM}{dungeon['name']}{Colors.RESET}\r\n"
-                message += f"{Colors.HINT}Use: {Colors.COMMAND}{dungeon.get('entry_command', 'entrar')}{Colors.RESET}\r\n"
+                text += f"\r\n{Colors.CATEGORY}Porta:{Colors.RESET} {Colors.ITEM}{dungeon['name']}{Colors.RESET}\r\n"
+                text += f"{Colors.HINT}Use: {Colors.COMMAND}{dungeon.get('entry_command', 'entrar')}{Colors.RESET}\r\n"
         
-        # Mostra outros jogadores na sala
-        other_players = [p.name for p in self.game.get_players_in_room(player.world_id, player.room_id) if p.name != player.name]
-        if other_players:
-            message += f"\r\n{Colors.WARNING}Também aqui:{Colors.RESET} {Colors.PLAYER}{', '.join(other_players)}{Colors.RESET}\r\n"
-        
-        await self.send_message(player, message)
+        return text
     
     async def cmd_move(self, player: Player, direction: str):
         """Comando move - move o jogador para outra sala"""
@@ -922,7 +1183,7 @@ class CommandHandler:
             'spell_cooldowns': player.spell_cooldowns,
             'unspent_points': player.unspent_points
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
         
         # Notifica outros jogadores na sala antiga
         await self.game.broadcast_to_room(
@@ -1299,7 +1560,7 @@ class CommandHandler:
             'hp': player.current_hp,
             'max_hp': player.max_hp
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
         
         return True
     
@@ -1494,7 +1755,7 @@ class CommandHandler:
         # Ataque do jogador
         result = await CombatSystem.attack_monster(
             player, monster,
-            lambda msg: self.send_message(player, msg),
+            lambda msg, delay=0.0: self.send_message(player, msg, delay),
             self.game_data
         )
         
@@ -1527,14 +1788,8 @@ class CommandHandler:
         player.spell_cooldowns[spell_id] = time.time() + spell.cooldown
         
         # Animação de magia
-        from mud.utils.visuals import get_spell_animation, get_heal_animation
-        import asyncio
-        
         if spell.damage_type == 'heal':
-            animation = get_heal_animation()
-            for frame in animation:
-                await self.send_message(player, f"\r{ANSI.BRIGHT_MAGENTA}{frame}{ANSI.RESET}")
-                await asyncio.sleep(0.1)
+            await self._play_animation(player, 'heal')
             
             # Cura
             spell_level = player.get_spell_level(spell_id)
@@ -1555,10 +1810,7 @@ class CommandHandler:
             await self._monsters_turn(player, monster, monster_instance_id, world_id, room_id)
         else:
             # Magia de dano
-            animation = get_spell_animation()
-            for frame in animation:
-                await self.send_message(player, f"\r{ANSI.BRIGHT_MAGENTA}{frame}{ANSI.RESET}")
-                await asyncio.sleep(0.1)
+            await self._play_animation(player, 'spell')
             
             # Chance de falha
             import random
@@ -1659,15 +1911,14 @@ class CommandHandler:
             'active_perks': player.active_perks,
             'spell_cooldowns': player.spell_cooldowns
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
         
         # Após usar item, monstros atacam
         await self._monsters_turn(player, monster, monster_instance_id, world_id, room_id)
     
     async def _monsters_turn(self, player: Player, monster: Monster, monster_instance_id: int, world_id: str, room_id: str):
         """Executa turno dos monstros (após jogador usar item ou magia)"""
-        import asyncio
-        await asyncio.sleep(0.3)
+        self._pause(player, COMBAT_PAUSE)
         
         if not monster.is_alive():
             await self._handle_monster_death(player, monster, monster_instance_id, world_id, room_id)
@@ -1683,13 +1934,13 @@ class CommandHandler:
         if monster.weapon:
             weapon_info = f" com {monster.weapon}"
         
-        await self.send_message(player, f"{ANSI.RED}👹 {monster.name}{level_info} ataca você{weapon_info} causando {actual_damage} de dano! 💥{ANSI.RESET}\r\n")
-        
+        # Ataque e barras do jogador saem numa única escrita
         from mud.utils.visuals import format_hp_bar, format_stamina_bar
-        player_hp_bar = format_hp_bar(player.current_hp, player.max_hp)
-        player_stamina_bar = format_stamina_bar(player.current_stamina, player.max_stamina)
-        await self.send_message(player, f"{player_hp_bar}\r\n")
-        await self.send_message(player, f"{player_stamina_bar}\r\n")
+        output = OutputBuilder()
+        output.message(ANSIBytes.RED, f"👹 {monster.name}{level_info} ataca você{weapon_info} causando {actual_damage} de dano! 💥", ANSIBytes.RESET)
+        output.message(format_hp_bar(player.current_hp, player.max_hp))
+        output.message(format_stamina_bar(player.current_stamina, player.max_stamina))
+        await self.send_output(player, output)
         
         if not player.is_alive():
             await self._handle_player_death(player)
@@ -1762,7 +2013,7 @@ class CommandHandler:
             'spell_cooldowns': player.spell_cooldowns,
             'unspent_points': player.unspent_points
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
         
         # Ouro
         gold_gained = CombatSystem.drop_gold(monster)
@@ -1785,7 +2036,6 @@ class CommandHandler:
     
     async def _check_and_start_next_combat(self, player: Player, world_id: str, room_id: str):
         """Verifica se há mais monstros na sala e inicia combate automático"""
-        import asyncio
         entities = self.game_data.get_room_entities(world_id, room_id)
         
         # Garante que há instâncias de monstros
@@ -1798,7 +2048,8 @@ class CommandHandler:
             if monster and monster.is_alive():
                 # Inicia combate automático com este monstro
                 await self.send_message(player, f"{ANSI.BRIGHT_YELLOW}✨ {monster.name} aparece! ✨{ANSI.RESET}\r\n")
-                await asyncio.sleep(0.5)
+                
+                self._pause(player, 0.5)
                 
                 # Inicia combate
                 self.in_combat[player.name] = f"{world_id}:{room_id}:{instance_id}"
@@ -2222,13 +2473,6 @@ class CommandHandler:
         
         await self.send_message(player, message)
     
-    def _paginate_list(self, items: List, items_per_page: int = 10) -> List[List]:
-        """Divide uma lista em páginas"""
-        pages = []
-        for i in range(0, len(items), items_per_page):
-            pages.append(items[i:i + items_per_page])
-        return pages if pages else [[]]
-    
     async def cmd_inventory(self, player: Player, args: str = ""):
         """Comando inventory - mostra menu de categorias primeiro, depois itens da categoria escolhida"""
         from collections import Counter
@@ -2339,10 +2583,9 @@ class CommandHandler:
                 await self.send_message(player, f"{Colors.WARNING}Nenhum item em {category_name}.{Colors.RESET}")
             return
         
-        # Paginação
+        # Paginação: cada página só é montada quando enviada (página pedida ou 'more')
         items_per_page = 8
-        pages = self._paginate_list(filtered_items, items_per_page)
-        total_pages = len(pages)
+        total_pages = max(1, -(-len(filtered_items) // items_per_page))
         
         # Valida página
         if page_num < 1:
@@ -2350,8 +2593,6 @@ class CommandHandler:
         elif page_num > total_pages:
             page_num = total_pages
         
-        current_page = pages[page_num - 1]
-        
         # Monta mensagem (versão compacta e resumida)
         category_name = {
             'weapon': '⚔ Armas',
@@ -2360,61 +2601,66 @@ class CommandHandler:
             'misc': '📦 Miscelânea',
             'all': '📋 Todos os Itens'
         }.get(category_choice, category_choice.capitalize())
-        
-        message = f"\r\n{Colors.TITLE}=== Inventário: {category_name} ==={Colors.RESET}\r\n"
-        
-        if search_term:
-            message += f"{Colors.LABEL}Busca: '{search_term}'{Colors.RESET}\r\n"
-        
         total_items = sum(count for _, count, _ in filtered_items)
-        message += f"{Colors.HINT}Página {page_num}/{total_pages} | {len(filtered_items)} tipos | {total_items} itens totais{Colors.RESET}\r\n\r\n"
         
-        # Mostra itens da categoria (já filtrados)
-        for item_id, count, item in current_page:
-            if item:
-                # Versão compacta: nome, quantidade, raridade, stats resumidos
-                count_text = f"{Colors.VALUE}x{count}{Colors.RESET}" if count > 1 else ""
-                rarity_color = item.get_rarity_color()
-                rarity_text = f" {Colors.HINT}[{item.rarity.upper()}]{Colors.RESET}" if item.rarity != "common" else ""
-                
-                # Verifica se está equipado
-                is_equipped = player.is_item_equipped(item_id)
-                equipped_text = f" {Colors.SUCCESS}[E]{Colors.RESET}" if is_equipped else ""
-                
-                # Stats resumidos em uma linha
-                stats_parts = []
-                if item.type in ['weapon', 'armor'] and item.stats:
-                    if item.stats.get('attack', 0) > 0:
-                        stats_parts.append(f"{Colors.INFO}+{item.stats['attack']}⚔{Colors.RESET}")
-                    if item.stats.get('defense', 0) > 0:
-                        stats_parts.append(f"{Colors.INFO}+{item.stats['defense']}🛡{Colors.RESET}")
-                
-                stats_text = f" {' '.join(stats_parts)}" if stats_parts else ""
-                
-                # Linha compacta: nome, quantidade, raridade, stats, equipado
-                message += f"  {rarity_color}{item.name}{Colors.RESET} {count_text}{rarity_text}{stats_text}{equipped_text}\r\n"
-            else:
-                message += f"  {Colors.WARNING}[Item não encontrado: {item_id}]{Colors.RESET} {Colors.VALUE}x{count}{Colors.RESET}\r\n"
-        
-        message += "\r\n"
-        
-        # Resumo total
-        message += f"{Colors.INFO}Total: {total_items} itens em {len(filtered_items)} tipos diferentes{Colors.RESET}\r\n"
-        
-        if total_pages > 1:
-            message += f"\r\n{Colors.LABEL}Navegação:{Colors.RESET}\r\n"
-            if page_num > 1:
-                nav_cmd = f"inventory {category_choice} {search_term} {page_num - 1}".strip() if search_term else f"inventory {category_choice} {page_num - 1}".strip()
-                message += f"  {Colors.COMMAND}{nav_cmd}{Colors.RESET} - Página anterior\r\n"
-            if page_num < total_pages:
-                nav_cmd = f"inventory {category_choice} {search_term} {page_num + 1}".strip() if search_term else f"inventory {category_choice} {page_num + 1}".strip()
-                message += f"  {Colors.COMMAND}{nav_cmd}{Colors.RESET} - Próxima página\r\n"
-        
-        message += f"\r\n{Colors.HINT}Use: {Colors.COMMAND}inventory{Colors.RESET} para ver categorias\r\n"
-        if search_term:
-            message += f"{Colors.HINT}Use: {Colors.COMMAND}inventory {category_choice}{Colors.RESET} para ver todos os itens desta categoria\r\n"
+        def render_page(page_num: int) -> str:
+            start = (page_num - 1) * items_per_page
+            current_page = filtered_items[start:start + items_per_page]
+            
+            message = f"\r\n{Colors.TITLE}=== Inventário: {category_name} ==={Colors.RESET}\r\n"
+            
+            if search_term:
+                message += f"{Colors.LABEL}Busca: '{search_term}'{Colors.RESET}\r\n"
+            
+            message += f"{Colors.HINT}Página {page_num}/{total_pages} | {len(filtered_items)} tipos | {total_items} itens totais{Colors.RESET}\r\n\r\n"
+            
+            # Mostra itens da categoria (já filtrados)
+            for item_id, count, item in current_page:
+                if item:
+                    # Versão compacta: nome, quantidade, raridade, stats resumidos
+                    count_text = f"{Colors.VALUE}x{count}{Colors.RESET}" if count > 1 else ""
+                    rarity_color = item.get_rarity_color()
+                    rarity_text = f" {Colors.HINT}[{item.rarity.upper()}]{Colors.RESET}" if item.rarity != "common" else ""
+                    
+                    # Verifica se está equipado
+                    is_equipped = player.is_item_equipped(item_id)
+                    equipped_text = f" {Colors.SUCCESS}[E]{Colors.RESET}" if is_equipped else ""
+                    
+                    # Stats resumidos em uma linha
+                    stats_parts = []
+                    if item.type in ['weapon', 'armor'] and item.stats:
+                        if item.stats.get('attack', 0) > 0:
+                            stats_parts.append(f"{Colors.INFO}+{item.stats['attack']}⚔{Colors.RESET}")
+                        if item.stats.get('defense', 0) > 0:
+                            stats_parts.append(f"{Colors.INFO}+{item.stats['defense']}🛡{Colors.RESET}")
+                    
+                    stats_text = f" {' '.join(stats_parts)}" if stats_parts else ""
+                    
+                    # Linha compacta: nome, quantidade, raridade, stats, equipado
+                    message += f"  {rarity_color}{item.name}{Colors.RESET} {count_text}{rarity_text}{stats_text}{equipped_text}\r\n"
+                else:
+                    message += f"  {Colors.WARNING}[Item não encontrado: {item_id}]{Colors.RESET} {Colors.VALUE}x{count}{Colors.RESET}\r\n"
+            
+            message += "\r\n"
+            
+            # Resumo total
+            message += f"{Colors.INFO}Total: {total_items} itens em {len(filtered_items)} tipos diferentes{Colors.RESET}\r\n"
+            
+            if total_pages > 1:
+                message += f"\r\n{Colors.LABEL}Navegação:{Colors.RESET}\r\n"
+                if page_num > 1:
+                    nav_cmd = f"inventory {category_choice} {search_term} {page_num - 1}".strip() if search_term else f"inventory {category_choice} {page_num - 1}".strip()
+                    message += f"  {Colors.COMMAND}{nav_cmd}{Colors.RESET} - Página anterior\r\n"
+                if page_num < total_pages:
+                    nav_cmd = f"inventory {category_choice} {search_term} {page_num + 1}".strip() if search_term else f"inventory {category_choice} {page_num + 1}".strip()
+                    message += f"  {Colors.COMMAND}{nav_cmd}{Colors.RESET} - Próxima página\r\n"
+            
+            message += f"\r\n{Colors.HINT}Use: {Colors.COMMAND}inventory{Colors.RESET} para ver categorias\r\n"
+            if search_term:
+                message += f"{Colors.HINT}Use: {Colors.COMMAND}inventory {category_choice}{Colors.RESET} para ver todos os itens desta categoria\r\n"
+            return message
         
-        await self.send_message(player, message)
+        await self.send_paged(player, (render_page(n) for n in range(page_num, total_pages + 1)))
     
     async def _show_inventory_categories(self, player: Player):
         """Mostra menu de categorias do inventário"""
@@ -2438,8 +2684,8 @@ class CommandHandler:
             if item and item.type in category_counts:
                 category_counts[item.type] += count
         
-        # Monta menu
-        message = f"\r\n{Colors.TITLE}=== Inventário - Escolha uma Categoria ==={Colors.RESET}\r\n\r\n"
+        # Monta menu: cabeçalho e dicas pré-renderizados, só as contagens são do jogador
+        message = ""
         
         categories = [
             ('weapon', '⚔ Armas', category_counts['weapon']),
@@ -2453,13 +2699,12 @@ class CommandHandler:
             if count > 0 or cat_id == 'all':
                 message += f"  {Colors.VALUE}{i}{Colors.RESET} - {Colors.CATEGORY}{cat_name}{Colors.RESET} ({Colors.NUMBER}{count}{Colors.RESET} itens)\r\n"
         
-        message += f"\r\n{Colors.HINT}Digite o número da categoria ou: {Colors.COMMAND}inventory <categoria> [busca] [página]{Colors.RESET}\r\n"
-        message += f"{Colors.HINT}Exemplos:{Colors.RESET}\r\n"
-        message += f"  {Colors.COMMAND}inventory 1{Colors.RESET} - Ver armas\r\n"
-        message += f"  {Colors.COMMAND}inventory consumable{Colors.RESET} - Ver consumíveis\r\n"
-        message += f"  {Colors.COMMAND}inventory 2 poção{Colors.RESET} - Buscar 'poção' em armaduras\r\n"
-        
-        await self.send_message(player, message)
+        await self.send_bytes(
+            player,
+            screens.for_writer('inventory.header', player.writer)
+            + message.encode()
+            + screens.for_writer('inventory.footer', player.writer)
+        )
     
     async def cmd_get(self, player: Player, item_name: str):
         """Comando get - pega item do chão"""
@@ -2513,7 +2758,7 @@ class CommandHandler:
                                 'quest_progress': player.quest_progress,
                                 'completed_quests': player.completed_quests
                             }
-                            self.database.update_player_stats(player.name, stats)
+                            self.game.journal.record(player.name, stats)
                             
                             # Verifica se completou
                             if self.quest_manager.check_quest_completion(quest, player.quest_progress[quest_id]):
@@ -2691,7 +2936,7 @@ class CommandHandler:
             'active_perks': player.active_perks,
             'spell_cooldowns': player.spell_cooldowns
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
     
     async def cmd_equip(self, player: Player, item_name: str):
         """Comando equip - equipa um item (weapon ou armor)"""
@@ -2751,7 +2996,7 @@ class CommandHandler:
                 'active_perks': player.active_perks,
                 'spell_cooldowns': player.spell_cooldowns
             }
-            self.database.update_player_stats(player.name, stats)
+            self.game.journal.record(player.name, stats)
         else:
             await self.send_message(player, f"{ANSI.RED}{message}{ANSI.RESET}")
     
@@ -2803,7 +3048,7 @@ class CommandHandler:
                     'active_perks': player.active_perks,
                     'spell_cooldowns': player.spell_cooldowns
                 }
-                self.database.update_player_stats(player.name, stats)
+                self.game.journal.record(player.name, stats)
             else:
                 await self.send_message(player, f"{ANSI.RED}{message}{ANSI.RESET}")
             return
@@ -2858,7 +3103,7 @@ class CommandHandler:
                 'active_perks': player.active_perks,
                 'spell_cooldowns': player.spell_cooldowns
             }
-            self.database.update_player_stats(player.name, stats)
+            self.game.journal.record(player.name, stats)
         else:
             await self.send_message(player, f"{ANSI.RED}{message}{ANSI.RESET}")
     
@@ -2976,7 +3221,7 @@ class CommandHandler:
                 'active_perks': player.active_perks,
                 'spell_cooldowns': player.spell_cooldowns
             }
-            self.database.update_player_stats(player.name, stats)
+            self.game.journal.record(player.name, stats)
         else:
             await self.send_message(player, f"{ANSI.RED}Erro ao equipar magia.{ANSI.RESET}")
     
@@ -3025,7 +3270,7 @@ class CommandHandler:
             'active_perks': player.active_perks,
             'spell_cooldowns': player.spell_cooldowns
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
     
     async def cmd_cast(self, player: Player, args: str):
         """Comando cast - lança uma magia (só se estiver equipada)"""
@@ -3113,17 +3358,7 @@ class CommandHandler:
         player.spell_cooldowns[spell_id] = time.time() + spell_found.cooldown
         
         # Animação de magia
-        from mud.utils.visuals import get_spell_animation, get_heal_animation
-        import asyncio
-        
-        if spell_found.damage_type == 'heal':
-            animation = get_heal_animation()
-        else:
-            animation = get_spell_animation()
-        
-        for frame in animation:
-            await self.send_message(player, f"\r{ANSI.BRIGHT_MAGENTA}{frame}{ANSI.RESET}")
-            await asyncio.sleep(0.1)
+        await self._play_animation(player, 'heal' if spell_found.damage_type == 'heal' else 'spell')
         
         # Processa a magia
         if spell_found.damage_type == 'heal':
@@ -3178,7 +3413,7 @@ class CommandHandler:
             if random.random() < fail_chance:
                 await self.send_message(player, f"\r{ANSI.RED}❌ Sua magia {spell_found.name} falhou! O alvo desviou ou a magia não funcionou! ❌{ANSI.RESET}\r\n")
                 # Monstro ainda pode revidar mesmo se a magia falhar
-                await asyncio.sleep(0.3)
+                self._pause(player, COMBAT_PAUSE)
                 monster_damage = monster_found.get_attack_damage()
                 total_defense = player.get_total_defense(self.game_data)
                 actual_damage = player.take_damage(monster_damage, total_defense)
@@ -3221,7 +3456,7 @@ class CommandHandler:
             
             # Monstro revida imediatamente após ser atacado com magia
             if monster_found.is_alive():
-                await asyncio.sleep(0.3)
+                self._pause(player, COMBAT_PAUSE)
                 monster_damage = monster_found.get_attack_damage()
                 total_defense = player.get_total_defense(self.game_data)
                 actual_damage = player.take_damage(monster_damage, total_defense)
@@ -3297,7 +3532,7 @@ class CommandHandler:
                     'spell_cooldowns': player.spell_cooldowns,
                     'unspent_points': player.unspent_points
                 }
-                self.database.update_player_stats(player.name, stats)
+                self.game.journal.record(player.name, stats)
                 
                 # Ouro
                 gold_gained = CombatSystem.drop_gold(monster_found)
@@ -3319,7 +3554,7 @@ class CommandHandler:
                 await self._update_kill_quests(player, target_name)
             else:
                 # Monstro ainda vivo, pode contra-atacar (mas não é obrigatório para magias)
-                await asyncio.sleep(0.3)
+                self._pause(player, COMBAT_PAUSE)
         else:
             await self.send_message(player, f"{ANSI.BRIGHT_GREEN}Você lança {spell_found.name}!{ANSI.RESET}")
         
@@ -3344,7 +3579,7 @@ class CommandHandler:
             'active_perks': player.active_perks,
             'spell_cooldowns': player.spell_cooldowns
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
     
     async def cmd_improve_spell(self, player: Player, args: str):
         """Comando improve - melhora uma magia"""
@@ -3405,7 +3640,7 @@ class CommandHandler:
                 'active_perks': player.active_perks,
                 'spell_cooldowns': player.spell_cooldowns
             }
-            self.database.update_player_stats(player.name, stats)
+            self.game.journal.record(player.name, stats)
         else:
             await self.send_message(player, f"{ANSI.RED}Erro ao melhorar magia.{ANSI.RESET}")
     
@@ -3465,7 +3700,7 @@ class CommandHandler:
             'active_perks': player.active_perks,
             'spell_cooldowns': player.spell_cooldowns
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
     
     async def cmd_perks(self, player: Player):
         """Comando perks - mostra perks disponíveis e ativos"""
@@ -3562,7 +3797,7 @@ class CommandHandler:
                 'spell_cooldowns': player.spell_cooldowns,
                 'unspent_points': player.unspent_points
             }
-            self.database.update_player_stats(player.name, stats)
+            self.game.journal.record(player.name, stats)
             
             # Verifica se pode subir mais um nível
             exp_needed = self._calculate_exp_for_level(player.level)
@@ -3691,7 +3926,7 @@ class CommandHandler:
             'spell_cooldowns': player.spell_cooldowns,
             'unspent_points': player.unspent_points
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
     
     async def cmd_say(self, player: Player, message: str):
         """Comando say - fala algo na sala (local)"""
@@ -4154,7 +4389,7 @@ class CommandHandler:
                 'spell_cooldowns': player.spell_cooldowns,
                 'unspent_points': player.unspent_points
             }
-            self.database.update_player_stats(player.name, stats)
+            self.game.journal.record(player.name, stats)
         else:
             await self.send_message(player, f"{ANSI.RED}Você não tem ouro suficiente! Precisa de {price} moedas. Você tem {player.gold}.{ANSI.RESET}")
     
@@ -4267,7 +4502,7 @@ class CommandHandler:
                             'spell_cooldowns': player.spell_cooldowns,
                             'unspent_points': player.unspent_points
                         }
-                        self.database.update_player_stats(player.name, stats)
+                        self.game.journal.record(player.name, stats)
                     else:
                         message += f"\r\n{ANSI.RED}Você não tem os itens necessários para esta troca.{ANSI.RESET}\r\n"
                         if missing_items:
@@ -4286,22 +4521,9 @@ class CommandHandler:
         if not npc_name:
             # Lista todas as quests ativas do jogador
             if player.active_quests:
-                message = f"\r\n{ANSI.BOLD}=== Suas Quests Ativas ==={ANSI.RESET}\r\n"
-                for quest_id in player.active_quests:
-                    quest = self.quest_manager.get_quest(player.world_id, quest_id)
-                    if quest:
-                        progress = player.quest_progress.get(quest_id, {})
-                        message += f"{ANSI.BRIGHT_CYAN}{quest.name}{ANSI.RESET}\r\n"
-                        message += f"  {quest.description}\r\n"
-                        # Mostra progresso
-                        for obj in quest.objectives:
-                            obj_type = obj.get('type')
-                            target = obj.get('target')
-                            amount = obj.get('amount', 1)
-                            progress_key = f"{obj_type}_{target}"
-                            current = progress.get(progress_key, 0)
-                            message += f"  {ANSI.YELLOW}Progresso: {current}/{amount}{ANSI.RESET}\r\n"
-                await self.send_message(player, message)
+                header = f"\r\n{ANSI.BOLD}=== Suas Quests Ativas ==={ANSI.RESET}"
+                lines = self._active_quest_lines(player)
+                await self.send_paged(player, line_pages(lines, page_size_for(player.writer), header))
             else:
                 await self.send_message(player, f"{ANSI.YELLOW}Você não tem quests ativas.{ANSI.RESET}")
             return
@@ -4334,22 +4556,9 @@ class CommandHandler:
                             quests = [quest]
                     
                     if quests:
-                        message = f"\r\n{ANSI.BOLD}=== Quests de {npc.name} ==={ANSI.RESET}\r\n"
-                        for quest in quests:
-                            if quest.id not in player.completed_quests:
-                                status = "Ativa" if quest.id in player.active_quests else "Disponível"
-                                message += f"{ANSI.BRIGHT_CYAN}{quest.name}{ANSI.RESET} [{status}]\r\n"
-                                message += f"  {quest.description}\r\n"
-                                if quest.lore:
-                                    message += f"  {ANSI.BRIGHT_MAGENTA}{quest.lore}{ANSI.RESET}\r\n"
-                                message += f"  {ANSI.BRIGHT_YELLOW}Recompensas:{ANSI.RESET} "
-                                if quest.rewards.get('gold'):
-                                    message += f"{quest.rewards['gold']} moedas, "
-                                if quest.rewards.get('experience'):
-                                    message += f"{quest.rewards['experience']} XP, "
-                                message = message.rstrip(", ") + "\r\n\r\n"
-                        message += f"{ANSI.BRIGHT_GREEN}Use: accept <nome da quest> <npc> para aceitar{ANSI.RESET}\r\n"
-                        await self.send_message(player, message)
+                        header = f"\r\n{ANSI.BOLD}=== Quests de {npc.name} ==={ANSI.RESET}"
+                        lines = self._npc_quest_lines(player, quests)
+                        await self.send_paged(player, line_pages(lines, page_size_for(player.writer), header))
                         return
                     else:
                         await self.send_message(player, f"{ANSI.YELLOW}{npc.name} não tem quests disponíveis.{ANSI.RESET}")
@@ -4360,6 +4569,41 @@ class CommandHandler:
         
         await self.send_message(player, f"{ANSI.RED}NPC '{npc_name}' não encontrado aqui.{ANSI.RESET}")
     
+    def _active_quest_lines(self, player: Player):
+        """Linhas da listagem de quests ativas (geradas conforme as páginas são pedidas)"""
+        for quest_id in list(player.active_quests):
+            quest = self.quest_manager.get_quest(player.world_id, quest_id)
+            if quest:
+                progress = player.quest_progress.get(quest_id, {})
+                yield f"{ANSI.BRIGHT_CYAN}{quest.name}{ANSI.RESET}"
+                yield f"  {quest.description}"
+                # Mostra progresso
+                for obj in quest.objectives:
+                    obj_type = obj.get('type')
+                    target = obj.get('target')
+                    amount = obj.get('amount', 1)
+                    progress_key = f"{obj_type}_{target}"
+                    current = progress.get(progress_key, 0)
+                    yield f"  {ANSI.YELLOW}Progresso: {current}/{amount}{ANSI.RESET}"
+    
+    def _npc_quest_lines(self, player: Player, quests):
+        """Linhas da listagem de quests de um NPC"""
+        for quest in quests:
+            if quest.id not in player.completed_quests:
+                status = "Ativa" if quest.id in player.active_quests else "Disponível"
+                yield f"{ANSI.BRIGHT_CYAN}{quest.name}{ANSI.RESET} [{status}]"
+                yield f"  {quest.description}"
+                if quest.lore:
+                    yield f"  {ANSI.BRIGHT_MAGENTA}{quest.lore}{ANSI.RESET}"
+                rewards = []
+                if quest.rewards.get('gold'):
+                    rewards.append(f"{quest.rewards['gold']} moedas")
+                if quest.rewards.get('experience'):
+                    rewards.append(f"{quest.rewards['experience']} XP")
+                yield f"  {ANSI.BRIGHT_YELLOW}Recompensas:{ANSI.RESET} " + ", ".join(rewards)
+                yield ""
+        yield f"{ANSI.BRIGHT_GREEN}Use: accept <nome da quest> <npc> para aceitar{ANSI.RESET}"
+    
     async def cmd_accept_quest(self, player: Player, args: str):
         """Comando accept - aceita uma quest"""
         if not args:
@@ -4482,7 +4726,7 @@ class CommandHandler:
             'quest_progress': player.quest_progress,
             'completed_quests': player.completed_quests
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
         
         await self.send_message(player, f"{ANSI.BRIGHT_GREEN}Quest '{quest.name}' aceita!{ANSI.RESET}")
         await self.send_message(player, f"{quest.description}\r\n")
@@ -4645,7 +4889,7 @@ class CommandHandler:
             'known_spells': player.known_spells,
             'active_perks': player.active_perks
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
         
         message = f"\r\n{ANSI.BRIGHT_GREEN}Quest '{quest.name}' completada!{ANSI.RESET}\r\n"
         message += f"{ANSI.BRIGHT_YELLOW}Recompensas:{ANSI.RESET}\r\n"
@@ -4821,7 +5065,7 @@ class CommandHandler:
             'quest_progress': player.quest_progress,
             'completed_quests': player.completed_quests
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
         
         await self.send_message(player, f"{ANSI.YELLOW}Quest '{matched_quest.name}' foi cancelada.{ANSI.RESET}")
         await self.send_message(player, f"{ANSI.YELLOW}Você pode aceitá-la novamente no futuro.{ANSI.RESET}")
@@ -4839,119 +5083,7 @@ class CommandHandler:
             await self.send_message(player, f"{ANSI.YELLOW}Não há lore disponível para este mundo.{ANSI.RESET}")
     
     async def cmd_help(self, player: Player, args: str = ""):
-        """Comando help - mostra ajuda paginada e organizada por categoria"""
-        
-        # Organiza comandos por categoria
-        categories = {
-            'movimento': {
-                'name': 'Movimento e Exploração',
-                'icon': '🚶',
-                'commands': [
-                    ('look, l', 'Olha ao redor'),
-                    ('norte, n / sul, s / leste, e / oeste, o', 'Move nas direções'),
-                    ('entrar <porta>', 'Entra em uma dungeon/porta'),
-                    ('sair', 'Sai da dungeon atual'),
-                ]
-            },
-            'comunicacao': {
-                'name': 'Comunicação',
-                'icon': '💬',
-                'commands': [
-                    ('say <mensagem>', 'Fala algo na sala (local)'),
-                    ('shout <mensagem>', 'Fala globalmente para todos'),
-                    ('talk <nome>', 'Fala com NPC'),
-                ]
-            },
-            'combate': {
-                'name': 'Combate',
-                'icon': '⚔️',
-                'commands': [
-                    ('attack <nome/id>', 'Ataca um monstro'),
-                    ('use <nome>', 'Usa um item (pode usar durante combate!)'),
-                    ('cast <magia> [alvo]', 'Lança uma magia'),
-                ]
-            },
-            'personagem': {
-                'name': 'Personagem',
-                'icon': '👤',
-                'commands': [
-                    ('stats', 'Mostra suas estatísticas'),
-                    ('inventory, inv, i [busca] [página]', 'Mostra inventário (com busca e paginação)'),
-                    ('who, players, online', 'Lista jogadores online'),
-                ]
-            },
-            'magias': {
-                'name': 'Magias e Perks',
-                'icon': '✨',
-                'commands': [
-                    ('spells, magias', 'Mostra suas magias'),
-                    ('equipar <magia>', 'Equipa uma magia (max 3)'),
-                    ('desequipar <magia>', 'Desequipa uma magia'),
-                    ('melhorar <magia>', 'Melhora uma magia'),
-                    ('aprender <magia>', 'Aprende uma nova magia'),
-                    ('perks', 'Mostra seus perks'),
-                    ('pontos magia <nome>', 'Distribui ponto em magia'),
-                    ('pontos perk <nome>', 'Distribui ponto em perk'),
-                ]
-            },
-            'itens': {
-                'name': 'Itens e Inventário',
-                'icon': '🎒',
-                'commands': [
-                    ('get <nome>', 'Pega item do chão'),
-                    ('drop <nome>', 'Larga item'),
-                    ('use <nome>', 'Usa um item'),
-                ]
-            },
-            'npc': {
-                'name': 'NPCs e Comércio',
-                'icon': '🏪',
-                'commands': [
-                    ('shop <npc>', 'Lista itens à venda'),
-                    ('buy <item> <npc>', 'Compra item de NPC'),
-                    ('sell <item> <npc>', 'Vende item para NPC'),
-                    ('trade <npc>', 'Troca itens com NPC'),
-                ]
-            },
-            'quests': {
-                'name': 'Quests',
-                'icon': '📜',
-                'commands': [
-                    ('quest <npc>', 'Lista quests disponíveis'),
-                    ('accept <quest> <npc>', 'Aceita uma quest'),
-                    ('complete <quest> <npc>', 'Completa uma quest'),
-                    ('cancel <quest>', 'Cancela uma quest ativa'),
-                ]
-            },
-            'informacao': {
-                'name': 'Informação',
-                'icon': '📖',
-                'commands': [
-                    ('read <nome>', 'Lê lore de monstro/NPC'),
-                    ('lore, world, intro', 'Lê a lore/introdução do mundo'),
-                ]
-            },
-            'lobby': {
-                'name': 'Comandos do Lobby',
-                'icon': '🏛️',
-                'commands': [
-                    ('afk [mensagem]', 'Marca como AFK (só no lobby)'),
-                    ('voltar / back', 'Volta do AFK (só no lobby)'),
-                    ('lobby', 'Volta ao Hall de Entrada de qualquer lugar'),
-                    ('respawn', 'Regenera HP e Stamina (só no lobby)'),
-                    ('server / status_server', 'Mostra status do servidor (só no lobby)'),
-                ]
-            },
-            'sistema': {
-                'name': 'Sistema',
-                'icon': '⚙️',
-                'commands': [
-                    ('help, ? [página]', 'Mostra esta ajuda'),
-                    ('quit, exit', 'Sai do jogo'),
-                ]
-            }
-        }
-        
+        """Comando help - mostra ajuda paginada e organizada por categoria (telas pré-renderizadas)"""
         # Parse argumentos
         page_num = 1
         if args:
@@ -4959,61 +5091,17 @@ class CommandHandler:
                 page_num = int(args.strip())
             except ValueError:
                 # Se não for número, busca categoria pelo nome
-                category_match = None
-                for cat_id, cat_data in categories.items():
+                for cat_id, cat_data in HELP_CATEGORIES.items():
                     if args.lower() in cat_id.lower() or args.lower() in cat_data['name'].lower():
-                        category_match = cat_id
-                        break
-                
-                if category_match:
-                    # Mostra apenas essa categoria
-                    cat = categories[category_match]
-                    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}{cat['icon']} {cat['name']}{ANSI.RESET}\r\n\r\n"
-                    for cmd, desc in cat['commands']:
-                        message += f"{ANSI.BRIGHT_GREEN}{cmd:<30}{ANSI.RESET} - {desc}\r\n"
-                    message += f"\r\n{ANSI.BRIGHT_CYAN}Use: help [página] para ver todas as categorias{ANSI.RESET}\r\n"
-                    await self.send_message(player, message)
-                    return
-                else:
-                    page_num = 1
-        
-        # Paginação
-        category_list = list(categories.items())
-        items_per_page = 3
-        pages = self._paginate_list(category_list, items_per_page)
-        total_pages = len(pages)
-        
-        # Valida página
-        if page_num < 1:
-            page_num = 1
-        elif page_num > total_pages:
-            page_num = total_pages
-        
-        current_page = pages[page_num - 1]
-        
-        # Monta mensagem
-        message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Comandos Disponíveis ==={ANSI.RESET}\r\n"
-        message += f"{ANSI.BRIGHT_BLACK}Página {page_num}/{total_pages}{ANSI.RESET}\r\n\r\n"
-        
-        for cat_id, cat_data in current_page:
-            message += f"{ANSI.BOLD}{cat_data['icon']} {cat_data['name']}{ANSI.RESET}\r\n"
-            for cmd, desc in cat_data['commands']:
-                message += f"  {ANSI.BRIGHT_GREEN}{cmd:<28}{ANSI.RESET} - {desc}\r\n"
-            message += "\r\n"
-        
-        # Navegação
-        if total_pages > 1:
-            message += f"{ANSI.BRIGHT_CYAN}Navegação:{ANSI.RESET}\r\n"
-            if page_num > 1:
-                message += f"  {ANSI.BRIGHT_GREEN}help {page_num - 1}{ANSI.RESET} - Página anterior\r\n"
-            if page_num < total_pages:
-                message += f"  {ANSI.BRIGHT_GREEN}help {page_num + 1}{ANSI.RESET} - Próxima página\r\n"
-            message += f"  {ANSI.BRIGHT_GREEN}help <categoria>{ANSI.RESET} - Ver categoria específica\r\n"
-        
-        message += f"\r\n{ANSI.BRIGHT_YELLOW}Dica: Use 'help <categoria>' para ver apenas uma categoria específica{ANSI.RESET}\r\n"
-        message += f"{ANSI.BRIGHT_YELLOW}Exemplo: help movimento, help combate, help magias{ANSI.RESET}\r\n"
+                        # Mostra apenas essa categoria
+                        await self.send_bytes(player, screens.for_writer('help.category', player.writer, cat_id))
+                        return
+                page_num = 1
         
-        await self.send_message(player, message)
+        # Valida página ('more' continua nas páginas seguintes)
+        page_num = min(max(page_num, 1), len(HELP_PAGES))
+        pages = (screens.for_writer('help.page', player.writer, n) for n in range(page_num, len(HELP_PAGES) + 1))
+        await self.send_paged(player, pages)
     
     def _is_lobby(self, player: Player) -> bool:
         """Verifica se o jogador está no lobby"""
@@ -5138,7 +5226,7 @@ class CommandHandler:
             'current_stamina': player.current_stamina,
             'max_stamina': player.max_stamina
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
     
     async def cmd_server_status(self, player: Player):
         """Comando server - mostra status do servidor (exclusivo do lobby)"""
@@ -5148,43 +5236,60 @@ class CommandHandler:
                 f"{ANSI.BRIGHT_CYAN}Use 'lobby' para voltar ao Hall de Entrada.{ANSI.RESET}")
             return
         
+        header = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Status do Servidor ==={ANSI.RESET}"
+        lines = self._server_status_lines()
+        await self.send_paged(player, line_pages(lines, page_size_for(player.writer), header))
+    
+    def _server_status_lines(self):
+        """Linhas do status do servidor (jogadores e métricas entram conforme as páginas são pedidas)"""
+        players = list(self.game.players.values())
+        
         # Conta jogadores online
-        total_players = len(self.game.players)
-        players_in_lobby = len([p for p in self.game.players.values() if p.room_id == "lobby"])
+        total_players = len(players)
+        players_in_lobby = len([p for p in players if p.room_id == "lobby"])
         
         # Calcula estatísticas gerais
-        total_level = sum(p.level for p in self.game.players.values())
+        total_level = sum(p.level for p in players)
         avg_level = total_level / total_players if total_players > 0 else 0
         
-        message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Status do Servidor ==={ANSI.RESET}\r\n"
-        message += f"{ANSI.BRIGHT_GREEN}Jogadores Online: {total_players}{ANSI.RESET}\r\n"
-        message += f"{ANSI.BRIGHT_CYAN}Jogadores no Lobby: {players_in_lobby}{ANSI.RESET}\r\n"
-        message += f"{ANSI.BRIGHT_YELLOW}Nível Médio: {avg_level:.1f}{ANSI.RESET}\r\n"
+        yield f"{ANSI.BRIGHT_GREEN}Jogadores Online: {total_players}{ANSI.RESET}"
+        yield f"{ANSI.BRIGHT_CYAN}Jogadores no Lobby: {players_in_lobby}{ANSI.RESET}"
+        yield f"{ANSI.BRIGHT_YELLOW}Nível Médio: {avg_level:.1f}{ANSI.RESET}"
         
         # Lista jogadores online com status
         if total_players > 0:
-            message += f"\r\n{ANSI.BOLD}Jogadores Online:{ANSI.RESET}\r\n"
-            for p in sorted(self.game.players.values(), key=lambda x: x.level, reverse=True):
+            yield ""
+            yield f"{ANSI.BOLD}Jogadores Online:{ANSI.RESET}"
+            for p in sorted(players, key=lambda x: x.level, reverse=True):
                 afk_status = ""
                 if hasattr(p, 'is_afk') and p.is_afk:
                     afk_msg = getattr(p, 'afk_message', 'AFK')
                     afk_status = f" {ANSI.BRIGHT_BLACK}[AFK: {afk_msg}]{ANSI.RESET}"
                 
                 location = "Lobby" if p.room_id == "lobby" else p.room_id
-                message += f"  {ANSI.BRIGHT_GREEN}{p.name}{ANSI.RESET} - Nível {p.level} - {location}{afk_status}\r\n"
-        
-        message += f"\r\n{ANSI.BRIGHT_CYAN}Comandos do Lobby:{ANSI.RESET}\r\n"
-        message += f"  {ANSI.BRIGHT_GREEN}afk [mensagem]{ANSI.RESET} - Marca como AFK\r\n"
-        message += f"  {ANSI.BRIGHT_GREEN}voltar / back{ANSI.RESET} - Volta do AFK\r\n"
-        message += f"  {ANSI.BRIGHT_GREEN}lobby{ANSI.RESET} - Volta ao Hall de Entrada\r\n"
-        message += f"  {ANSI.BRIGHT_GREEN}respawn{ANSI.RESET} - Regenera HP e Stamina\r\n"
-        message += f"  {ANSI.BRIGHT_GREEN}server / status_server{ANSI.RESET} - Mostra este status\r\n"
-        
-        await self.send_message(player, message)
+                yield f"  {ANSI.BRIGHT_GREEN}{p.name}{ANSI.RESET} - Nível {p.level} - {location}{afk_status}"
+        
+        # Métricas do servidor (controle de taxa, etc.)
+        server_metrics = metrics.snapshot()
+        if server_metrics:
+            yield ""
+            yield f"{ANSI.BOLD}Métricas:{ANSI.RESET}"
+            for metric_name, value in server_metrics.items():
+                value_text = f"{value:.2f}" if isinstance(value, float) else str(value)
+                yield f"  {ANSI.BRIGHT_BLACK}{metric_name}:{ANSI.RESET} {ANSI.BRIGHT_YELLOW}{value_text}{ANSI.RESET}"
+        
+        yield ""
+        yield f"{ANSI.BRIGHT_CYAN}Comandos do Lobby:{ANSI.RESET}"
+        yield f"  {ANSI.BRIGHT_GREEN}afk [mensagem]{ANSI.RESET} - Marca como AFK"
+        yield f"  {ANSI.BRIGHT_GREEN}voltar / back{ANSI.RESET} - Volta do AFK"
+        yield f"  {ANSI.BRIGHT_GREEN}lobby{ANSI.RESET} - Volta ao Hall de Entrada"
+        yield f"  {ANSI.BRIGHT_GREEN}respawn{ANSI.RESET} - Regenera HP e Stamina"
+        yield f"  {ANSI.BRIGHT_GREEN}server / status_server{ANSI.RESET} - Mostra este status"
     
     async def cmd_quit(self, player: Player):
         """Comando quit - sai do jogo"""
         await self.send_message(player, f"{ANSI.BRIGHT_GREEN}Até logo!{ANSI.RESET}")
+        await self.flush_output(player)
         await self.game.broadcast_to_room(
             player.world_id,
             player.room_id,
@@ -5207,7 +5312,7 @@ class CommandHandler:
             'quest_progress': player.quest_progress,
             'completed_quests': player.completed_quests
         }
-        self.database.update_player_stats(player.name, stats)
+        self.game.journal.record(player.name, stats)
         self.game.remove_player(player.name)
         if player.name in self.in_combat:
             del self.in_combat[player.name]
@@ -5245,23 +5350,149 @@ class CommandHandler:
                                 'quest_progress': player.quest_progress,
                                 'completed_quests': player.completed_quests
                             }
-                            self.database.update_player_stats(player.name, stats)
+                            self.game.journal.record(player.name, stats)
                             
                             if self.quest_manager.check_quest_completion(quest, player.quest_progress[quest_id]):
                                 await self.send_message(player, 
                                     f"{ANSI.BRIGHT_GREEN}Quest '{quest.name}' pode ser completada!{ANSI.RESET}")
     
-    async def send_message(self, player: Player, message: str):
-        """Envia mensagem para um jogador"""
+    async def send_message(self, player: Player, message: Fragment, delay: float = 0.0):
+        """
+        Envia mensagem para um jogador (texto ou bytes já codificados).
+        Com delay, a mensagem sai delay segundos após a anterior (animações), sem bloquear o comando.
+        """
+        # Limpa a linha atual antes da mensagem (evita que ela apareça no meio do que
+        # o jogador está digitando) e remove quebras de linha do final
+        await self._send_data(player, encode_message(message), delay)
+    
+    async def send_output(self, player: Player, output: OutputBuilder, delay: float = 0.0):
+        """Envia o que foi montado no OutputBuilder (mensagens já enquadradas) numa única escrita"""
+        data = output.getvalue()
+        output.clear()
+        await self._send_data(player, data, delay)
+    
+    async def send_bytes(self, player: Player, data: bytes, delay: float = 0.0):
+        """Envia bytes já codificados (telas pré-renderizadas) com o mesmo enquadramento do send_message"""
+        await self._send_data(player, encode_message(data), delay)
+    
+    async def deliver(self, player: Player, data: bytes):
+        """Entrega bytes já enquadrados (encode_message) na ordem da saída do jogador (broadcasts)"""
+        await self._send_data(player, data)
+    
+    def begin_output(self, player: Player):
+        """A partir daqui a saída imediata do jogador é acumulada até o flush_output"""
+        self.pending_output.setdefault(player.name, bytearray())
+    
+    async def flush_output(self, player: Player, trailer: bytes = b""):
+        """Envia a saída acumulada e o trailer (prompt) numa única escrita"""
+        data = self.pending_output.pop(player.name, None) or bytearray()
+        timeline = self.timelines.get(player.name)
         try:
-            # Remove qualquer quebra de linha no final
-            message = message.rstrip('\r\n')
-            
-            # Limpa a linha atual antes de enviar a mensagem
-            # Isso evita que mensagens apareçam no meio da linha quando o jogador está digitando
-            # Sequência ANSI: \r volta ao início da linha, \033[K limpa até o final da linha
-            clear_line = "\r\033[K"
-            player.writer.write(f"{clear_line}{message}\r\n".encode())
+            if timeline is not None and timeline.busy:
+                # O prompt sai depois das animações agendadas
+                if data:
+                    player.writer.write(bytes(data))
+                if trailer:
+                    timeline.send(trailer)
+            else:
+                data += trailer
+                if data:
+                    player.writer.write(bytes(data))
+            await player.writer.drain()
+        except:
+            pass
+    
+    def cancel_output(self, player_name: str):
+        """Descarta animações ainda não enviadas, saída acumulada e a listagem paginada (jogador saiu)"""
+        self.pending_output.pop(player_name, None)
+        self.pagers.pop(player_name, None)
+        timeline = self.timelines.pop(player_name, None)
+        if timeline is not None:
+            timeline.cancel()
+    
+    async def send_paged(self, player: Player, pages):
+        """
+        Envia a primeira página de uma listagem e guarda o cursor para o 'more'.
+        pages é um iterável preguiçoso (str ou bytes por página); uma nova
+        listagem substitui a anterior.
+        """
+        pager = Pager(pages)
+        if pager.has_more:
+            self.pagers[player.name] = pager
+            await self._send_page(player, pager)
+        else:
+            self.pagers.pop(player.name, None)
+    
+    async def cmd_more(self, player: Player):
+        """Comando more/next - próxima página da última listagem"""
+        pager = self.pagers.get(player.name)
+        if pager is None:
+            await self.send_message(player, f"{Colors.WARNING}Não há mais nada para mostrar.{Colors.RESET}")
+            return
+        await self._send_page(player, pager)
+    
+    async def _send_page(self, player: Player, pager: Pager):
+        output = OutputBuilder().message(pager.next_page())
+        if pager.has_more:
+            output.message(f"{Colors.HINT}-- digite {Colors.COMMAND}more{Colors.HINT} para continuar --{Colors.RESET}")
+        else:
+            self.pagers.pop(player.name, None)
+            if pager.truncated:
+                output.message(f"{Colors.WARNING}Listagem limitada a {pager.max_pages} páginas.{Colors.RESET}")
+        await self.send_output(player, output)
+    
+    def _pause(self, player: Player, seconds: float):
+        """Pausa na apresentação: o que for enviado depois sai seconds segundos mais tarde"""
+        self._timeline(player).send(b"", seconds)
+    
+    async def _play_animation(self, player: Player, name: str, color: str = ANSI.BRIGHT_MAGENTA):
+        """Agenda os quadros da animação nos timers do loop (retorna na hora)"""
+        from mud.utils.visuals import encoded_animation
+        for i, frame in enumerate(encoded_animation(name, color)):
+            await self.send_bytes(player, frame, ANIMATION_FRAME_DELAY if i else 0.0)
+        self._pause(player, ANIMATION_FRAME_DELAY)
+    
+    def _owner(self, player: Player) -> 'CommandHandler':
+        """
+        Handler da sessão do jogador: animações e saída acumulada ficam nele,
+        então o que outro jogador manda entra na mesma fila
+        """
+        return self.game.command_handlers.get(player.name) or self
+    
+    def _timeline(self, player: Player) -> OutputTimeline:
+        owner = self._owner(player)
+        if owner is not self:
+            return owner._timeline(player)
+        timeline = self.timelines.get(player.name)
+        if timeline is None:
+            timeline = self.timelines[player.name] = OutputTimeline(player)
+        timeline.player = player
+        # Terminais sem cor não reescrevem a linha: recebem os quadros de uma vez
+        timeline.animate = ANIMATIONS_ENABLED and capabilities_of(player.writer).color != COLOR_NONE
+        return timeline
+    
+    async def _send_data(self, player: Player, data: bytes, delay: float = 0.0):
+        owner = self._owner(player)
+        if owner is not self:
+            await owner._send_data(player, data, delay)
+            return
+        timeline = self.timelines.get(player.name)
+        pending = self.pending_output.get(player.name)
+        if delay > 0 or (timeline is not None and timeline.busy):
+            # Atrás das animações pendentes, para manter a ordem
+            if pending:
+                try:
+                    player.writer.write(bytes(pending))
+                except:
+                    pass
+                pending.clear()
+            self._timeline(player).send(data, delay)
+            return
+        if pending is not None:
+            pending += data
+            return
+        try:
+            player.writer.write(data)
             await player.writer.drain()
         except:
             pass
@@ -7,9 +7,11 @@ from mud.core.models import (
 )
 
 from mud.core.database import Database
+from mud.core.memory_storage import MemoryStorage
+from mud.core.storage import PlayerLoad, StorageBackend, create_storage
 
 __all__ = [
     'Player', 'Monster', 'Item', 'NPC', 'Quest', 'Room', 'World',
-    'Database'
+    'Database', 'MemoryStorage', 'PlayerLoad', 'StorageBackend', 'create_storage'
 ]
 
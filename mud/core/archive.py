@@ -0,0 +1,117 @@
+"""
+Arquivamento de jogadores inativos
+Jogadores sem jogar há ARCHIVE_AFTER_DAYS dias saem das tabelas quentes
+(players, tabelas filhas e viewed_lores) e vão, comprimidos, para a tabela
+archived_players. No próximo login são reidratados de forma transparente.
+"""
+
+import json
+import os
+import zlib
+from typing import Any, Dict, Iterable, List
+
+from mud.core.metrics import metrics
+
+# Dias sem jogar até o jogador ser arquivado
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 180))
+# Intervalo (segundos) entre execuções do arquivamento (0 desativa)
+ARCHIVE_INTERVAL = float(os.environ.get('ARCHIVE_INTERVAL', 86400))
+# Jogadores arquivados por transação
+ARCHIVE_BATCH = int(os.environ.get('ARCHIVE_BATCH', 100))
+
+# Tabelas com linhas do jogador (coluna com o nome do jogador)
+PLAYER_TABLES = (
+    ('player_inventory', 'player_name'),
+    ('player_equipment', 'player_name'),
+    ('player_spells', 'player_name'),
+    ('player_quests', 'player_name'),
+    ('viewed_lores', 'player_name'),
+)
+
+
+def create_archive_table(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archived_players (
+            name TEXT PRIMARY KEY,
+            last_played TIMESTAMP,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            payload BLOB NOT NULL
+        )
+    ''')
+
+
+def _select_rows(cursor, table: str, column: str, name: str) -> Dict[str, Any]:
+    cursor.execute(f'SELECT * FROM {table} WHERE {column} = ?', (name,))
+    return {
+        'columns': [d[0] for d in cursor.description],
+        'rows': cursor.fetchall(),
+    }
+
+
+def _insert_rows(cursor, table: str, data: Dict[str, Any]):
+    """Reinsere linhas arquivadas (ignora colunas que não existem mais na tabela)"""
+    cursor.execute(f'PRAGMA table_info({table})')
+    existing = {row[1] for row in cursor.fetchall()}
+    keep = [i for i, column in enumerate(data['columns']) if column in existing]
+    if not keep or not data['rows']:
+        return
+    columns = ', '.join(data['columns'][i] for i in keep)
+    placeholders = ', '.join('?' for _ in keep)
+    cursor.executemany(f'INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})',
+                       [[row[i] for i in keep] for row in data['rows']])
+
+
+def archive_player(cursor, name: str) -> bool:
+    """Move um jogador (e suas linhas filhas e lores) para archived_players. Commit fica com o chamador"""
+    player = _select_rows(cursor, 'players', 'name', name)
+    if not player['rows']:
+        return False
+    last_played = player['rows'][0][player['columns'].index('last_played')]
+    payload = {'players': player}
+    for table, column in PLAYER_TABLES:
+        payload[table] = _select_rows(cursor, table, column, name)
+    packed = zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'), 9)
+
+    cursor.execute('INSERT OR REPLACE INTO archived_players (name, last_played, payload) VALUES (?, ?, ?)',
+                   (name, last_played, packed))
+    cursor.execute('DELETE FROM players WHERE name = ?', (name,))
+    for table, column in PLAYER_TABLES:
+        cursor.execute(f'DELETE FROM {table} WHERE {column} = ?', (name,))
+    metrics.incr('archive.archived')
+    return True
+
+
+def rehydrate_player(cursor, name: str) -> bool:
+    """Devolve um jogador arquivado às tabelas quentes. Commit fica com o chamador"""
+    cursor.execute('SELECT payload FROM archived_players WHERE name = ?', (name,))
+    row = cursor.fetchone()
+    if not row:
+        return False
+    payload = json.loads(zlib.decompress(row[0]).decode('utf-8'))
+    _insert_rows(cursor, 'players', payload['players'])
+    for table, _ in PLAYER_TABLES:
+        if table in payload:
+            _insert_rows(cursor, table, payload[table])
+    cursor.execute('DELETE FROM archived_players WHERE name = ?', (name,))
+    # Volta a contar como ativo (não é arquivado de novo na próxima execução)
+    cursor.execute('UPDATE players SET last_played = CURRENT_TIMESTAMP WHERE name = ?', (name,))
+    metrics.incr('archive.rehydrated')
+    print(f"[Archive] Jogador {name} reidratado do arquivo")
+    return True
+
+
+def is_archived(cursor, name: str) -> bool:
+    cursor.execute('SELECT 1 FROM archived_players WHERE name = ?', (name,))
+    return cursor.fetchone() is not None
+
+
+def inactive_players(cursor, days: int, exclude: Iterable[str] = (), limit: int = ARCHIVE_BATCH) -> List[str]:
+    """Nomes de até 'limit' jogadores sem jogar há 'days' dias (fora de 'exclude')"""
+    exclude = set(exclude)
+    cursor.execute('''
+        SELECT name FROM players
+        WHERE last_played < datetime('now', ?)
+        ORDER BY last_played
+        LIMIT ?
+    ''', (f'-{int(days)} days', limit + len(exclude)))
+    return [name for (name,) in cursor.fetchall() if name not in exclude][:limit]
@@ -0,0 +1,112 @@
+"""
+Backup online do banco SQLite
+Usa a API de backup incremental do sqlite3 em passos pequenos de páginas, numa
+thread separada, para não travar o loop do jogo nem as gravações. Cada cópia é
+comprimida (gzip) e apenas as BACKUP_KEEP mais recentes são mantidas.
+
+Uso manual: python -m mud.core.backup [caminho/do/banco.db]
+"""
+
+import asyncio
+import glob
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Optional
+
+from mud.core.metrics import metrics
+
+# Intervalo (segundos) entre backups agendados (0 desativa)
+BACKUP_INTERVAL = float(os.environ.get('BACKUP_INTERVAL', 3600))
+# Diretório dos snapshots (padrão: 'backups' ao lado do banco)
+BACKUP_DIR = os.environ.get('BACKUP_DIR', '')
+# Quantos snapshots manter
+BACKUP_KEEP = int(os.environ.get('BACKUP_KEEP', 24))
+# Páginas copiadas por passo e pausa (segundos) entre passos
+BACKUP_PAGES = int(os.environ.get('BACKUP_PAGES', 256))
+BACKUP_STEP_SLEEP = float(os.environ.get('BACKUP_STEP_SLEEP', 0.005))
+
+SNAPSHOT_PREFIX = 'mud-'
+SNAPSHOT_SUFFIX = '.db.gz'
+
+
+def backup_dir_for(db_path: str) -> str:
+    """Diretório onde os snapshots do banco são gravados"""
+    return BACKUP_DIR or os.path.join(os.path.dirname(os.path.abspath(db_path)), 'backups')
+
+
+def backup_database(db_path: str, dest_dir: Optional[str] = None, keep: int = BACKUP_KEEP) -> str:
+    """
+    Copia o banco para um snapshot comprimido e retorna o caminho.
+    Bloqueante: chamar fora do loop (ver run_backups).
+    """
+    dest_dir = dest_dir or backup_dir_for(db_path)
+    os.makedirs(dest_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    final_path = os.path.join(dest_dir, f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}")
+    temp_path = os.path.join(dest_dir, f".{SNAPSHOT_PREFIX}{stamp}.db.tmp")
+
+    def progress(status, remaining, total):
+        # Pausa entre passos: libera o banco para as gravações do jogo
+        if remaining:
+            time.sleep(BACKUP_STEP_SLEEP)
+
+    started = time.perf_counter()
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(temp_path)
+    try:
+        source.backup(target, pages=BACKUP_PAGES, progress=progress)
+        pages = target.execute('PRAGMA page_count').fetchone()[0]
+    finally:
+        target.close()
+        source.close()
+
+    try:
+        with open(temp_path, 'rb') as raw, gzip.open(final_path + '.tmp', 'wb', compresslevel=6) as packed:
+            shutil.copyfileobj(raw, packed, 1024 * 1024)
+        os.replace(final_path + '.tmp', final_path)
+    finally:
+        os.remove(temp_path)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    size = os.path.getsize(final_path)
+    metrics.incr('backup.runs')
+    metrics.set_gauge('backup.duration_ms', round(elapsed_ms, 1))
+    metrics.set_gauge('backup.size_bytes', size)
+    metrics.set_gauge('backup.pages', pages)
+    metrics.set_gauge('backup.last_at', int(time.time()))
+    rotate_snapshots(dest_dir, keep)
+    print(f"[Backup] {final_path} ({size // 1024} KB, {pages} páginas, {elapsed_ms:.0f} ms)")
+    return final_path
+
+
+def rotate_snapshots(dest_dir: str, keep: int = BACKUP_KEEP):
+    """Remove os snapshots mais antigos, mantendo os 'keep' mais recentes"""
+    snapshots = sorted(glob.glob(os.path.join(dest_dir, f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}")))
+    for path in snapshots[:max(0, len(snapshots) - keep)]:
+        os.remove(path)
+    metrics.set_gauge('backup.snapshots', min(len(snapshots), keep))
+
+
+async def run_backups(db_path: str, interval: float = BACKUP_INTERVAL):
+    """Task de backups agendados (cada cópia roda numa thread própria)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(backup_database, db_path)
+        except Exception as e:
+            metrics.incr('backup.failures')
+            print(f"[Backup] Erro ao criar snapshot: {e}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        from mud.core.database import Database
+        path = Database().db_path
+    backup_database(path)
@@ -1,30 +1,44 @@
 """
 Gerenciamento de banco de dados SQL para persistência de jogadores
+Implementação SQLite do StorageBackend
 """
 
 import sqlite3
 import json
-import hashlib
+import copy
 import os
-from typing import Optional, Dict, Any, List
+import threading
+from typing import Optional, Dict, Any, List, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 
-class Database:
-    """Gerencia conexão e operações do banco de dados"""
+from mud.core.metrics import metrics
+from mud.core.passwords import hash_password, verify_password, needs_rehash
+from mud.core import archive, migrations, player_schema
+from mud.core.player_schema import SCALAR_FIELDS, STATS_VERSION_BLOB, STATS_VERSION_NORMALIZED
+from mud.core.storage import PlayerLoad, StorageBackend, lore_key
+
+# Colunas lidas de players para montar um jogador (ver _load_player)
+PLAYER_COLUMNS = ('name, world_id, room_id, class_id, race_id, gender_id, last_played, '
+                  'stats, stats_version, extras, ' + ', '.join(SCALAR_FIELDS))
+
+
+def default_db_path() -> str:
+    """Caminho padrão do banco (sem abrir nem criar nada)"""
+    # Produção (Railway): o diretório /database existe
+    if os.path.isdir('/database'):
+        return '/database/mud.db'
+    # Desenvolvimento: caminho relativo
+    return "mud.db"
+
+
+class Database(StorageBackend):
+    """Gerencia conexão e operações do banco de dados (SQLite)"""
     
     def __init__(self, db_path: str = None):
         # Se não especificado, detecta automaticamente o caminho
         if db_path is None:
-            # Verifica se está em produção (Railway) - diretório /database existe
-            if os.path.exists('/database') and os.path.isdir('/database'):
-                # Produção: usa /database/mud.db
-                db_path = '/database/mud.db'
-                # Garante que o diretório existe (já deve existir, mas por segurança)
-                os.makedirs('/database', exist_ok=True)
-            else:
-                # Desenvolvimento: usa caminho relativo
-                db_path = "mud.db"
+            db_path = default_db_path()
         
         self.db_path = db_path
         # Garante que o diretório do banco existe
@@ -35,165 +49,68 @@ class Database:
         # Log do caminho usado (útil para debug)
         print(f"[Database] Usando banco de dados: {os.path.abspath(self.db_path)}")
         
+        # Último estado de stats persistido por jogador (base para gravar apenas diffs).
+        # Lido no login (pool de hash) e gravado pela thread de gravação: a versão por
+        # jogador impede que uma leitura antiga sobrescreva um snapshot mais novo
+        self._persisted_stats: Dict[str, Dict[str, Any]] = {}
+        self._snapshot_versions: Dict[str, int] = {}
+        self._snapshot_lock = threading.Lock()
+        
         self._init_database()
     
     def _init_database(self):
-        """Inicializa o banco de dados criando tabelas se necessário"""
+        """Cria/atualiza o esquema aplicando apenas as migrações pendentes"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Tabela de jogadores
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS players (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                password_hash TEXT,
-                world_id TEXT NOT NULL,
-                room_id TEXT NOT NULL,
-                class_id TEXT,
-                race_id TEXT,
-                gender_id TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_played TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                stats TEXT DEFAULT '{}'
-            )
-        ''')
-        
-        # Migração: adiciona colunas de classe/raça/gênero se não existirem
-        for col in ['class_id', 'race_id', 'gender_id']:
-            try:
-                cursor.execute(f'ALTER TABLE players ADD COLUMN {col} TEXT')
-            except sqlite3.OperationalError:
-                pass  # Coluna já existe
-        
-        # Tabela de contas (para login/registro)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS accounts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP,
-                compatibility_test_done INTEGER DEFAULT 0
-            )
-        ''')
-        
-        # Migração: adiciona coluna compatibility_test_done se não existir
-        try:
-            cursor.execute('ALTER TABLE accounts ADD COLUMN compatibility_test_done INTEGER DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass  # Coluna já existe
-        
-        # Tabela de quests (para persistência de quests geradas)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS quests (
-                id TEXT PRIMARY KEY,
-                world_id TEXT NOT NULL,
-                npc_id TEXT NOT NULL,
-                name TEXT NOT NULL,
-                description TEXT NOT NULL,
-                lore TEXT DEFAULT '',
-                objectives TEXT NOT NULL,
-                rewards TEXT NOT NULL,
-                status TEXT DEFAULT 'available',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                generated_by TEXT DEFAULT 'system'
-            )
-        ''')
-        
-        # Migração: adiciona coluna password_hash se não existir
         try:
-            cursor.execute('ALTER TABLE players ADD COLUMN password_hash TEXT')
-        except sqlite3.OperationalError:
-            pass  # Coluna já existe
-        
-        # Tabela de respawn de monstros (para controlar quando monstros podem respawnar)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS monster_respawns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                world_id TEXT NOT NULL,
-                room_id TEXT NOT NULL,
-                monster_id TEXT NOT NULL,
-                instance_id INTEGER NOT NULL,
-                death_time TIMESTAMP NOT NULL,
-                respawn_time INTEGER NOT NULL,
-                UNIQUE(world_id, room_id, monster_id, instance_id)
-            )
-        ''')
-        
-        # Tabela de lores vistas (para rastrear quais lores o jogador já viu)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS viewed_lores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player_name TEXT NOT NULL,
-                world_id TEXT NOT NULL,
-                room_id TEXT NOT NULL,
-                viewed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(player_name, world_id, room_id)
-            )
-        ''')
-        
-        # Índices para melhor performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_name ON players(name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_world ON players(world_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_username ON accounts(username)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_quest_world ON quests(world_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_quest_npc ON quests(npc_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_respawn_world_room ON monster_respawns(world_id, room_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_respawn_time ON monster_respawns(death_time)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_viewed_lores_player ON viewed_lores(player_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_viewed_lores_room ON viewed_lores(world_id, room_id)')
-        
-        conn.commit()
-        conn.close()
-    
-    @staticmethod
-    def _hash_password(password: str) -> str:
-        """Hash da senha usando SHA256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+            # WAL (persistente no arquivo): leituras longas, como a exportação e o
+            # backup, não bloqueiam as gravações do jogo
+            conn.execute('PRAGMA journal_mode=WAL')
+            migrations.migrate(conn)
+        finally:
+            conn.close()
     
     def get_connection(self):
         """Retorna uma conexão com o banco"""
         return sqlite3.connect(self.db_path)
     
     def player_exists(self, name: str) -> bool:
-        """Verifica se um jogador existe"""
+        """Verifica se um jogador existe (inclusive arquivado)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT COUNT(*) FROM players WHERE name = ?', (name,))
         count = cursor.fetchone()[0]
+        exists = count > 0 or archive.is_archived(cursor, name)
         conn.close()
-        return count > 0
+        return exists
     
     def register_account(self, username: str, password: str) -> tuple[bool, str]:
-        """Registra uma nova conta. Retorna (sucesso, mensagem)"""
-        if not username or not password:
-            return False, "Username e senha são obrigatórios"
+        """
+        Registra uma nova conta. Retorna (sucesso, mensagem)
+        Calcula o KDF da senha: no loop asyncio, chame via run_in_hash_pool
+        """
+        error = self._validate_account(username, password)
+        if error:
+            return False, error
         
-        if len(username) < 3:
-            return False, "Username deve ter pelo menos 3 caracteres"
-        
-        if len(password) < 4:
-            return False, "Senha deve ter pelo menos 4 caracteres"
-        
-        password_hash = self._hash_password(password)
+        password_hash = hash_password(password)
         
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO accounts (username, password_hash)
                 VALUES (?, ?)
             ''', (username.lower(), password_hash))
             conn.commit()
-            conn.close()
             return True, "Conta criada com sucesso!"
         except sqlite3.IntegrityError:
             return False, "Username já está em uso"
+        finally:
+            # Fecha também em caso de erro (transação aberta manteria o banco travado)
+            conn.close()
     
     def verify_login(self, username: str, password: str) -> bool:
-        """Verifica credenciais de login"""
-        password_hash = self._hash_password(password)
+        """Verifica credenciais de login (bloqueante: KDF)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('''
@@ -202,18 +119,90 @@ class Database:
         row = cursor.fetchone()
         conn.close()
         
-        if row and row[0] == password_hash:
-            # Atualiza último login
+        if row and verify_password(password, row[0]):
+            # Atualiza último login (e o hash, se for legado)
+            new_hash = self._upgraded_password_hash(password, row[0])
             conn = self.get_connection()
             cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE accounts SET last_login = CURRENT_TIMESTAMP WHERE username = ?
-            ''', (username.lower(),))
+            self._record_login(cursor, username, new_hash)
             conn.commit()
             conn.close()
             return True
         return False
     
+    def load_login(self, username: str, password: str, player_name: str = None,
+                   load_player: bool = True) -> Optional[PlayerLoad]:
+        """
+        Login em uma única conexão/transação: busca conta, flag do teste de compatibilidade,
+        o jogador (LEFT JOIN) e suas lores vistas, e atualiza o último login.
+        Com load_player=False só a conta é lida (o jogador já está em memória).
+        Retorna None se a conta não existe.
+        Verifica a senha com o KDF: no loop asyncio, chame via run_in_hash_pool
+        """
+        player_name = player_name or username
+        version = self._snapshot_version(player_name)
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            if load_player:
+                player_columns = ', '.join('p.' + col.strip() for col in PLAYER_COLUMNS.split(','))
+                cursor.execute(f'''
+                    SELECT a.password_hash, a.compatibility_test_done, {player_columns}
+                    FROM accounts a
+                    LEFT JOIN players p ON p.name = ?
+                    WHERE a.username = ?
+                ''', (player_name, username.lower()))
+            else:
+                cursor.execute('''
+                    SELECT password_hash, compatibility_test_done FROM accounts WHERE username = ?
+                ''', (username.lower(),))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            if not verify_password(password, row[0]):
+                return PlayerLoad(username=username, authenticated=False)
+            
+            # O KDF do rehash roda antes do UPDATE, fora da trava de escrita do banco
+            new_hash = self._upgraded_password_hash(password, row[0])
+            self._record_login(cursor, username, new_hash)
+            player = None
+            viewed_lores = set()
+            if load_player:
+                if row[2] is not None:
+                    player = self._load_player(cursor, row[2:], version)
+                else:
+                    player = self._rehydrate_player(cursor, player_name, version)
+                viewed_lores = self._read_viewed_lores(cursor, player_name) if player else set()
+            conn.commit()
+        finally:
+            conn.close()
+        
+        return PlayerLoad(
+            username=username,
+            authenticated=True,
+            compatibility_test_done=row[1] == 1,
+            player=player,
+            viewed_lores=viewed_lores,
+            player_loaded=load_player
+        )
+    
+    @staticmethod
+    def _upgraded_password_hash(password: str, stored: str) -> Optional[str]:
+        """Novo hash com o KDF atual se o armazenado for legado (SHA-256) ou de custo antigo"""
+        if not needs_rehash(stored):
+            return None
+        metrics.incr('auth.hash.upgraded')
+        return hash_password(password)
+    
+    @staticmethod
+    def _record_login(cursor, username: str, new_hash: Optional[str]):
+        """Atualiza o último login e, se houver, o hash regravado (um único UPDATE)"""
+        cursor.execute('''
+            UPDATE accounts SET last_login = CURRENT_TIMESTAMP, password_hash = COALESCE(?, password_hash)
+            WHERE username = ?
+        ''', (new_hash, username.lower()))
+    
     def account_exists(self, username: str) -> bool:
         """Verifica se uma conta existe"""
         conn = self.get_connection()
@@ -246,62 +235,96 @@ class Database:
     
     def get_player(self, name: str) -> Optional[Dict[str, Any]]:
         """Busca dados de um jogador"""
+        version = self._snapshot_version(name)
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT name, world_id, room_id, class_id, race_id, gender_id, stats, last_played
-            FROM players WHERE name = ?
-        ''', (name,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            stats = json.loads(row[6]) if row[6] else {}
-            # Se não tem stats básicos, inicializa
-            if not stats.get('max_hp'):
-                stats['max_hp'] = 100
-            if 'current_hp' not in stats:
-                stats['current_hp'] = stats.get('max_hp', 100)
-            if not stats.get('attack'):
-                stats['attack'] = 10
-            if not stats.get('defense'):
-                stats['defense'] = 5
-            
-            return {
-                'name': row[0],
-                'world_id': row[1],
-                'room_id': row[2],
-                'class_id': row[3] or '',
-                'race_id': row[4] or '',
-                'gender_id': row[5] or '',
-                'stats': stats,
-                'last_played': row[7]
-            }
-        return None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT {PLAYER_COLUMNS} FROM players WHERE name = ?', (name,))
+            row = cursor.fetchone()
+            player = self._load_player(cursor, row, version) if row else self._rehydrate_player(cursor, name, version)
+            conn.commit()
+        finally:
+            conn.close()
+        return player
+    
+    def _rehydrate_player(self, cursor, name: str, version: int) -> Optional[Dict[str, Any]]:
+        """Traz um jogador arquivado de volta e o carrega (None se não está arquivado)"""
+        if not archive.rehydrate_player(cursor, name):
+            return None
+        cursor.execute(f'SELECT {PLAYER_COLUMNS} FROM players WHERE name = ?', (name,))
+        return self._load_player(cursor, cursor.fetchone(), version)
+    
+    def _load_player(self, cursor, row, version: int) -> Dict[str, Any]:
+        """
+        Monta o jogador a partir de uma linha com PLAYER_COLUMNS.
+        Linhas ainda no formato JSON antigo são migradas na hora (commit fica com o chamador).
+        """
+        name = row[0]
+        stats = self._read_stats(cursor, name, row[7:], version)
+        return self._player_record(row[:7], stats)
+    
+    def _snapshot_version(self, name: str) -> int:
+        """Versão do snapshot de um jogador (capturar antes de ler o banco)"""
+        with self._snapshot_lock:
+            return self._snapshot_versions.get(name, 0)
+    
+    def _store_snapshot(self, name: str, stats: Optional[Dict[str, Any]], version: Optional[int] = None):
+        """
+        Guarda (ou descarta, com stats None) o snapshot persistido de um jogador.
+        Com version, é uma leitura: só vale se nada foi gravado/descartado desde que ela começou
+        """
+        with self._snapshot_lock:
+            current = self._snapshot_versions.get(name, 0)
+            if version is not None and version != current:
+                return
+            self._snapshot_versions[name] = current + 1
+            if stats is None:
+                self._persisted_stats.pop(name, None)
+            else:
+                self._persisted_stats[name] = copy.deepcopy(stats)
+    
+    def _read_stats(self, cursor, name: str, stats_row, version: int) -> Dict[str, Any]:
+        """Lê os stats normalizados (stats, stats_version, extras, escalares) e guarda o snapshot"""
+        blob, stats_version = stats_row[0], stats_row[1]
+        if stats_version == STATS_VERSION_BLOB:
+            player_schema.migrate_blob(cursor, name, blob)
+            cursor.execute(f'SELECT extras, {", ".join(SCALAR_FIELDS)} FROM players WHERE name = ?', (name,))
+            extras_row = cursor.fetchone()
+            extras, scalars = extras_row[0], extras_row[1:]
+        else:
+            extras, scalars = stats_row[2], stats_row[3:]
+        stats = player_schema.read_stats(cursor, name, scalars, extras)
+        self._store_snapshot(name, stats, version)
+        return stats
     
     def create_player(self, name: str, world_id: str, room_id: str, 
                      class_id: str = "", race_id: str = "", gender_id: str = "",
                      password_hash: str = None) -> bool:
         """Cria um novo jogador"""
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
             cursor = conn.cursor()
+            if archive.is_archived(cursor, name):
+                # Nome pertence a um jogador arquivado
+                return False
             if password_hash:
                 cursor.execute('''
-                    INSERT INTO players (name, password_hash, world_id, room_id, class_id, race_id, gender_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (name, password_hash, world_id, room_id, class_id, race_id, gender_id))
+                    INSERT INTO players (name, password_hash, world_id, room_id, class_id, race_id, gender_id, stats_version)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (name, password_hash, world_id, room_id, class_id, race_id, gender_id, STATS_VERSION_NORMALIZED))
             else:
                 cursor.execute('''
-                    INSERT INTO players (name, world_id, room_id, class_id, race_id, gender_id)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (name, world_id, room_id, class_id, race_id, gender_id))
+                    INSERT INTO players (name, world_id, room_id, class_id, race_id, gender_id, stats_version)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (name, world_id, room_id, class_id, race_id, gender_id, STATS_VERSION_NORMALIZED))
             conn.commit()
-            conn.close()
+            self._store_snapshot(name, {})
             return True
         except sqlite3.IntegrityError:
             # Jogador já existe
             return False
+        finally:
+            conn.close()
     
     def update_player_class_race_gender(self, name: str, class_id: str, race_id: str, gender_id: str):
         """Atualiza classe, raça e gênero do jogador"""
@@ -318,26 +341,81 @@ class Database:
     def update_player_location(self, name: str, world_id: str, room_id: str):
         """Atualiza localização do jogador"""
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE players
-            SET world_id = ?, room_id = ?, last_played = CURRENT_TIMESTAMP
-            WHERE name = ?
-        ''', (world_id, room_id, name))
-        conn.commit()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            for _ in range(2):
+                cursor.execute('''
+                    UPDATE players
+                    SET world_id = ?, room_id = ?, last_played = CURRENT_TIMESTAMP
+                    WHERE name = ?
+                ''', (world_id, room_id, name))
+                if cursor.rowcount or not self._rehydrate_for_write(cursor, name):
+                    break
+            conn.commit()
+        finally:
+            conn.close()
     
     def update_player_stats(self, name: str, stats: Dict[str, Any]):
-        """Atualiza estatísticas do jogador"""
+        """
+        Atualiza estatísticas do jogador. `stats` pode ser parcial: os campos
+        informados são mesclados ao estado atual e só o que mudou é gravado.
+        """
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE players
-            SET stats = ?, last_played = CURRENT_TIMESTAMP
-            WHERE name = ?
-        ''', (json.dumps(stats), name))
-        conn.commit()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            with self._snapshot_lock:
+                old = self._persisted_stats.get(name)
+                version = self._snapshot_versions.get(name, 0)
+            if old is None:
+                query = ('SELECT stats, stats_version, extras, ' + ', '.join(SCALAR_FIELDS) +
+                         ' FROM players WHERE name = ?')
+                cursor.execute(query, (name,))
+                row = cursor.fetchone()
+                if not row and self._rehydrate_for_write(cursor, name):
+                    cursor.execute(query, (name,))
+                    row = cursor.fetchone()
+                if not row:
+                    print(f"[Database] Stats de {name} descartados: jogador não existe")
+                    metrics.incr('db.stats_dropped')
+                    return
+                old = self._read_stats(cursor, name, row, version)
+            
+            new = copy.deepcopy(old)
+            new.update(copy.deepcopy(stats))
+            player_schema.write_stats(cursor, name, old, new)
+            conn.commit()
+            self._store_snapshot(name, new)
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _rehydrate_for_write(cursor, name: str) -> bool:
+        """
+        Gravação para um jogador arquivado (arquivado enquanto entrava no jogo, entre
+        a lista de exclusão do arquivamento e a transação): traz de volta em vez de perder
+        """
+        if not archive.rehydrate_player(cursor, name):
+            return False
+        metrics.incr('archive.rehydrated_on_write')
+        return True
+    
+    def forget_player(self, name: str):
+        """Descarta o snapshot em memória de um jogador que saiu do jogo"""
+        self._store_snapshot(name, None)
+    
+    def archive_inactive_players(self, days: int, exclude=()) -> int:
+        """Arquiva um lote de jogadores inativos há 'days' dias (fora de 'exclude'). Retorna quantos"""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            names = archive.inactive_players(cursor, days, exclude)
+            for name in names:
+                archive.archive_player(cursor, name)
+                self.forget_player(name)
+            conn.commit()
+        finally:
+            conn.close()
+        return len(names)
     
     def get_all_players(self) -> list:
         """Retorna lista de todos os jogadores"""
@@ -353,8 +431,11 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('DELETE FROM players WHERE name = ?', (name,))
+        for table in ('player_inventory', 'player_equipment', 'player_spells', 'player_quests'):
+            cursor.execute(f'DELETE FROM {table} WHERE player_name = ?', (name,))
         conn.commit()
         conn.close()
+        self.forget_player(name)
     
     def save_quest(self, quest: Dict[str, Any], world_id: str, generated_by: str = 'system'):
         """Salva uma quest no banco de dados"""
@@ -584,4 +665,16 @@ class Database:
         ''', (player_name, world_id, room_id))
         conn.commit()
         conn.close()
-
+    
+    def get_viewed_lores(self, player_name: str) -> Set[Tuple[str, str]]:
+        """Conjunto (world_id, room_id) das lores já vistas pelo jogador"""
+        conn = self.get_connection()
+        try:
+            return self._read_viewed_lores(conn.cursor(), player_name)
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _read_viewed_lores(cursor, player_name: str) -> Set[Tuple[str, str]]:
+        cursor.execute('SELECT world_id, room_id FROM viewed_lores WHERE player_name = ?', (player_name,))
+        return {lore_key(world_id, room_id) for world_id, room_id in cursor.fetchall()}
@@ -0,0 +1,172 @@
+"""
+Exportação em streaming dos dados do jogo (para análise de balanceamento)
+Percorre as tabelas com fetchmany em lotes, decodifica o JSON linha a linha e
+grava CSV ou JSON Lines: a memória usada não depende do número de jogadores.
+Funciona com o banco em uso (aberto somente leitura; em modo WAL a leitura não
+bloqueia as gravações do servidor) ou com um snapshot de backup.
+
+Uso: python -m mud.core.export players --format csv --output players.csv [--db caminho.db|.db.gz]
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+from mud.core.player_schema import SCALAR_FIELDS, STATS_VERSION_BLOB
+
+# Linhas buscadas por lote
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 500))
+
+_PLAYER_COLUMNS = ['name', 'world_id', 'room_id', 'class_id', 'race_id', 'gender_id',
+                   'created_at', 'last_played', *SCALAR_FIELDS,
+                   'inventory_items', 'active_quests', 'completed_quests', 'extras']
+
+
+def _player_rows(cursor) -> Iterator[Dict[str, Any]]:
+    """Jogadores com stats escalares e contagens das tabelas filhas (linhas antigas: blob JSON)"""
+    scalars = ', '.join('p.' + field for field in SCALAR_FIELDS)
+    cursor.execute(f'''
+        SELECT p.name, p.world_id, p.room_id, p.class_id, p.race_id, p.gender_id,
+               p.created_at, p.last_played, p.stats_version, p.stats, p.extras, {scalars},
+               (SELECT COALESCE(SUM(quantity), 0) FROM player_inventory i WHERE i.player_name = p.name),
+               (SELECT COUNT(*) FROM player_quests q WHERE q.player_name = p.name AND q.active = 1),
+               (SELECT COUNT(*) FROM player_quests q WHERE q.player_name = p.name AND q.completed = 1)
+        FROM players p
+    ''')
+    for row in _fetch_batches(cursor):
+        record = dict(zip(_PLAYER_COLUMNS[:8], row[:8]))
+        version, blob, extras_json = row[8:11]
+        if (version or STATS_VERSION_BLOB) == STATS_VERSION_BLOB:
+            # Linha ainda não migrada: tudo está no blob
+            stats = json.loads(blob) if blob else {}
+            for field in SCALAR_FIELDS:
+                record[field] = stats.pop(field, None)
+            record['inventory_items'] = len(stats.pop('inventory', None) or [])
+            record['active_quests'] = len(stats.pop('active_quests', None) or [])
+            record['completed_quests'] = len(stats.pop('completed_quests', None) or [])
+            for field in ('equipment', 'known_spells', 'equipped_spells', 'quest_progress'):
+                stats.pop(field, None)
+            record['extras'] = stats
+        else:
+            offset = 11 + len(SCALAR_FIELDS)
+            record.update(zip(SCALAR_FIELDS, row[11:offset]))
+            record['inventory_items'], record['active_quests'], record['completed_quests'] = row[offset:]
+            record['extras'] = json.loads(extras_json) if extras_json else {}
+        yield record
+
+
+def _table_rows(sql: str, columns: List[str], json_columns: Tuple[str, ...] = ()):
+    """Exportador de uma consulta simples; colunas em json_columns são decodificadas"""
+    def rows(cursor) -> Iterator[Dict[str, Any]]:
+        cursor.execute(sql)
+        for row in _fetch_batches(cursor):
+            record = dict(zip(columns, row))
+            for column in json_columns:
+                if record[column]:
+                    record[column] = json.loads(record[column])
+            yield record
+    return columns, rows
+
+
+# Conjuntos exportáveis: nome -> (colunas, gerador de linhas)
+DATASETS = {
+    'players': (_PLAYER_COLUMNS, _player_rows),
+    'inventory': _table_rows(
+        'SELECT player_name, item_id, quantity FROM player_inventory',
+        ['player_name', 'item_id', 'quantity']),
+    'player_quests': _table_rows(
+        'SELECT player_name, quest_id, active, completed, progress FROM player_quests',
+        ['player_name', 'quest_id', 'active', 'completed', 'progress'], ('progress',)),
+    'quests': _table_rows(
+        'SELECT id, world_id, npc_id, name, status, generated_by, created_at, objectives, rewards FROM quests',
+        ['id', 'world_id', 'npc_id', 'name', 'status', 'generated_by', 'created_at', 'objectives', 'rewards'],
+        ('objectives', 'rewards')),
+    'respawns': _table_rows(
+        'SELECT world_id, room_id, monster_id, instance_id, death_time, respawn_time FROM monster_respawns',
+        ['world_id', 'room_id', 'monster_id', 'instance_id', 'death_time', 'respawn_time']),
+}
+
+
+def _fetch_batches(cursor, batch_size: int = None) -> Iterator[Tuple]:
+    """Itera as linhas do cursor buscando em lotes (fetchmany)"""
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            return
+        yield from batch
+
+
+@contextmanager
+def open_readonly(db_path: str) -> Iterator[sqlite3.Connection]:
+    """Abre o banco somente leitura; snapshots .gz são descompactados num arquivo temporário"""
+    temp_path = None
+    if db_path.endswith('.gz'):
+        fd, temp_path = tempfile.mkstemp(suffix='.db')
+        with os.fdopen(fd, 'wb') as raw, gzip.open(db_path, 'rb') as packed:
+            shutil.copyfileobj(packed, raw, 1024 * 1024)
+        db_path = temp_path
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+    try:
+        yield conn
+    finally:
+        conn.close()
+        if temp_path:
+            for path in (temp_path, temp_path + '-wal', temp_path + '-shm'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def export(db_path: str, dataset: str, out, fmt: str = 'jsonl') -> int:
+    """Exporta um conjunto de dados para 'out' (arquivo texto). Retorna o número de linhas"""
+    columns, rows = DATASETS[dataset]
+    count = 0
+    with open_readonly(db_path) as conn:
+        records = rows(conn.cursor())
+        if fmt == 'csv':
+            writer = csv.DictWriter(out, fieldnames=columns)
+            writer.writeheader()
+            for record in records:
+                # Valores estruturados viram JSON numa única célula
+                writer.writerow({k: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v
+                                 for k, v in record.items()})
+                count += 1
+        else:
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+                count += 1
+    return count
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='Exporta dados do MUD em CSV ou JSON Lines')
+    parser.add_argument('dataset', choices=sorted(DATASETS))
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default='jsonl')
+    parser.add_argument('--output', help='arquivo de saída (padrão: stdout)')
+    parser.add_argument('--db', help='banco ou snapshot .db.gz (padrão: banco do jogo)')
+    args = parser.parse_args(argv)
+
+    # Só resolve o caminho: construir o Database escreveria no stdout e criaria/migraria o banco
+    from mud.core.database import default_db_path
+    db_path = args.db or default_db_path()
+    if not os.path.exists(db_path):
+        sys.exit(f"[Export] Banco não encontrado: {os.path.abspath(db_path)}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as out:
+            count = export(db_path, args.dataset, out, args.format)
+    else:
+        count = export(db_path, args.dataset, sys.stdout, args.format)
+    print(f"[Export] {count} linhas de {args.dataset}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
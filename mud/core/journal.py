@@ -0,0 +1,241 @@
+"""
+Journal append-only do estado dos jogadores
+Cada alteração de stats vira uma linha JSON com apenas os campos que mudaram.
+As linhas são gravadas e sincronizadas (fsync) em grupo, compactadas
+periodicamente nas tabelas principais e reaplicadas na inicialização se o
+servidor caiu antes da compactação.
+
+Os registros guardam valores absolutos (não deltas): reaplicar o mesmo
+registro duas vezes é inofensivo.
+"""
+
+import asyncio
+import copy
+import json
+import os
+import shutil
+from typing import Any, Dict, Optional
+
+from mud.core.metrics import metrics
+from mud.core.storage import StorageBackend, write_in_background
+
+# Liga/desliga o journal (desligado, os stats vão direto para o armazenamento)
+JOURNAL_ENABLED = os.environ.get('JOURNAL_ENABLED', '1').lower() not in ('0', 'false', 'no')
+# Intervalo máximo (segundos) entre um registro e seu fsync
+JOURNAL_FSYNC_INTERVAL = float(os.environ.get('JOURNAL_FSYNC_INTERVAL', 0.2))
+# Intervalo (segundos) entre compactações nas tabelas principais
+JOURNAL_COMPACT_INTERVAL = float(os.environ.get('JOURNAL_COMPACT_INTERVAL', 30))
+
+
+def default_journal_path(storage: StorageBackend) -> Optional[str]:
+    """Caminho do journal (JOURNAL_PATH ou ao lado do banco SQLite). None = sem journal"""
+    path = os.environ.get('JOURNAL_PATH')
+    if path:
+        return path
+    db_path = getattr(storage, 'db_path', None)
+    if not JOURNAL_ENABLED or not db_path:
+        return None
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'player_journal.log')
+
+
+class PlayerJournal:
+    """
+    Registra alterações de stats dos jogadores antes de aplicá-las ao armazenamento.
+    Toda a E/S (append, fsync, rotação e compactação) roda na thread de gravação
+    do armazenamento, que preserva a ordem das operações.
+    """
+
+    def __init__(self, storage: StorageBackend, path: Optional[str] = None):
+        self.storage = storage
+        self.path = path
+        self.enabled = path is not None
+        self._file = None
+        self._buffer: list = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        # Último estado registrado de cada jogador (para gravar só o que mudou)
+        self._recorded: Dict[str, Dict[str, Any]] = {}
+        # Campos registrados e ainda não aplicados ao armazenamento
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Lotes entregues à thread de gravação e ainda não confirmados (somados)
+        self._compacting: Dict[str, Dict[str, Any]] = {}
+        self._in_flight = 0
+        # Só na thread de gravação: lote cuja aplicação falhou (reaplicado na próxima)
+        self._unapplied: Dict[str, Dict[str, Any]] = {}
+        # Cópia no loop do último _unapplied informado, só para leitura (pending_state)
+        self._failed: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def _rotated_path(self) -> str:
+        return self.path + '.compacting'
+
+    # --- Inicialização ---
+
+    def recover(self) -> int:
+        """Reaplica registros deixados por um desligamento não limpo. Retorna quantos jogadores"""
+        if not self.enabled:
+            return 0
+        merged: Dict[str, Dict[str, Any]] = {}
+        records = 0
+        for path in (self._rotated_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Última linha incompleta (queda no meio da escrita)
+                    merged.setdefault(record['p'], {}).update(record['s'])
+                    records += 1
+        for name, stats in merged.items():
+            self.storage.update_player_stats(name, stats)
+        if records:
+            print(f"[Journal] {records} registros reaplicados ({len(merged)} jogadores)")
+            metrics.incr('journal.replayed', records)
+        for path in (self._rotated_path, self.path):
+            if os.path.exists(path):
+                os.remove(path)
+        self._file = open(self.path, 'ab')
+        return len(merged)
+
+    # --- Registro ---
+
+    def record(self, name: str, stats: Dict[str, Any]):
+        """Registra stats (completos ou parciais) do jogador; grava só os campos alterados"""
+        if not self.enabled:
+            self.storage.update_player_stats(name, stats)
+            return
+        recorded = self._recorded.setdefault(name, {})
+        changes = {key: copy.deepcopy(value) for key, value in stats.items() if recorded.get(key) != value}
+        if not changes:
+            return
+        recorded.update(copy.deepcopy(changes))
+        self._pending.setdefault(name, {}).update(changes)
+
+        line = json.dumps({'p': name, 's': changes}, separators=(',', ':')) + '\n'
+        self._buffer.append(line.encode('utf-8'))
+        metrics.incr('journal.records')
+        if self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(JOURNAL_FSYNC_INTERVAL, self.flush)
+
+    def pending_state(self, name: str) -> Dict[str, Any]:
+        """Campos ainda não aplicados ao armazenamento (para sobrepor aos dados lidos no login)"""
+        state = copy.deepcopy(self._failed.get(name, {}))
+        state.update(copy.deepcopy(self._compacting.get(name, {})))
+        state.update(copy.deepcopy(self._pending.get(name, {})))
+        return state
+
+    def pending_players(self) -> set:
+        """Jogadores com registros ainda não aplicados ao armazenamento"""
+        return set(self._pending) | set(self._compacting) | set(self._failed)
+
+    def forget_player(self, name: str):
+        """Jogador saiu: descarta o estado usado para calcular diffs"""
+        self._recorded.pop(name, None)
+
+    # --- E/S em segundo plano ---
+
+    def flush(self):
+        """Envia o lote acumulado para ser gravado com um único fsync"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._buffer:
+            return
+        data = b''.join(self._buffer)
+        self._buffer = []
+        write_in_background(self._write_and_sync, data)
+
+    def _write_and_sync(self, data: bytes):
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        metrics.incr('journal.fsyncs')
+
+    def compact(self):
+        """Aplica os registros pendentes às tabelas principais e trunca o journal"""
+        # Só um lote que falhou: compacta mesmo sem registros novos para reaplicá-lo
+        if not self.enabled or not (self._pending or self._failed):
+            return
+        self.flush()
+        batch, self._pending = self._pending, {}
+        # Continua visível em pending_state até a thread de gravação confirmar
+        for name, stats in batch.items():
+            self._compacting.setdefault(name, {}).update(stats)
+        self._in_flight += 1
+        write_in_background(self._compact, batch, asyncio.get_running_loop())
+
+    def _compact(self, batch: Dict[str, Dict[str, Any]], loop: asyncio.AbstractEventLoop):
+        """
+        Thread de gravação: gira o arquivo, aplica o lote e remove o arquivo girado.
+        Se a aplicação falha, o arquivo girado fica (para o recover) e o lote é
+        reaplicado junto com o próximo, por baixo dele (única via de nova tentativa).
+        """
+        retried = bool(self._unapplied)
+        if retried:
+            merged, self._unapplied = self._unapplied, {}
+            for name, stats in batch.items():
+                merged.setdefault(name, {}).update(stats)
+            batch = merged
+        self._rotate()
+        try:
+            for name, stats in batch.items():
+                self.storage.update_player_stats(name, stats)
+        except Exception:
+            self._unapplied = batch
+            metrics.incr('journal.compaction_errors')
+            self._notify(loop, self._compaction_failed, {name: dict(stats) for name, stats in batch.items()})
+            raise
+        os.remove(self._rotated_path)
+        metrics.incr('journal.compactions')
+        metrics.set_gauge('journal.last_compaction_players', len(batch))
+        self._notify(loop, self._compaction_done, retried)
+
+    def _rotate(self):
+        """Move o journal para o arquivo girado (anexa, se sobrou um de uma compactação que falhou)"""
+        self._file.close()
+        if os.path.exists(self._rotated_path):
+            with open(self.path, 'rb') as src, open(self._rotated_path, 'ab') as dst:
+                shutil.copyfileobj(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+            # Conteúdo já está no arquivo girado (reaplicar um registro é inofensivo)
+            self._file = open(self.path, 'wb')
+        else:
+            os.replace(self.path, self._rotated_path)
+            self._file = open(self.path, 'ab')
+
+    @staticmethod
+    def _notify(loop: asyncio.AbstractEventLoop, callback, *args):
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # Loop já encerrado (desligamento)
+
+    def _compaction_done(self, retried: bool = False):
+        self._in_flight -= 1
+        if retried:
+            # Lote que tinha falhado foi aplicado junto com este
+            self._failed = {}
+        if self._in_flight == 0:
+            self._compacting = {}
+
+    def _compaction_failed(self, batch: Dict[str, Dict[str, Any]]):
+        """Lote continua visível até a thread de gravação reaplicá-lo na próxima compactação"""
+        self._failed = batch
+        self._compaction_done()
+
+    async def run_compaction(self, interval: float = JOURNAL_COMPACT_INTERVAL):
+        """Task periódica de compactação"""
+        while True:
+            await asyncio.sleep(interval)
+            self.compact()
+
+    def close(self):
+        """Desligamento limpo: grava, compacta e espera a thread de gravação terminar"""
+        if not self.enabled or self._file is None:
+            return
+        self.compact()
+        write_in_background(self._file.close).result()
+        if os.path.exists(self.path) and os.path.getsize(self.path) == 0 and not (self._pending or self._failed):
+            os.remove(self.path)
@@ -0,0 +1,242 @@
+"""
+Backend de armazenamento em memória
+Mesma semântica do Database (SQLite), sem I/O de disco: para benchmarks do
+loop do jogo e testes. Nada sobrevive ao fim do processo.
+"""
+
+import copy
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from mud.core.passwords import hash_password, needs_rehash, verify_password
+from mud.core.storage import PlayerLoad, StorageBackend, lore_key
+
+
+class MemoryStorage(StorageBackend):
+    """StorageBackend mantido inteiramente em dicionários"""
+
+    def __init__(self):
+        self.accounts: Dict[str, Dict[str, Any]] = {}
+        self.players: Dict[str, Dict[str, Any]] = {}
+        self.quests: Dict[str, Dict[str, Any]] = {}
+        self.respawns: Dict[Tuple[str, str, str, int], Tuple[datetime, int]] = {}
+        # jogador -> lores vistas (world_id, room_id)
+        self.viewed_lores: Dict[str, Set[Tuple[str, str]]] = {}
+        # load_login/register_account rodam no pool de hash e as gravações na
+        # thread de gravação: contas, jogadores e lores são acessados com o lock
+        self._lock = threading.RLock()
+        print("[Storage] Usando armazenamento em memória (dados não são persistidos)")
+
+    # --- Contas ---
+
+    def register_account(self, username: str, password: str) -> tuple[bool, str]:
+        error = self._validate_account(username, password)
+        if error:
+            return False, error
+        password_hash = hash_password(password)
+        with self._lock:
+            if username.lower() in self.accounts:
+                return False, "Username já está em uso"
+            self.accounts[username.lower()] = {
+                'password_hash': password_hash,
+                'created_at': datetime.now(),
+                'last_login': None,
+                'compatibility_test_done': False,
+            }
+        return True, "Conta criada com sucesso!"
+
+    def _check_password(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+        """Conta com a senha conferida; None se a conta não existe, {} se a senha não confere"""
+        with self._lock:
+            account = self.accounts.get(username.lower())
+            if account is None:
+                return None
+            stored = account['password_hash']
+        # KDF fora do lock (não serializa os logins)
+        if not verify_password(password, stored):
+            return {}
+        new_hash = hash_password(password) if needs_rehash(stored) else None
+        with self._lock:
+            account['last_login'] = datetime.now()
+            if new_hash and account['password_hash'] == stored:
+                account['password_hash'] = new_hash
+            return dict(account)
+
+    def verify_login(self, username: str, password: str) -> bool:
+        return bool(self._check_password(username, password))
+
+    def load_login(self, username: str, password: str, player_name: str = None,
+                   load_player: bool = True) -> Optional[PlayerLoad]:
+        account = self._check_password(username, password)
+        if account is None:
+            return None
+        if not account:
+            return PlayerLoad(username=username, authenticated=False)
+        if not load_player:
+            return PlayerLoad(
+                username=username,
+                authenticated=True,
+                compatibility_test_done=account['compatibility_test_done'],
+                player_loaded=False
+            )
+        return PlayerLoad(
+            username=username,
+            authenticated=True,
+            compatibility_test_done=account['compatibility_test_done'],
+            player=self.get_player(player_name or username),
+            viewed_lores=self.get_viewed_lores(player_name or username)
+        )
+
+    def account_exists(self, username: str) -> bool:
+        return username.lower() in self.accounts
+
+    def has_done_compatibility_test(self, username: str) -> bool:
+        account = self.accounts.get(username.lower())
+        return bool(account and account['compatibility_test_done'])
+
+    def mark_compatibility_test_done(self, username: str):
+        with self._lock:
+            account = self.accounts.get(username.lower())
+            if account:
+                account['compatibility_test_done'] = True
+
+    # --- Jogadores ---
+
+    def player_exists(self, name: str) -> bool:
+        return name in self.players
+
+    def get_player(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.players.get(name)
+            if not row:
+                return None
+            return self._player_record(
+                (row['name'], row['world_id'], row['room_id'], row['class_id'],
+                 row['race_id'], row['gender_id'], row['last_played']),
+                copy.deepcopy(row['stats'])
+            )
+
+    def create_player(self, name: str, world_id: str, room_id: str,
+                      class_id: str = "", race_id: str = "", gender_id: str = "",
+                      password_hash: str = None) -> bool:
+        with self._lock:
+            if name in self.players:
+                return False
+            now = datetime.now()
+            self.players[name] = {
+                'name': name,
+                'password_hash': password_hash,
+                'world_id': world_id,
+                'room_id': room_id,
+                'class_id': class_id,
+                'race_id': race_id,
+                'gender_id': gender_id,
+                'created_at': now,
+                'last_played': now,
+                'stats': {},
+            }
+        return True
+
+    def update_player_class_race_gender(self, name: str, class_id: str, race_id: str, gender_id: str):
+        with self._lock:
+            row = self.players.get(name)
+            if row:
+                row.update(class_id=class_id, race_id=race_id, gender_id=gender_id)
+
+    def update_player_location(self, name: str, world_id: str, room_id: str):
+        with self._lock:
+            row = self.players.get(name)
+            if row:
+                row.update(world_id=world_id, room_id=room_id, last_played=datetime.now())
+
+    def update_player_stats(self, name: str, stats: Dict[str, Any]):
+        with self._lock:
+            row = self.players.get(name)
+            if row:
+                row['stats'].update(copy.deepcopy(stats))
+                row['last_played'] = datetime.now()
+
+    def get_all_players(self) -> list:
+        return [{'name': r['name'], 'world_id': r['world_id'], 'room_id': r['room_id']} for r in self.players.values()]
+
+    def delete_player(self, name: str):
+        with self._lock:
+            self.players.pop(name, None)
+            self.viewed_lores.pop(name, None)
+
+    # --- Quests ---
+
+    def save_quest(self, quest: Dict[str, Any], world_id: str, generated_by: str = 'system'):
+        self.quests[quest['id']] = {
+            'id': quest['id'],
+            'world_id': world_id,
+            'giver_npc': quest.get('giver_npc', ''),
+            'name': quest['name'],
+            'description': quest['description'],
+            'lore': quest.get('lore', ''),
+            'objectives': copy.deepcopy(quest.get('objectives', [])),
+            'rewards': copy.deepcopy(quest.get('rewards', {})),
+            'status': quest.get('status', 'available'),
+            'generated_by': generated_by
+        }
+        return True
+
+    def get_quests_by_npc(self, world_id: str, npc_id: str) -> List[Dict[str, Any]]:
+        return [copy.deepcopy(q) for q in self.quests.values()
+                if q['world_id'] == world_id and q['giver_npc'] == npc_id]
+
+    def get_all_quests(self, world_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [copy.deepcopy(q) for q in self.quests.values() if not world_id or q['world_id'] == world_id]
+
+    def delete_quest(self, quest_id: str):
+        self.quests.pop(quest_id, None)
+
+    def quest_exists(self, quest_id: str) -> bool:
+        return quest_id in self.quests
+
+    # --- Respawn de monstros ---
+
+    def register_monster_death(self, world_id: str, room_id: str, monster_id: str, instance_id: int, respawn_time: int):
+        self.respawns[(world_id, room_id, monster_id, instance_id)] = (datetime.now(), respawn_time)
+
+    def _time_remaining(self, key) -> float:
+        death_time, respawn_time = self.respawns[key]
+        return max(0, respawn_time - (datetime.now() - death_time).total_seconds())
+
+    def can_monster_respawn(self, world_id: str, room_id: str, monster_id: str, instance_id: int) -> bool:
+        key = (world_id, room_id, monster_id, instance_id)
+        return key not in self.respawns or self._time_remaining(key) <= 0
+
+    def get_room_respawns(self, world_id: str, room_id: str) -> Dict[str, Dict]:
+        respawns = {}
+        for key in list(self.respawns):
+            if key[0] != world_id or key[1] != room_id:
+                continue
+            time_remaining = self._time_remaining(key)
+            respawns[f"{key[2]}_{key[3]}"] = {
+                'monster_id': key[2],
+                'instance_id': key[3],
+                'time_remaining': time_remaining,
+                'can_respawn': time_remaining <= 0
+            }
+        return respawns
+
+    def cleanup_old_respawns(self, world_id: str, room_id: str):
+        for key in list(self.respawns):
+            if key[0] == world_id and key[1] == room_id and self._time_remaining(key) <= 0:
+                del self.respawns[key]
+
+    # --- Lores vistas ---
+
+    def has_viewed_lore(self, player_name: str, world_id: str, room_id: str) -> bool:
+        with self._lock:
+            return lore_key(world_id, room_id) in self.viewed_lores.get(player_name, ())
+
+    def mark_lore_as_viewed(self, player_name: str, world_id: str, room_id: str):
+        with self._lock:
+            self.viewed_lores.setdefault(player_name, set()).add(lore_key(world_id, room_id))
+
+    def get_viewed_lores(self, player_name: str) -> Set[Tuple[str, str]]:
+        with self._lock:
+            return set(self.viewed_lores.get(player_name, ()))
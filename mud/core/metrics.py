@@ -0,0 +1,45 @@
+"""
+Métricas simples do servidor (contadores e medidores em memória)
+Exibidas no comando 'server' do lobby
+"""
+
+from typing import Dict, Union
+
+Number = Union[int, float]
+
+
+class Metrics:
+    """Registro de contadores e medidores do processo"""
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, Number] = {}
+
+    def incr(self, name: str, amount: int = 1):
+        """Incrementa um contador"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: Number):
+        """Define o valor atual de um medidor"""
+        self.gauges[name] = value
+
+    def get(self, name: str, default: Number = 0) -> Number:
+        """Retorna o valor de um contador ou medidor"""
+        if name in self.counters:
+            return self.counters[name]
+        return self.gauges.get(name, default)
+
+    def snapshot(self) -> Dict[str, Number]:
+        """Retorna cópia de todas as métricas (ordenadas por nome)"""
+        values = dict(self.counters)
+        values.update(self.gauges)
+        return dict(sorted(values.items()))
+
+    def reset(self):
+        """Zera todas as métricas"""
+        self.counters.clear()
+        self.gauges.clear()
+
+
+# Instância global usada pelo servidor
+metrics = Metrics()
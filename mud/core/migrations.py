@@ -0,0 +1,187 @@
+"""
+Migrações versionadas do banco de dados
+Cada migração roda uma única vez; a versão aplicada fica na tabela schema_version.
+Na inicialização basta comparar a versão do banco com a última migração.
+"""
+
+import sqlite3
+from typing import Callable, List, Tuple
+
+from mud.core import archive, player_schema
+from mud.core.metrics import metrics
+from mud.core.player_schema import SCALAR_FIELDS
+
+
+def _columns(cursor, table: str) -> set:
+    cursor.execute(f'PRAGMA table_info({table})')
+    return {row[1] for row in cursor.fetchall()}
+
+
+def add_column(cursor, table: str, column: str, definition: str):
+    """ALTER TABLE ADD COLUMN apenas se a coluna ainda não existir"""
+    if column not in _columns(cursor, table):
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+
+def _001_base_schema(cursor):
+    """Tabelas originais (bancos antigos podem já tê-las, sem algumas colunas)"""
+    # Tabela de jogadores
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS players (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            password_hash TEXT,
+            world_id TEXT NOT NULL,
+            room_id TEXT NOT NULL,
+            class_id TEXT,
+            race_id TEXT,
+            gender_id TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_played TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            stats TEXT DEFAULT '{}'
+        )
+    ''')
+    for col in ['class_id', 'race_id', 'gender_id', 'password_hash']:
+        add_column(cursor, 'players', col, 'TEXT')
+
+    # Tabela de contas (para login/registro)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS accounts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP,
+            compatibility_test_done INTEGER DEFAULT 0
+        )
+    ''')
+    add_column(cursor, 'accounts', 'compatibility_test_done', 'INTEGER DEFAULT 0')
+
+    # Tabela de quests (para persistência de quests geradas)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS quests (
+            id TEXT PRIMARY KEY,
+            world_id TEXT NOT NULL,
+            npc_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT NOT NULL,
+            lore TEXT DEFAULT '',
+            objectives TEXT NOT NULL,
+            rewards TEXT NOT NULL,
+            status TEXT DEFAULT 'available',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            generated_by TEXT DEFAULT 'system'
+        )
+    ''')
+
+    # Tabela de respawn de monstros (para controlar quando monstros podem respawnar)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monster_respawns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            world_id TEXT NOT NULL,
+            room_id TEXT NOT NULL,
+            monster_id TEXT NOT NULL,
+            instance_id INTEGER NOT NULL,
+            death_time TIMESTAMP NOT NULL,
+            respawn_time INTEGER NOT NULL,
+            UNIQUE(world_id, room_id, monster_id, instance_id)
+        )
+    ''')
+
+    # Tabela de lores vistas (para rastrear quais lores o jogador já viu)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS viewed_lores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT NOT NULL,
+            world_id TEXT NOT NULL,
+            room_id TEXT NOT NULL,
+            viewed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(player_name, world_id, room_id)
+        )
+    ''')
+
+    # Índices (os que duplicavam restrições UNIQUE são removidos na migração 3)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_world ON players(world_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_quest_world ON quests(world_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_quest_npc ON quests(npc_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_respawn_time ON monster_respawns(death_time)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_viewed_lores_room ON viewed_lores(world_id, room_id)')
+
+
+def _002_normalized_stats(cursor):
+    """Colunas quentes de stats, extras/stats_version e tabelas filhas"""
+    for col in SCALAR_FIELDS:
+        add_column(cursor, 'players', col, 'INTEGER')
+    add_column(cursor, 'players', 'extras', "TEXT DEFAULT '{}'")
+    add_column(cursor, 'players', 'stats_version', 'INTEGER DEFAULT 0')
+    player_schema.create_child_tables(cursor)
+
+
+def _003_drop_redundant_indexes(cursor):
+    """
+    Remove índices cobertos pelos índices automáticos das restrições UNIQUE
+    (players.name, accounts.username e prefixos de UNIQUE compostos)
+    """
+    cursor.execute('DROP INDEX IF EXISTS idx_name')
+    cursor.execute('DROP INDEX IF EXISTS idx_username')
+    cursor.execute('DROP INDEX IF EXISTS idx_respawn_world_room')
+    cursor.execute('DROP INDEX IF EXISTS idx_viewed_lores_player')
+
+
+def _004_player_archive(cursor):
+    """Tabela de jogadores arquivados e índice para achar os inativos"""
+    archive.create_archive_table(cursor)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_players_last_played ON players(last_played)')
+
+
+# Migrações em ordem: (versão, descrição, função)
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, 'esquema base', _001_base_schema),
+    (2, 'stats normalizados', _002_normalized_stats),
+    (3, 'remove índices redundantes', _003_drop_redundant_indexes),
+    (4, 'arquivo de jogadores inativos', _004_player_archive),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """Versão atual do esquema (0 se o banco ainda não é versionado)"""
+    try:
+        row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Aplica as migrações pendentes, cada uma em sua própria transação. Retorna a versão final.
+    As migrações são idempotentes (DDL no SQLite não é desfeito por rollback).
+    """
+    version = get_version(conn)
+    if version < LATEST_VERSION:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
+        for number, description, apply in MIGRATIONS:
+            if number <= version:
+                continue
+            cursor = conn.cursor()
+            try:
+                apply(cursor)
+                cursor.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                               (number, description))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            print(f"[Database] Migração {number} aplicada: {description}")
+            version = number
+    metrics.set_gauge('db.schema_version', version)
+    return version
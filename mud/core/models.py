@@ -3,7 +3,7 @@ Modelos de dados do MUD
 """
 
 from dataclasses import dataclass, asdict
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Optional, List, Set, Tuple
 import asyncio
 
 @dataclass
@@ -282,6 +282,9 @@ class Player:
     # Canais de chat (channels)
     channels: List[str] = None  # Lista de canais que o jogador está inscrito
     
+    # Lores de sala já vistas (carregadas no login; look não consulta o banco)
+    viewed_lores: Set[Tuple[str, str]] = None  # {(world_id, room_id)}
+    
     def __post_init__(self):
         if self.inventory is None:
             self.inventory = []
@@ -310,6 +313,8 @@ class Player:
         if self.channels is None:
             # Canal "local" sempre está ativo por padrão
             self.channels = ["local"]
+        if self.viewed_lores is None:
+            self.viewed_lores = set()
     
     def is_alive(self) -> bool:
         return self.current_hp > 0
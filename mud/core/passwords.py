@@ -0,0 +1,175 @@
+"""
+Hash de senhas com KDF configurável (scrypt ou PBKDF2 da biblioteca padrão)
+O cálculo roda em um pool de threads limitado para não travar o loop do jogo
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from mud.core.metrics import metrics
+
+# Algoritmo usado para novos hashes: 'scrypt' ou 'pbkdf2'
+PASSWORD_KDF = os.environ.get('PASSWORD_KDF', 'scrypt').lower()
+# Custo do scrypt (N deve ser potência de 2) e do PBKDF2 (iterações)
+SCRYPT_N = int(os.environ.get('PASSWORD_SCRYPT_N', 2 ** 14))
+SCRYPT_R = int(os.environ.get('PASSWORD_SCRYPT_R', 8))
+SCRYPT_P = int(os.environ.get('PASSWORD_SCRYPT_P', 1))
+PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 310000))
+# Threads dedicadas ao hash (limita quantos logins simultâneos consomem CPU)
+HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+
+# Cache de verificações bem-sucedidas (reconexões não recalculam o KDF)
+VERIFY_CACHE_SIZE = int(os.environ.get('PASSWORD_CACHE_SIZE', 1024))
+VERIFY_CACHE_TTL = float(os.environ.get('PASSWORD_CACHE_TTL', 600))
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+def _is_legacy(stored: str) -> bool:
+    """Hash antigo: SHA-256 simples em hexadecimal"""
+    return '$' not in stored and len(stored) == 64
+
+
+def _derive(password: str, algorithm: str, params: list, salt: bytes) -> bytes:
+    if algorithm == 'scrypt':
+        n, r, p = (int(v) for v in params)
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=128 * n * r * p + 1024 * 1024, dklen=KEY_BYTES)
+    if algorithm == 'pbkdf2_sha256':
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, int(params[0]), dklen=KEY_BYTES)
+    raise ValueError(f"KDF desconhecido: {algorithm}")
+
+
+def hash_password(password: str) -> str:
+    """
+    Gera o hash no formato '<algoritmo>$<parâmetros>$<salt>$<hash>' com o KDF configurado
+    (bloqueante: use hash_password_async no loop)
+    """
+    salt = os.urandom(SALT_BYTES)
+    if PASSWORD_KDF == 'pbkdf2':
+        algorithm, params = 'pbkdf2_sha256', [str(PBKDF2_ITERATIONS)]
+    else:
+        algorithm, params = 'scrypt', [str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+
+    started = time.perf_counter()
+    key = _derive(password, algorithm, params, salt)
+    metrics.set_gauge('auth.kdf_ms', round((time.perf_counter() - started) * 1000, 2))
+    return '$'.join([algorithm] + params + [_b64encode(salt), _b64encode(key)])
+
+
+def needs_rehash(stored: str) -> bool:
+    """True se o hash é legado ou usa algoritmo/custo diferente do configurado"""
+    if not stored or _is_legacy(stored):
+        return True
+    parts = stored.split('$')
+    if PASSWORD_KDF == 'pbkdf2':
+        return parts[0] != 'pbkdf2_sha256' or parts[1:-2] != [str(PBKDF2_ITERATIONS)]
+    return parts[0] != 'scrypt' or parts[1:-2] != [str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+
+
+class VerificationCache:
+    """
+    LRU de verificações bem-sucedidas. A chave é o hash armazenado mais um HMAC
+    da senha com uma chave aleatória do processo (a senha nunca fica em memória)
+    """
+
+    def __init__(self, max_size: int = VERIFY_CACHE_SIZE, ttl: float = VERIFY_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._secret = os.urandom(32)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, password: str, stored: str) -> tuple:
+        return stored, hmac.new(self._secret, password.encode(), hashlib.sha256).digest()
+
+    def contains(self, password: str, stored: str) -> bool:
+        key = self._key(password, stored)
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, password: str, stored: str):
+        if self.max_size <= 0:
+            return
+        key = self._key(password, stored)
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+verification_cache = VerificationCache()
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """Verifica a senha contra um hash KDF ou legado (bloqueante)"""
+    if not stored:
+        return False
+    if verification_cache.contains(password, stored):
+        metrics.incr('auth.verify.cached')
+        return True
+
+    if _is_legacy(stored):
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        ok = hmac.compare_digest(candidate, stored)
+    else:
+        try:
+            algorithm, *params, salt, key = stored.split('$')
+            ok = hmac.compare_digest(_derive(password, algorithm, params, _b64decode(salt)), _b64decode(key))
+        except (ValueError, TypeError) as e:
+            print(f"[Auth] Hash de senha inválido: {e}")
+            return False
+
+    metrics.incr('auth.verify.ok' if ok else 'auth.verify.failed')
+    if ok:
+        verification_cache.add(password, stored)
+    return ok
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Pool limitado usado para KDF (e para a consulta de login que o verifica)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max(1, HASH_WORKERS), thread_name_prefix='kdf')
+    return _executor
+
+
+async def run_in_hash_pool(func: Callable, *args):
+    """Executa uma função bloqueante que calcula hashes fora do loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    return await run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(password: str, stored: str) -> bool:
+    return await run_in_hash_pool(verify_password, password, stored)
@@ -0,0 +1,247 @@
+"""
+Esquema normalizado do estado dos jogadores
+Campos quentes ficam em colunas da tabela players; inventário, equipamento,
+magias e quests ficam em tabelas filhas. O resto vai para a coluna extras (JSON).
+As gravações são diffs mínimos contra o último estado persistido.
+O inventário é guardado como multiconjunto (item -> quantidade): a ordem dos
+itens não é preservada, cópias de um item voltam agrupadas na posição em que
+o item apareceu primeiro ([a, b, a] é lido como [a, a, b]).
+"""
+
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from mud.core.metrics import metrics
+
+# Versão do formato dos stats de cada linha de players
+STATS_VERSION_BLOB = 0        # tudo na coluna stats (JSON)
+STATS_VERSION_NORMALIZED = 1  # colunas + tabelas filhas + extras
+
+# Campos escalares com coluna própria em players (None = ausente)
+SCALAR_FIELDS = (
+    'hp', 'max_hp', 'current_stamina', 'max_stamina', 'level',
+    'experience', 'gold', 'attack', 'defense', 'unspent_points',
+)
+
+# Campos guardados nas tabelas filhas
+CHILD_FIELDS = (
+    'inventory', 'equipment', 'known_spells', 'equipped_spells',
+    'active_quests', 'completed_quests', 'quest_progress',
+)
+
+
+def create_child_tables(cursor):
+    """Cria as tabelas filhas do esquema normalizado (as colunas vêm das migrações)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS player_inventory (
+            player_name TEXT NOT NULL,
+            item_id TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            position INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (player_name, item_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS player_equipment (
+            player_name TEXT NOT NULL,
+            slot TEXT NOT NULL,
+            item_id TEXT,
+            PRIMARY KEY (player_name, slot)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS player_spells (
+            player_name TEXT NOT NULL,
+            spell_id TEXT NOT NULL,
+            level INTEGER,
+            equipped_slot INTEGER,
+            PRIMARY KEY (player_name, spell_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS player_quests (
+            player_name TEXT NOT NULL,
+            quest_id TEXT NOT NULL,
+            active INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            progress TEXT,
+            PRIMARY KEY (player_name, quest_id)
+        )
+    ''')
+
+
+def _spell_rows(stats: Dict[str, Any]) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+    """spell_id -> (nível, slot equipado)"""
+    rows = {spell_id: (level, None) for spell_id, level in (stats.get('known_spells') or {}).items()}
+    for slot, spell_id in enumerate(stats.get('equipped_spells') or []):
+        rows[spell_id] = (rows.get(spell_id, (None, None))[0], slot)
+    return rows
+
+
+def _quest_rows(stats: Dict[str, Any]) -> Dict[str, Tuple[int, int, Optional[str]]]:
+    """quest_id -> (ativa, concluída, progresso JSON)"""
+    active = stats.get('active_quests') or []
+    completed = stats.get('completed_quests') or []
+    progress = stats.get('quest_progress') or {}
+    rows = {}
+    for quest_id in list(active) + list(completed) + list(progress):
+        rows[quest_id] = (
+            1 if quest_id in active else 0,
+            1 if quest_id in completed else 0,
+            json.dumps(progress[quest_id], sort_keys=True) if quest_id in progress else None,
+        )
+    return rows
+
+
+def _extras(stats: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in stats.items() if k not in SCALAR_FIELDS and k not in CHILD_FIELDS}
+
+
+def read_stats(cursor, name: str, scalars: Tuple, extras_json: Optional[str]) -> Dict[str, Any]:
+    """Monta o dict de stats a partir das colunas (na ordem de SCALAR_FIELDS), extras e tabelas filhas"""
+    stats = json.loads(extras_json) if extras_json else {}
+    for field, value in zip(SCALAR_FIELDS, scalars):
+        if value is not None:
+            stats[field] = value
+
+    cursor.execute('''
+        SELECT item_id, quantity FROM player_inventory WHERE player_name = ? ORDER BY position
+    ''', (name,))
+    inventory = []
+    for item_id, quantity in cursor.fetchall():
+        inventory.extend([item_id] * quantity)
+    stats['inventory'] = inventory
+
+    cursor.execute('SELECT slot, item_id FROM player_equipment WHERE player_name = ?', (name,))
+    stats['equipment'] = {slot: item_id for slot, item_id in cursor.fetchall()}
+
+    cursor.execute('SELECT spell_id, level, equipped_slot FROM player_spells WHERE player_name = ?', (name,))
+    known, equipped = {}, []
+    for spell_id, level, slot in cursor.fetchall():
+        if level is not None:
+            known[spell_id] = level
+        if slot is not None:
+            equipped.append((slot, spell_id))
+    stats['known_spells'] = known
+    stats['equipped_spells'] = [spell_id for _, spell_id in sorted(equipped)]
+
+    cursor.execute('''
+        SELECT quest_id, active, completed, progress FROM player_quests WHERE player_name = ? ORDER BY rowid
+    ''', (name,))
+    active, completed, progress = [], [], {}
+    for quest_id, is_active, is_completed, quest_progress in cursor.fetchall():
+        if is_active:
+            active.append(quest_id)
+        if is_completed:
+            completed.append(quest_id)
+        if quest_progress is not None:
+            progress[quest_id] = json.loads(quest_progress)
+    stats['active_quests'] = active
+    stats['completed_quests'] = completed
+    stats['quest_progress'] = progress
+    return stats
+
+
+def write_stats(cursor, name: str, old: Dict[str, Any], new: Dict[str, Any]) -> int:
+    """
+    Grava apenas o que mudou de `old` (estado persistido) para `new`.
+    Retorna o número de comandos SQL emitidos.
+    """
+    statements = 0
+
+    # Escalares + extras em um único UPDATE
+    assignments: List[str] = []
+    values: List[Any] = []
+    for field in SCALAR_FIELDS:
+        if new.get(field) != old.get(field):
+            assignments.append(f'{field} = ?')
+            values.append(new.get(field))
+    new_extras = _extras(new)
+    if new_extras != _extras(old):
+        assignments.append('extras = ?')
+        values.append(json.dumps(new_extras))
+    if assignments:
+        cursor.execute(f'''
+            UPDATE players SET {', '.join(assignments)}, last_played = CURRENT_TIMESTAMP WHERE name = ?
+        ''', values + [name])
+        statements += 1
+
+    # Inventário como multiconjunto (item -> quantidade; a ordem não é gravada)
+    old_items = Counter(old.get('inventory') or [])
+    new_inventory = new.get('inventory') or []
+    new_items = Counter(new_inventory)
+    for item_id in set(old_items) | set(new_items):
+        if old_items[item_id] == new_items[item_id]:
+            continue
+        if new_items[item_id] == 0:
+            cursor.execute('DELETE FROM player_inventory WHERE player_name = ? AND item_id = ?', (name, item_id))
+        elif old_items[item_id] == 0:
+            cursor.execute('''
+                INSERT OR REPLACE INTO player_inventory (player_name, item_id, quantity, position)
+                VALUES (?, ?, ?, ?)
+            ''', (name, item_id, new_items[item_id], new_inventory.index(item_id)))
+        else:
+            cursor.execute('''
+                UPDATE player_inventory SET quantity = ? WHERE player_name = ? AND item_id = ?
+            ''', (new_items[item_id], name, item_id))
+        statements += 1
+
+    # Equipamento (slot -> item)
+    old_equipment = old.get('equipment') or {}
+    new_equipment = new.get('equipment') or {}
+    for slot in set(old_equipment) | set(new_equipment):
+        if old_equipment.get(slot) == new_equipment.get(slot) and (slot in old_equipment) == (slot in new_equipment):
+            continue
+        if slot not in new_equipment:
+            cursor.execute('DELETE FROM player_equipment WHERE player_name = ? AND slot = ?', (name, slot))
+        else:
+            cursor.execute('''
+                INSERT OR REPLACE INTO player_equipment (player_name, slot, item_id) VALUES (?, ?, ?)
+            ''', (name, slot, new_equipment[slot]))
+        statements += 1
+
+    # Magias (nível e slot equipado)
+    old_spells, new_spells = _spell_rows(old), _spell_rows(new)
+    for spell_id in set(old_spells) | set(new_spells):
+        if old_spells.get(spell_id) == new_spells.get(spell_id):
+            continue
+        if spell_id not in new_spells:
+            cursor.execute('DELETE FROM player_spells WHERE player_name = ? AND spell_id = ?', (name, spell_id))
+        else:
+            level, slot = new_spells[spell_id]
+            cursor.execute('''
+                INSERT OR REPLACE INTO player_spells (player_name, spell_id, level, equipped_slot) VALUES (?, ?, ?, ?)
+            ''', (name, spell_id, level, slot))
+        statements += 1
+
+    # Quests (ativa, concluída, progresso)
+    old_quests, new_quests = _quest_rows(old), _quest_rows(new)
+    for quest_id in list(new_quests) + [q for q in old_quests if q not in new_quests]:
+        if old_quests.get(quest_id) == new_quests.get(quest_id):
+            continue
+        if quest_id not in new_quests:
+            cursor.execute('DELETE FROM player_quests WHERE player_name = ? AND quest_id = ?', (name, quest_id))
+        elif quest_id in old_quests:
+            cursor.execute('''
+                UPDATE player_quests SET active = ?, completed = ?, progress = ? WHERE player_name = ? AND quest_id = ?
+            ''', new_quests[quest_id] + (name, quest_id))
+        else:
+            cursor.execute('''
+                INSERT INTO player_quests (player_name, quest_id, active, completed, progress) VALUES (?, ?, ?, ?, ?)
+            ''', (name, quest_id) + new_quests[quest_id])
+        statements += 1
+
+    metrics.incr('db.stats.updates')
+    metrics.incr('db.stats.statements', statements)
+    return statements
+
+
+def migrate_blob(cursor, name: str, blob: Optional[str]):
+    """Converte os stats JSON antigos de um jogador para o esquema normalizado"""
+    stats = json.loads(blob) if blob else {}
+    write_stats(cursor, name, {}, stats)
+    cursor.execute('''
+        UPDATE players SET stats = '{}', stats_version = ? WHERE name = ?
+    ''', (STATS_VERSION_NORMALIZED, name))
+    metrics.incr('db.stats.migrated')
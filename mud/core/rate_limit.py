@@ -0,0 +1,123 @@
+"""
+Controle de taxa de entrada por sessão (token bucket)
+Evita que um único cliente sature o loop do servidor com comandos
+"""
+
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from mud.core.metrics import metrics
+
+# Categorias de comandos com orçamentos separados
+CATEGORY_CHAT = 'chat'
+CATEGORY_MOVEMENT = 'movement'
+CATEGORY_COMBAT = 'combat'
+CATEGORY_DEFAULT = 'default'
+
+CHAT_COMMANDS = frozenset(['say', '"', 'shout', 'global'])
+COMBAT_COMMANDS = frozenset(['attack', 'kill', 'k', 'cast', 'lançar'])
+MOVEMENT_COMMANDS = frozenset(['entrar', 'enter', 'sair', 'exit_dungeon', 'lobby'])
+
+
+def _budget_from_env(category: str, rate: float, capacity: int) -> Tuple[float, int]:
+    """Lê (tokens por segundo, capacidade) de RATE_<CATEGORIA>=rate,capacidade"""
+    value = os.environ.get(f'RATE_{category.upper()}')
+    if not value:
+        return rate, capacity
+    try:
+        env_rate, env_capacity = value.split(',')
+        return float(env_rate), int(env_capacity)
+    except ValueError:
+        print(f"[RateLimit] Valor inválido para RATE_{category.upper()}: {value}")
+        return rate, capacity
+
+
+# Orçamentos padrão: (tokens por segundo, capacidade do balde)
+DEFAULT_BUDGETS: Dict[str, Tuple[float, int]] = {
+    CATEGORY_CHAT: _budget_from_env(CATEGORY_CHAT, 1.0, 5),
+    CATEGORY_MOVEMENT: _budget_from_env(CATEGORY_MOVEMENT, 4.0, 8),
+    CATEGORY_COMBAT: _budget_from_env(CATEGORY_COMBAT, 3.0, 6),
+    CATEGORY_DEFAULT: _budget_from_env(CATEGORY_DEFAULT, 5.0, 10),
+}
+
+# Tempo máximo (segundos) que um comando pode esperar por token antes de ser descartado
+MAX_DEFER = float(os.environ.get('RATE_MAX_DEFER', 2.0))
+
+# Profundidade máxima da fila de entrada por sessão
+INPUT_QUEUE_MAX = int(os.environ.get('INPUT_QUEUE_MAX', 20))
+
+
+def publish_limits():
+    """Expõe os orçamentos configurados nas métricas do servidor"""
+    for category, (rate, capacity) in DEFAULT_BUDGETS.items():
+        metrics.set_gauge(f'input.limit.{category}.rate', rate)
+        metrics.set_gauge(f'input.limit.{category}.burst', capacity)
+    metrics.set_gauge('input.limit.queue_max', INPUT_QUEUE_MAX)
+
+
+class TokenBucket:
+    """Balde de tokens: recarrega `rate` tokens por segundo até `capacity`"""
+
+    def __init__(self, rate: float, capacity: int, now: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic() if now is None else now
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def consume(self, amount: float = 1.0, now: Optional[float] = None) -> bool:
+        """Tenta consumir tokens. Retorna True se havia saldo suficiente"""
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    def time_until_available(self, amount: float = 1.0, now: Optional[float] = None) -> float:
+        """Segundos até haver tokens suficientes (0 se já houver)"""
+        self._refill(time.monotonic() if now is None else now)
+        missing = amount - self.tokens
+        if missing <= 0:
+            return 0.0
+        if self.rate <= 0:
+            return float('inf')
+        return missing / self.rate
+
+
+class SessionRateLimiter:
+    """Conjunto de baldes de uma sessão, um por categoria de comando"""
+
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, int]]] = None):
+        budgets = budgets or DEFAULT_BUDGETS
+        self.buckets: Dict[str, TokenBucket] = {
+            category: TokenBucket(rate, capacity) for category, (rate, capacity) in budgets.items()
+        }
+
+    def acquire(self, category: str) -> float:
+        """
+        Tenta consumir um token da categoria.
+        Retorna 0 se o comando pode executar agora, ou quantos segundos precisa esperar.
+        """
+        bucket = self.buckets.get(category) or self.buckets[CATEGORY_DEFAULT]
+        if bucket.consume():
+            metrics.incr(f'input.accepted.{category}')
+            return 0.0
+        return bucket.time_until_available()
+
+    def force(self, category: str):
+        """Consome o token após uma espera (saldo pode ficar negativo por arredondamento)"""
+        bucket = self.buckets.get(category) or self.buckets[CATEGORY_DEFAULT]
+        if not bucket.consume():
+            bucket.tokens -= 1.0
+        metrics.incr(f'input.deferred.{category}')
+
+    @staticmethod
+    def shed(category: str):
+        """Registra um comando descartado por excesso"""
+        metrics.incr(f'input.shed.{category}')
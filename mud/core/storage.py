@@ -0,0 +1,248 @@
+"""
+Interface de armazenamento do jogo
+Contas, jogadores, quests, respawns de monstros e lores vistas passam por um
+StorageBackend. O SQLite (Database) é o padrão; MemoryStorage serve para
+benchmarks e testes sem I/O de disco.
+"""
+
+import os
+import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class PlayerLoad:
+    """Resultado do login: conta, flag do teste de compatibilidade e jogador (se já existir)"""
+    username: str
+    authenticated: bool
+    compatibility_test_done: bool = False
+    player: Optional[Dict[str, Any]] = None  # mesmo formato de StorageBackend.get_player
+    viewed_lores: Set[Tuple[str, str]] = field(default_factory=set)  # (world_id, room_id)
+    # False quando o login só autenticou (jogador já estava em memória)
+    player_loaded: bool = True
+
+
+class StorageBackend(ABC):
+    """Operações de persistência usadas pelo servidor e pelos comandos"""
+
+    # --- Contas ---
+
+    @abstractmethod
+    def register_account(self, username: str, password: str) -> tuple[bool, str]:
+        """Registra uma nova conta. Retorna (sucesso, mensagem). Bloqueante (KDF)"""
+
+    @abstractmethod
+    def verify_login(self, username: str, password: str) -> bool:
+        """Verifica credenciais de login. Bloqueante (KDF)"""
+
+    @abstractmethod
+    def load_login(self, username: str, password: str, player_name: str = None,
+                   load_player: bool = True) -> Optional[PlayerLoad]:
+        """
+        Login completo (conta + jogador). None se a conta não existe. Bloqueante (KDF)
+        Com load_player=False só autentica (sessão do jogador já está em memória)
+        """
+
+    @abstractmethod
+    def account_exists(self, username: str) -> bool:
+        """Verifica se uma conta existe"""
+
+    @abstractmethod
+    def has_done_compatibility_test(self, username: str) -> bool:
+        """Verifica se o usuário já fez o teste de compatibilidade"""
+
+    @abstractmethod
+    def mark_compatibility_test_done(self, username: str):
+        """Marca o teste de compatibilidade como concluído"""
+
+    # --- Jogadores ---
+
+    @abstractmethod
+    def player_exists(self, name: str) -> bool:
+        """Verifica se um jogador existe"""
+
+    @abstractmethod
+    def get_player(self, name: str) -> Optional[Dict[str, Any]]:
+        """Busca dados de um jogador"""
+
+    @abstractmethod
+    def create_player(self, name: str, world_id: str, room_id: str,
+                      class_id: str = "", race_id: str = "", gender_id: str = "",
+                      password_hash: str = None) -> bool:
+        """Cria um novo jogador. False se já existir"""
+
+    @abstractmethod
+    def update_player_class_race_gender(self, name: str, class_id: str, race_id: str, gender_id: str):
+        """Atualiza classe, raça e gênero do jogador"""
+
+    @abstractmethod
+    def update_player_location(self, name: str, world_id: str, room_id: str):
+        """Atualiza localização do jogador"""
+
+    @abstractmethod
+    def update_player_stats(self, name: str, stats: Dict[str, Any]):
+        """Mescla stats (possivelmente parciais) ao estado salvo do jogador"""
+
+    @abstractmethod
+    def get_all_players(self) -> list:
+        """Lista de todos os jogadores (name, world_id, room_id)"""
+
+    @abstractmethod
+    def delete_player(self, name: str):
+        """Remove um jogador"""
+
+    def forget_player(self, name: str):
+        """Descarta caches em memória de um jogador que saiu do jogo"""
+
+    def archive_inactive_players(self, days: int, exclude=()) -> int:
+        """Move um lote de jogadores inativos para o arquivo. Retorna quantos (0 = nada a fazer)"""
+        return 0
+
+    def new_player_data(self, name: str, world_id: str, room_id: str,
+                        class_id: str = "", race_id: str = "", gender_id: str = "") -> Dict[str, Any]:
+        """Dados de um jogador recém-criado (equivalente a get_player logo após create_player)"""
+        return self._player_record((name, world_id, room_id, class_id, race_id, gender_id, None), {})
+
+    # --- Quests ---
+
+    @abstractmethod
+    def save_quest(self, quest: Dict[str, Any], world_id: str, generated_by: str = 'system'):
+        """Salva (ou substitui) uma quest"""
+
+    @abstractmethod
+    def get_quests_by_npc(self, world_id: str, npc_id: str) -> List[Dict[str, Any]]:
+        """Retorna todas as quests de um NPC"""
+
+    @abstractmethod
+    def get_all_quests(self, world_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna todas as quests (opcionalmente filtradas por world_id)"""
+
+    @abstractmethod
+    def delete_quest(self, quest_id: str):
+        """Remove uma quest"""
+
+    @abstractmethod
+    def quest_exists(self, quest_id: str) -> bool:
+        """Verifica se uma quest existe"""
+
+    # --- Respawn de monstros ---
+
+    @abstractmethod
+    def register_monster_death(self, world_id: str, room_id: str, monster_id: str, instance_id: int, respawn_time: int):
+        """Registra a morte de um monstro e quando ele pode respawnar (segundos)"""
+
+    @abstractmethod
+    def can_monster_respawn(self, world_id: str, room_id: str, monster_id: str, instance_id: int) -> bool:
+        """Verifica se já passou o tempo de respawn de um monstro"""
+
+    @abstractmethod
+    def get_room_respawns(self, world_id: str, room_id: str) -> Dict[str, Dict]:
+        """Respawns pendentes de uma sala ('<monster_id>_<instance_id>' -> info)"""
+
+    @abstractmethod
+    def cleanup_old_respawns(self, world_id: str, room_id: str):
+        """Remove registros de respawn que já expiraram"""
+
+    # --- Lores vistas ---
+
+    @abstractmethod
+    def has_viewed_lore(self, player_name: str, world_id: str, room_id: str) -> bool:
+        """Verifica se o jogador já viu a lore desta sala"""
+
+    @abstractmethod
+    def mark_lore_as_viewed(self, player_name: str, world_id: str, room_id: str):
+        """Marca a lore de uma sala como vista pelo jogador"""
+
+    @abstractmethod
+    def get_viewed_lores(self, player_name: str) -> Set[Tuple[str, str]]:
+        """Conjunto (world_id, room_id) das lores já vistas pelo jogador"""
+
+    # --- Auxiliares compartilhados ---
+
+    @staticmethod
+    def _validate_account(username: str, password: str) -> Optional[str]:
+        """Mensagem de erro do registro, ou None se os dados são válidos"""
+        if not username or not password:
+            return "Username e senha são obrigatórios"
+        if len(username) < 3:
+            return "Username deve ter pelo menos 3 caracteres"
+        if len(password) < 4:
+            return "Senha deve ter pelo menos 4 caracteres"
+        return None
+
+    @staticmethod
+    def _player_record(row, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Converte (name, world_id, room_id, class_id, race_id, gender_id, last_played) + stats em dict"""
+        stats = dict(stats)
+        # Se não tem stats básicos, inicializa
+        if not stats.get('max_hp'):
+            stats['max_hp'] = 100
+        if 'current_hp' not in stats:
+            stats['current_hp'] = stats.get('max_hp', 100)
+        if not stats.get('attack'):
+            stats['attack'] = 10
+        if not stats.get('defense'):
+            stats['defense'] = 5
+
+        return {
+            'name': row[0],
+            'world_id': row[1],
+            'room_id': row[2],
+            'class_id': row[3] or '',
+            'race_id': row[4] or '',
+            'gender_id': row[5] or '',
+            'stats': stats,
+            'last_played': row[6]
+        }
+
+
+def lore_key(world_id: str, room_id: str) -> Tuple[str, str]:
+    """Chave de uma lore vista, com strings internadas (compartilhadas entre jogadores)"""
+    return sys.intern(world_id), sys.intern(room_id)
+
+
+# Gravações assíncronas: uma única thread preserva a ordem das escritas
+_write_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _report_write_error(future: Future):
+    error = future.exception()
+    if error is not None:
+        print(f"[Storage] Erro em gravação em segundo plano: {error}")
+
+
+def write_in_background(func: Callable, *args) -> Future:
+    """Executa uma gravação fora do loop do jogo (sem esperar o resultado)"""
+    global _write_executor
+    if _write_executor is None:
+        _write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='storage-write')
+    future = _write_executor.submit(func, *args)
+    future.add_done_callback(_report_write_error)
+    return future
+
+
+# Backends disponíveis (nome -> fábrica). Outros backends podem se registrar aqui.
+BACKENDS: Dict[str, Callable[[], StorageBackend]] = {}
+
+
+def register_backend(name: str, factory: Callable[[], StorageBackend]):
+    """Registra um backend para uso via STORAGE_BACKEND"""
+    BACKENDS[name] = factory
+
+
+def create_storage(kind: Optional[str] = None) -> StorageBackend:
+    """Cria o backend configurado (STORAGE_BACKEND=sqlite|memory, padrão sqlite)"""
+    # Importados aqui para registrar os backends padrão sem import circular
+    from mud.core.database import Database
+    from mud.core.memory_storage import MemoryStorage
+    BACKENDS.setdefault('sqlite', Database)
+    BACKENDS.setdefault('memory', MemoryStorage)
+
+    kind = (kind or os.environ.get('STORAGE_BACKEND', 'sqlite')).lower()
+    if kind not in BACKENDS:
+        raise ValueError(f"Backend de armazenamento desconhecido: {kind} (disponíveis: {', '.join(sorted(BACKENDS))})")
+    print(f"[Storage] Backend: {kind}")
+    return BACKENDS[kind]()
@@ -0,0 +1,7 @@
+"""
+Net modules - Protocolo telnet das conexões TCP
+"""
+
+from mud.net.telnet import TelnetParser, TelnetSession, TelnetStreamWriter
+
+__all__ = ['TelnetParser', 'TelnetSession', 'TelnetStreamWriter']
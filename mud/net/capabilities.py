@@ -0,0 +1,107 @@
+"""
+Capacidades do cliente por sessão (largura, cores, UTF-8)
+Preenchidas pela negociação telnet (NAWS, TTYPE/MTTS) ou fixas no cliente web.
+A saída é adaptada na escrita: sem cor, as sequências ANSI são removidas; sem
+UTF-8, acentos e molduras viram ASCII. Só as telas fixas guardam a variante
+adaptada (ScreenRegistry); a saída dinâmica é adaptada sem cache.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+
+# Profundidade de cor
+COLOR_NONE = 0
+COLOR_ANSI = 16
+COLOR_256 = 256
+COLOR_TRUE = 16777216
+
+# Bits do MTTS (Mud Terminal Type Standard)
+MTTS_ANSI = 1
+MTTS_UTF8 = 4
+MTTS_256 = 8
+MTTS_TRUECOLOR = 256
+
+DEFAULT_WIDTH = 80
+# Largura mínima considerada nos layouts (clientes que informam 0 ou valores absurdos)
+MIN_WIDTH = 40
+
+_ANSI_PATTERN = re.compile(rb'\x1b\[[0-9;]*[A-Za-z]')
+
+# Molduras e símbolos comuns da interface -> ASCII
+_ASCII_FALLBACK = str.maketrans({
+    '═': '=', '─': '-', '━': '-', '║': '|', '│': '|', '┃': '|',
+    '╔': '+', '╗': '+', '╚': '+', '╝': '+', '╠': '+', '╣': '+', '╦': '+', '╩': '+', '╬': '+',
+    '┌': '+', '┐': '+', '└': '+', '┘': '+', '├': '+', '┤': '+', '┬': '+', '┴': '+', '┼': '+',
+    '█': '#', '▓': '#', '▒': ':', '░': '.', '•': '*', '►': '>', '◄': '<', '✓': 'v', '✗': 'x',
+})
+
+
+@dataclass
+class ClientCapabilities:
+    """O que sabemos do terminal do cliente"""
+    width: int = DEFAULT_WIDTH
+    height: int = 24
+    client_name: str = ''
+    terminal_type: str = ''
+    color: int = COLOR_ANSI
+    utf8: bool = True
+    # True quando algo foi informado pelo cliente (dispensa o teste interativo)
+    negotiated: bool = False
+
+    @property
+    def layout_width(self) -> int:
+        """Largura usada pelos layouts (nunca menor que MIN_WIDTH)"""
+        return max(self.width or DEFAULT_WIDTH, MIN_WIDTH)
+
+    @property
+    def needs_adaptation(self) -> bool:
+        return self.color == COLOR_NONE or not self.utf8
+
+    def apply_mtts(self, bits: int):
+        """Aplica o bitvector MTTS ('MTTS <n>' na terceira resposta do TTYPE)"""
+        if bits & MTTS_TRUECOLOR:
+            self.color = COLOR_TRUE
+        elif bits & MTTS_256:
+            self.color = COLOR_256
+        elif bits & MTTS_ANSI:
+            self.color = COLOR_ANSI
+        else:
+            self.color = COLOR_NONE
+        self.utf8 = bool(bits & MTTS_UTF8)
+        self.negotiated = True
+
+    def apply_terminal_type(self, name: str):
+        """Heurística pelo nome do terminal, para clientes sem MTTS"""
+        upper = name.upper()
+        if 'TRUECOLOR' in upper:
+            self.color = COLOR_TRUE
+        elif '256' in upper:
+            self.color = COLOR_256
+        elif upper in ('DUMB', 'UNKNOWN'):
+            self.color = COLOR_NONE
+        self.negotiated = True
+
+
+# Capacidades assumidas quando a sessão não informa nada (terminal ANSI/UTF-8)
+DEFAULT_CAPABILITIES = ClientCapabilities()
+
+
+def capabilities_of(writer) -> ClientCapabilities:
+    """Capacidades da sessão dona do writer"""
+    return getattr(writer, 'capabilities', None) or DEFAULT_CAPABILITIES
+
+
+class AdaptedBytes(bytes):
+    """Saída já adaptada ao terminal da sessão (a escrita não adapta de novo)"""
+
+
+def adapt_output(data: bytes, color: bool, utf8: bool) -> bytes:
+    """Variante da saída para o terminal (sem cor e/ou só ASCII)"""
+    if not color and b'\x1b' in data:
+        data = _ANSI_PATTERN.sub(b'', data)
+    if not utf8 and not data.isascii():
+        text = data.decode('utf-8', errors='replace').translate(_ASCII_FALLBACK)
+        text = unicodedata.normalize('NFKD', text)
+        data = text.encode('ascii', errors='ignore')
+    return data
@@ -0,0 +1,36 @@
+"""
+Controle de fluxo dos StreamReaders alimentados à mão (telnet e WebSocket)
+Um StreamReader criado sem protocolo não tem transporte para pausar, então
+quem chama feed_data acumularia dados sem limite. ReaderFlow faz o papel do
+transporte: o StreamReader pausa ao passar de 2x o limite e retoma quando o
+jogo consome; o laço que alimenta o reader espera em wait() antes de ler mais.
+"""
+
+import asyncio
+
+
+class ReaderFlow:
+    """Transporte mínimo (pause_reading/resume_reading) de um StreamReader"""
+
+    def __init__(self, reader: asyncio.StreamReader):
+        self.reader = reader
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+        reader.set_transport(self)
+
+    def pause_reading(self):
+        self._resumed.clear()
+
+    def resume_reading(self):
+        self._resumed.set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+
+    async def wait(self):
+        """Retorna quando o reader tem espaço para mais dados"""
+        await self._resumed.wait()
+
+    def get_extra_info(self, name: str, default=None):
+        return default
@@ -0,0 +1,119 @@
+"""
+Canal de dados estruturados fora de banda (GMCP)
+Vitais, sala, combate e inventário do jogador são enviados como JSON compacto
+apenas quando mudam, e só com as chaves alteradas (chave removida = null).
+O transporte é do writer da sessão: subnegociação telnet (TCP) ou frame
+{'type': 'gmcp'} no WebSocket.
+"""
+
+import json
+import os
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+from mud.core.metrics import metrics
+
+# Liga/desliga o GMCP (telnet e WebSocket)
+GMCP_ENABLED = os.environ.get('GMCP_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+
+def encode(package: str, data: Any) -> bytes:
+    """Mensagem GMCP: '<Pacote> <json>'"""
+    return f"{package} {json.dumps(data, separators=(',', ':'), ensure_ascii=False)}".encode('utf-8')
+
+
+def decode(payload: bytes):
+    """(pacote, dados) de uma mensagem GMCP recebida"""
+    package, _, body = payload.decode('utf-8', errors='replace').partition(' ')
+    try:
+        data = json.loads(body) if body else None
+    except json.JSONDecodeError:
+        data = body
+    return package, data
+
+
+class GMCPChannel:
+    """Último estado enviado por pacote a uma sessão; envia só as diferenças"""
+
+    def __init__(self, send: Callable[[str, Dict[str, Any]], None]):
+        self._send = send
+        self._sent: Dict[str, Dict[str, Any]] = {}
+
+    def update(self, package: str, data: Dict[str, Any]):
+        last = self._sent.get(package)
+        if last == data:
+            return
+        if last is None:
+            delta = data
+        else:
+            delta = {k: v for k, v in data.items() if last.get(k) != v}
+            delta.update({k: None for k in last if k not in data})
+        self._sent[package] = data
+        self._send(package, delta)
+        metrics.incr('gmcp.messages')
+
+
+# --- Estado do jogador por pacote ---
+
+def vitals(player) -> Dict[str, Any]:
+    return {
+        'hp': player.current_hp,
+        'maxhp': player.max_hp,
+        'sp': player.current_stamina,
+        'maxsp': player.max_stamina,
+        'level': player.level,
+        'xp': player.experience,
+        'gold': player.gold,
+    }
+
+
+def room_info(player, room) -> Dict[str, Any]:
+    info = {'world': player.world_id, 'id': player.room_id}
+    if room:
+        info['name'] = room.name
+        info['exits'] = sorted(room.exits)
+    return info
+
+
+def inventory(player) -> Dict[str, Any]:
+    """item_id -> quantidade"""
+    return dict(Counter(player.inventory))
+
+
+def combat(handler, player) -> Dict[str, Any]:
+    state = handler.combat_state.get(player.name)
+    if not state:
+        return {'active': False}
+    rooms = handler.monster_instances.get(state['world_id'], {})
+    monster = rooms.get(state['room_id'], {}).get(state['monster_instance_id'])
+    if not monster:
+        return {'active': True}
+    return {
+        'active': True,
+        'target': monster.name,
+        'hp': monster.current_hp,
+        'maxhp': monster.max_hp,
+    }
+
+
+def channel_for(player) -> Optional[GMCPChannel]:
+    """Canal GMCP da conexão atual do jogador (None se o cliente não negociou)"""
+    return getattr(player.writer, 'gmcp', None)
+
+
+def sync_vitals(player):
+    channel = channel_for(player)
+    if channel:
+        channel.update('Char.Vitals', vitals(player))
+
+
+def sync_player(player, handler):
+    """Envia o que mudou desde o último sync (chamado antes de cada prompt)"""
+    channel = channel_for(player)
+    if not channel:
+        return
+    room = handler.world_manager.get_room(player.world_id, player.room_id, handler.dungeon_manager)
+    channel.update('Char.Vitals', vitals(player))
+    channel.update('Room.Info', room_info(player, room))
+    channel.update('Char.Combat', combat(handler, player))
+    channel.update('Char.Items.Inv', inventory(player))
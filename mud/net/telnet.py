@@ -0,0 +1,352 @@
+"""
+Camada de protocolo telnet das conexões TCP
+Separa comandos telnet (IAC ...) da entrada do jogador, negocia opções com o
+cliente e, com MCCP2 aceito, comprime toda a saída da sessão num único fluxo zlib.
+NAWS e TTYPE/MTTS informam largura, cores e UTF-8 do terminal (ClientCapabilities).
+O jogo continua usando a interface de StreamReader/StreamWriter.
+"""
+
+import asyncio
+import os
+import zlib
+from typing import List, Optional, Tuple
+
+from mud.core.metrics import metrics
+from mud.net import gmcp
+from mud.net.capabilities import AdaptedBytes, ClientCapabilities, adapt_output
+from mud.net.flow import ReaderFlow
+
+# Bytes de controle do telnet (RFC 854)
+IAC = 255
+DONT = 254
+DO = 253
+WONT = 252
+WILL = 251
+SB = 250
+SE = 240
+
+# Opções
+TTYPE = 24  # Terminal Type (com MTTS na terceira resposta)
+NAWS = 31   # Negotiate About Window Size
+MCCP2 = 86  # Mud Client Compression Protocol v2
+GMCP = 201  # Generic Mud Communication Protocol
+
+TTYPE_IS = 0
+TTYPE_SEND = 1
+
+IAC_BYTE = bytes([IAC])
+
+# MCCP2: liga/desliga e nível de compressão zlib (1 = rápido, 9 = máximo)
+MCCP_ENABLED = os.environ.get('MCCP_ENABLED', '1').lower() not in ('0', 'false', 'no')
+MCCP_LEVEL = int(os.environ.get('MCCP_LEVEL', 6))
+
+# Tamanho máximo de uma subnegociação recebida (maiores são descartadas)
+MAX_SUBNEGOTIATION = 8192
+
+# Estados do parser
+_DATA, _IAC, _OPTION, _SB, _SB_IAC = range(5)
+
+# Evento de negociação: (verbo, opção, payload da subnegociação)
+TelnetEvent = Tuple[int, int, bytes]
+
+
+def command(verb: int, option: int) -> bytes:
+    """IAC <verbo> <opção>"""
+    return bytes([IAC, verb, option])
+
+
+def subnegotiation(option: int, payload: bytes = b'') -> bytes:
+    """IAC SB <opção> <payload> IAC SE (IACs do payload são duplicados)"""
+    return bytes([IAC, SB, option]) + payload.replace(IAC_BYTE, IAC_BYTE * 2) + bytes([IAC, SE])
+
+
+class TelnetParser:
+    """
+    Parser incremental: separa dados do jogador de comandos telnet.
+    O estado é mantido entre chamadas (um comando pode chegar partido em dois pacotes).
+    """
+
+    def __init__(self):
+        self._state = _DATA
+        self._verb = 0
+        self._option = 0
+        self._sb = bytearray()
+        self._sb_overflow = False
+
+    def feed(self, data: bytes) -> Tuple[bytes, List[TelnetEvent]]:
+        """Retorna (dados sem comandos telnet, eventos de negociação)"""
+        if self._state == _DATA and IAC not in data:
+            return data, []  # Caminho rápido: nada de telnet no pacote
+
+        out = bytearray()
+        events: List[TelnetEvent] = []
+        for byte in data:
+            state = self._state
+            if state == _DATA:
+                if byte == IAC:
+                    self._state = _IAC
+                else:
+                    out.append(byte)
+            elif state == _IAC:
+                if byte == IAC:
+                    out.append(IAC)  # IAC IAC = byte 255 literal
+                    self._state = _DATA
+                elif byte in (WILL, WONT, DO, DONT):
+                    self._verb = byte
+                    self._state = _OPTION
+                elif byte == SB:
+                    self._verb = SB
+                    self._sb.clear()
+                    self._sb_overflow = False
+                    self._state = _OPTION
+                else:
+                    self._state = _DATA  # NOP, GA, AYT...: descartados
+            elif state == _OPTION:
+                if self._verb == SB:
+                    self._option = byte
+                    self._state = _SB
+                else:
+                    events.append((self._verb, byte, b''))
+                    self._state = _DATA
+            elif state == _SB:
+                if byte == IAC:
+                    self._state = _SB_IAC
+                else:
+                    self._append_sb(byte)
+            else:  # _SB_IAC
+                if byte == SE:
+                    if self._sb_overflow:
+                        metrics.incr('telnet.sb_dropped')
+                    else:
+                        events.append((SB, self._option, bytes(self._sb)))
+                    self._sb.clear()
+                    self._state = _DATA
+                else:
+                    self._append_sb(byte)  # IAC IAC dentro da subnegociação
+                    self._state = _SB
+        return bytes(out), events
+
+    def _append_sb(self, byte: int):
+        # Subnegociação grande demais: o resto é ignorado até o IAC SE e ela é descartada
+        if len(self._sb) < MAX_SUBNEGOTIATION:
+            self._sb.append(byte)
+        else:
+            self._sb_overflow = True
+
+
+class TelnetStreamWriter:
+    """
+    Adaptador com a interface de asyncio.StreamWriter usada pelo jogo.
+    Com MCCP2 ativo, as escritas de um mesmo ciclo do loop são comprimidas e
+    enviadas com um único Z_SYNC_FLUSH (ou no drain, o que vier primeiro).
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.raw = writer
+        self._compressor = None
+        self._flush_scheduled = False
+        # Canal GMCP (criado quando o cliente aceita a opção)
+        self.gmcp: Optional[gmcp.GMCPChannel] = None
+        # Terminal do cliente (atualizado pela negociação NAWS/TTYPE)
+        self.capabilities = ClientCapabilities()
+
+    @property
+    def compressing(self) -> bool:
+        return self._compressor is not None
+
+    def start_compression(self, level: int = MCCP_LEVEL):
+        """A partir daqui toda a saída vai comprimida (chamar logo após IAC SB MCCP2 IAC SE)"""
+        self._compressor = zlib.compressobj(level)
+
+    def stop_compression(self):
+        """Encerra o fluxo zlib (o cliente recusou ou a conexão vai fechar)"""
+        if self._compressor is None:
+            return
+        tail = self._compressor.flush(zlib.Z_FINISH)
+        self._compressor = None
+        self._send_compressed(tail)
+
+    def write_raw(self, data: bytes):
+        """Escreve bytes de protocolo (já escapados), passando pelo compressor se ativo"""
+        if self._compressor is None:
+            self.raw.write(data)
+            return
+        metrics.incr('telnet.mccp.bytes_in', len(data))
+        compressed = self._compressor.compress(data)
+        if compressed:
+            self._send_compressed(compressed)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def write(self, data: bytes):
+        caps = self.capabilities
+        if caps.needs_adaptation and not isinstance(data, AdaptedBytes):
+            data = adapt_output(bytes(data), caps.color > 0, caps.utf8)
+        # Byte 255 nos dados precisa ir como IAC IAC (não ocorre em UTF-8 válido)
+        if IAC in data:
+            data = data.replace(IAC_BYTE, IAC_BYTE * 2)
+        self.write_raw(data)
+
+    def send_gmcp(self, package: str, data):
+        """Envia uma mensagem GMCP (IAC SB GMCP ... IAC SE)"""
+        self.write_raw(subnegotiation(GMCP, gmcp.encode(package, data)))
+
+    def _send_compressed(self, data: bytes):
+        if data:
+            metrics.incr('telnet.mccp.bytes_out', len(data))
+            self.raw.write(data)
+
+    def _flush(self):
+        self._flush_scheduled = False
+        if self._compressor is not None and not self.raw.is_closing():
+            self._send_compressed(self._compressor.flush(zlib.Z_SYNC_FLUSH))
+            sent = metrics.get('telnet.mccp.bytes_out')
+            if sent:
+                metrics.set_gauge('telnet.mccp.ratio', round(metrics.get('telnet.mccp.bytes_in') / sent, 2))
+
+    async def drain(self):
+        if self._flush_scheduled:
+            self._flush()
+        await self.raw.drain()
+
+    def is_closing(self) -> bool:
+        return self.raw.is_closing()
+
+    def close(self):
+        if not self.raw.is_closing():
+            try:
+                self._flush()
+                self.stop_compression()
+            except Exception:
+                pass
+        self.raw.close()
+
+    async def wait_closed(self):
+        try:
+            await self.raw.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    def get_extra_info(self, name: str, default=None):
+        return self.raw.get_extra_info(name, default)
+
+
+class TelnetSession:
+    """
+    Sessão telnet de uma conexão TCP: oferece as opções suportadas, responde
+    às negociações do cliente e entrega ao jogo só os dados digitados.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.raw_reader = reader
+        self.reader = asyncio.StreamReader()
+        # Pausa a leitura do socket enquanto o jogo não consome a entrada
+        self.flow = ReaderFlow(self.reader)
+        self.writer = TelnetStreamWriter(writer)
+        self.parser = TelnetParser()
+        # Opções que oferecemos (WILL) e opções que o cliente aceitou
+        self.offered = set()
+        if MCCP_ENABLED:
+            self.offered.add(MCCP2)
+        if gmcp.GMCP_ENABLED:
+            self.offered.add(GMCP)
+        self.enabled = set()
+        # Opções do lado do cliente que pedimos (DO)
+        self.requested = {NAWS, TTYPE}
+        self._ttype_replies: List[str] = []
+        for option in self.offered:
+            self.writer.write_raw(command(WILL, option))
+        for option in self.requested:
+            self.writer.write_raw(command(DO, option))
+        self._pump = asyncio.ensure_future(self._read_loop())
+
+    def streams(self) -> Tuple[asyncio.StreamReader, TelnetStreamWriter]:
+        """Reader/writer entregues ao handle_client"""
+        return self.reader, self.writer
+
+    async def _read_loop(self):
+        try:
+            while True:
+                await self.flow.wait()
+                data = await self.raw_reader.read(4096)
+                if not data:
+                    break
+                clean, events = self.parser.feed(data)
+                for verb, option, payload in events:
+                    self.handle_event(verb, option, payload)
+                if clean:
+                    self.reader.feed_data(clean)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.reader.feed_eof()
+
+    def handle_event(self, verb: int, option: int, payload: bytes = b''):
+        """Responde a uma negociação do cliente"""
+        if verb == DO:
+            if option not in self.offered:
+                self.writer.write_raw(command(WONT, option))
+            elif option not in self.enabled:
+                self.enabled.add(option)
+                self._on_enabled(option)
+        elif verb == DONT:
+            if option in self.enabled:
+                self.enabled.discard(option)
+                if option == MCCP2:
+                    self.writer.stop_compression()
+                elif option == GMCP:
+                    self.writer.gmcp = None
+        elif verb == SB:
+            if option == GMCP:
+                # Core.Hello / Core.Supports.* do cliente: apenas contabiliza
+                metrics.incr('gmcp.received')
+            elif option == NAWS and len(payload) >= 4:
+                caps = self.writer.capabilities
+                caps.width = int.from_bytes(payload[0:2], 'big')
+                caps.height = int.from_bytes(payload[2:4], 'big')
+                caps.negotiated = True
+            elif option == TTYPE and payload[:1] == bytes([TTYPE_IS]):
+                self._on_terminal_type(payload[1:].decode('ascii', errors='replace'))
+        elif verb == WILL:
+            if option == TTYPE:
+                self.writer.write_raw(subnegotiation(TTYPE, bytes([TTYPE_SEND])))
+            elif option not in self.requested:
+                self.writer.write_raw(command(DONT, option))
+
+    def _on_terminal_type(self, name: str):
+        """
+        Ciclo do TTYPE: 1ª resposta = cliente, 2ª = terminal, 3ª = 'MTTS <bits>'.
+        Uma resposta repetida indica que o cliente não tem mais o que informar.
+        """
+        caps = self.writer.capabilities
+        if name.upper().startswith('MTTS '):
+            try:
+                caps.apply_mtts(int(name[5:]))
+            except ValueError:
+                pass
+            metrics.incr('telnet.mtts')
+            return
+        if self._ttype_replies and self._ttype_replies[-1] == name:
+            return
+        self._ttype_replies.append(name)
+        if len(self._ttype_replies) == 1:
+            caps.client_name = name
+        else:
+            caps.terminal_type = name
+        caps.apply_terminal_type(name)
+        if len(self._ttype_replies) < 3:
+            self.writer.write_raw(subnegotiation(TTYPE, bytes([TTYPE_SEND])))
+
+    def _on_enabled(self, option: int):
+        if option == MCCP2:
+            # O início do fluxo comprimido vem logo após IAC SB MCCP2 IAC SE
+            self.writer.write_raw(subnegotiation(MCCP2))
+            self.writer.start_compression()
+            metrics.incr('telnet.mccp.sessions')
+        elif option == GMCP:
+            self.writer.gmcp = gmcp.GMCPChannel(self.writer.send_gmcp)
+            metrics.incr('gmcp.sessions')
+
+    def close(self):
+        self._pump.cancel()
@@ -4,16 +4,104 @@ Sistema de criação de personagem (escolha de classe, raça e gênero)
 
 import asyncio
 from mud.utils.ansi import ANSI
+from mud.utils.screens import screens
 from mud.systems.classes import ClassSystem
 
+def render_class_menu(class_system: ClassSystem) -> str:
+    """Menu de classes"""
+    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Escolha sua Classe ==={ANSI.RESET}\r\n\r\n"
+    for i, cls in enumerate(class_system.list_all_classes(), 1):
+        message += f"{ANSI.BRIGHT_GREEN}{i}.{ANSI.RESET} {cls['icon']} {ANSI.BRIGHT_CYAN}{cls['name']}{ANSI.RESET}\r\n"
+        message += f"   {cls['description']}\r\n\r\n"
+    message += f"{ANSI.BRIGHT_YELLOW}Digite o número da classe:{ANSI.RESET} "
+    return message
+
+def races_for_class(class_system: ClassSystem, class_id: str) -> list:
+    """Raças compatíveis com a classe (todas, se a classe não restringe)"""
+    races = class_system.get_races_for_class(class_id)
+    if not races:
+        # Se não houver raças específicas, mostra todas
+        races = list(class_system.races.values())
+    return races
+
+def render_race_menu(class_system: ClassSystem, class_id: str) -> str:
+    """Menu de raças compatíveis com a classe"""
+    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Escolha sua Raça ==={ANSI.RESET}\r\n\r\n"
+    for i, race in enumerate(races_for_class(class_system, class_id), 1):
+        message += f"{ANSI.BRIGHT_GREEN}{i}.{ANSI.RESET} {race.icon} {ANSI.BRIGHT_CYAN}{race.name}{ANSI.RESET}\r\n"
+        message += f"   {race.description}\r\n"
+        # Mostra bônus
+        if race.bonuses:
+            bonuses = []
+            for stat, val in race.bonuses.items():
+                if val > 0:
+                    bonuses.append(f"{ANSI.BRIGHT_GREEN}+{val} {stat}{ANSI.RESET}")
+                elif val < 0:
+                    bonuses.append(f"{ANSI.RED}{val} {stat}{ANSI.RESET}")
+            if bonuses:
+                message += f"   Bônus: {', '.join(bonuses)}\r\n"
+        message += "\r\n"
+    message += f"{ANSI.BRIGHT_YELLOW}Digite o número da raça:{ANSI.RESET} "
+    return message
+
+def render_gender_menu(class_system: ClassSystem) -> str:
+    """Menu de gêneros"""
+    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Escolha seu Gênero ==={ANSI.RESET}\r\n\r\n"
+    for i, gender in enumerate(class_system.list_all_genders(), 1):
+        message += f"{ANSI.BRIGHT_GREEN}{i}.{ANSI.RESET} {gender['icon']} {ANSI.BRIGHT_CYAN}{gender['name']}{ANSI.RESET}\r\n"
+    message += f"\r\n{ANSI.BRIGHT_YELLOW}Digite o número do gênero:{ANSI.RESET} "
+    return message
+
+def render_history(icon: str, name: str, history: str) -> str:
+    """História de uma classe ou raça escolhida"""
+    message = f"\r\n{ANSI.BOLD}{icon} {name}{ANSI.RESET}\r\n"
+    message += f"{ANSI.BRIGHT_MAGENTA}{history}{ANSI.RESET}\r\n"
+    return message
+
+def render_confirmation(class_system: ClassSystem, class_id: str, race_id: str, gender_id: str) -> str:
+    """Resumo do personagem antes da confirmação"""
+    cls = class_system.get_class(class_id)
+    race = class_system.get_race(race_id)
+    gender = class_system.get_gender(gender_id)
+    
+    # Calcula estatísticas finais
+    final_stats = class_system.apply_race_bonuses(cls.base_stats, race_id)
+    
+    message = f"\r\n{ANSI.BOLD}{ANSI.BRIGHT_CYAN}=== Confirmação do Personagem ==={ANSI.RESET}\r\n\r\n"
+    message += f"{cls.icon} {ANSI.BRIGHT_GREEN}Classe:{ANSI.RESET} {cls.name}\r\n"
+    message += f"{race.icon} {ANSI.BRIGHT_GREEN}Raça:{ANSI.RESET} {race.name}\r\n"
+    message += f"{gender.icon} {ANSI.BRIGHT_GREEN}Gênero:{ANSI.RESET} {gender.name}\r\n\r\n"
+    message += f"{ANSI.BOLD}Estatísticas Iniciais:{ANSI.RESET}\r\n"
+    message += f"  {ANSI.BRIGHT_RED}Vida:{ANSI.RESET} {final_stats.get('max_hp', 100)}\r\n"
+    message += f"  {ANSI.BRIGHT_YELLOW}Ataque:{ANSI.RESET} {final_stats.get('attack', 10)}\r\n"
+    message += f"  {ANSI.BRIGHT_BLUE}Defesa:{ANSI.RESET} {final_stats.get('defense', 5)}\r\n"
+    message += f"  {ANSI.BRIGHT_MAGENTA}Ouro:{ANSI.RESET} {cls.starting_gold}\r\n\r\n"
+    message += f"{ANSI.BRIGHT_YELLOW}Confirmar criação? (sim/não):{ANSI.RESET} "
+    return message
+
+def register_screens(class_system: ClassSystem):
+    """Registra os menus da criação de personagem (chamado no boot, com as classes carregadas)"""
+    class_ids = [cls['id'] for cls in class_system.list_all_classes()]
+    screens.register('creation.intro', lambda: (
+        f"\r\n{ANSI.BOLD}{ANSI.BRIGHT_CYAN}=== Criação de Personagem ==={ANSI.RESET}\r\n"
+        f"{ANSI.BRIGHT_YELLOW}Você precisa escolher sua classe, raça e gênero.{ANSI.RESET}\r\n\r\n"
+    ))
+    screens.register('creation.classes', lambda: render_class_menu(class_system))
+    screens.register('creation.races', lambda class_id: render_race_menu(class_system, class_id),
+                     variants=[(class_id,) for class_id in class_ids])
+    screens.register('creation.genders', lambda: render_gender_menu(class_system))
+    screens.register('creation.history', render_history, variants=())
+    # Uma combinação por personagem escolhido: renderizada sob demanda
+    screens.register('creation.confirm', lambda class_id, race_id, gender_id:
+                     render_confirmation(class_system, class_id, race_id, gender_id), variants=())
+
 async def create_character(writer: asyncio.StreamWriter, reader: asyncio.StreamReader, 
                           class_system: ClassSystem) -> tuple[str, str, str]:
     """
     Processa criação de personagem
     Retorna (class_id, race_id, gender_id)
     """
-    writer.write(f"\r\n{ANSI.BOLD}{ANSI.BRIGHT_CYAN}=== Criação de Personagem ==={ANSI.RESET}\r\n".encode())
-    writer.write(f"{ANSI.BRIGHT_YELLOW}Você precisa escolher sua classe, raça e gênero.{ANSI.RESET}\r\n\r\n".encode())
+    writer.write(screens.for_writer('creation.intro', writer))
     await writer.drain()
     
     # Escolha de Classe
@@ -43,13 +131,7 @@ async def choose_class(writer: asyncio.StreamWriter, reader: asyncio.StreamReade
     """Escolha de classe"""
     classes = class_system.list_all_classes()
     
-    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Escolha sua Classe ==={ANSI.RESET}\r\n\r\n"
-    for i, cls in enumerate(classes, 1):
-        message += f"{ANSI.BRIGHT_GREEN}{i}.{ANSI.RESET} {cls['icon']} {ANSI.BRIGHT_CYAN}{cls['name']}{ANSI.RESET}\r\n"
-        message += f"   {cls['description']}\r\n\r\n"
-    
-    message += f"{ANSI.BRIGHT_YELLOW}Digite o número da classe:{ANSI.RESET} "
-    writer.write(message.encode())
+    writer.write(screens.for_writer('creation.classes', writer))
     await writer.drain()
     
     while True:
@@ -68,9 +150,7 @@ async def choose_class(writer: asyncio.StreamWriter, reader: asyncio.StreamReade
                     # Mostra história da classe
                     cls = class_system.get_class(selected_class['id'])
                     if cls:
-                        message = f"\r\n{ANSI.BOLD}{cls.icon} {cls.name}{ANSI.RESET}\r\n"
-                        message += f"{ANSI.BRIGHT_MAGENTA}{cls.history}{ANSI.RESET}\r\n"
-                        writer.write(message.encode())
+                        writer.write(screens.for_writer('creation.history', writer, cls.icon, cls.name, cls.history))
                         await writer.drain()
                     return selected_class['id']
             except ValueError:
@@ -82,9 +162,7 @@ async def choose_class(writer: asyncio.StreamWriter, reader: asyncio.StreamReade
                     selected_class = cls
                     cls_obj = class_system.get_class(selected_class['id'])
                     if cls_obj:
-                        message = f"\r\n{ANSI.BOLD}{cls_obj.icon} {cls_obj.name}{ANSI.RESET}\r\n"
-                        message += f"{ANSI.BRIGHT_MAGENTA}{cls_obj.history}{ANSI.RESET}\r\n"
-                        writer.write(message.encode())
+                        writer.write(screens.for_writer('creation.history', writer, cls_obj.icon, cls_obj.name, cls_obj.history))
                         await writer.drain()
                     return selected_class['id']
             
@@ -98,30 +176,9 @@ async def choose_class(writer: asyncio.StreamWriter, reader: asyncio.StreamReade
 async def choose_race(writer: asyncio.StreamWriter, reader: asyncio.StreamReader,
                      class_system: ClassSystem, class_id: str) -> str:
     """Escolha de raça (compatível com a classe)"""
-    races = class_system.get_races_for_class(class_id)
-    
-    if not races:
-        # Se não houver raças específicas, mostra todas
-        races = list(class_system.races.values())
+    races = races_for_class(class_system, class_id)
     
-    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Escolha sua Raça ==={ANSI.RESET}\r\n\r\n"
-    for i, race in enumerate(races, 1):
-        message += f"{ANSI.BRIGHT_GREEN}{i}.{ANSI.RESET} {race.icon} {ANSI.BRIGHT_CYAN}{race.name}{ANSI.RESET}\r\n"
-        message += f"   {race.description}\r\n"
-        # Mostra bônus
-        if race.bonuses:
-            bonuses = []
-            for stat, val in race.bonuses.items():
-                if val > 0:
-                    bonuses.append(f"{ANSI.BRIGHT_GREEN}+{val} {stat}{ANSI.RESET}")
-                elif val < 0:
-                    bonuses.append(f"{ANSI.RED}{val} {stat}{ANSI.RESET}")
-            if bonuses:
-                message += f"   Bônus: {', '.join(bonuses)}\r\n"
-        message += "\r\n"
-    
-    message += f"{ANSI.BRIGHT_YELLOW}Digite o número da raça:{ANSI.RESET} "
-    writer.write(message.encode())
+    writer.write(screens.for_writer('creation.races', writer, class_id))
     await writer.drain()
     
     while True:
@@ -138,9 +195,7 @@ async def choose_race(writer: asyncio.StreamWriter, reader: asyncio.StreamReader
                 if 1 <= num <= len(races):
                     selected_race = races[num - 1]
                     # Mostra história da raça
-                    message = f"\r\n{ANSI.BOLD}{selected_race.icon} {selected_race.name}{ANSI.RESET}\r\n"
-                    message += f"{ANSI.BRIGHT_MAGENTA}{selected_race.history}{ANSI.RESET}\r\n"
-                    writer.write(message.encode())
+                    writer.write(screens.for_writer('creation.history', writer, selected_race.icon, selected_race.name, selected_race.history))
                     await writer.drain()
                     return selected_race.id
             except ValueError:
@@ -149,9 +204,7 @@ async def choose_race(writer: asyncio.StreamWriter, reader: asyncio.StreamReader
             # Tenta por ID ou nome
             for race in races:
                 if choice.lower() in race.id.lower() or choice.lower() in race.name.lower():
-                    message = f"\r\n{ANSI.BOLD}{race.icon} {race.name}{ANSI.RESET}\r\n"
-                    message += f"{ANSI.BRIGHT_MAGENTA}{race.history}{ANSI.RESET}\r\n"
-                    writer.write(message.encode())
+                    writer.write(screens.for_writer('creation.history', writer, race.icon, race.name, race.history))
                     await writer.drain()
                     return race.id
             
@@ -167,12 +220,7 @@ async def choose_gender(writer: asyncio.StreamWriter, reader: asyncio.StreamRead
     """Escolha de gênero"""
     genders = class_system.list_all_genders()
     
-    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Escolha seu Gênero ==={ANSI.RESET}\r\n\r\n"
-    for i, gender in enumerate(genders, 1):
-        message += f"{ANSI.BRIGHT_GREEN}{i}.{ANSI.RESET} {gender['icon']} {ANSI.BRIGHT_CYAN}{gender['name']}{ANSI.RESET}\r\n"
-    
-    message += f"\r\n{ANSI.BRIGHT_YELLOW}Digite o número do gênero:{ANSI.RESET} "
-    writer.write(message.encode())
+    writer.write(screens.for_writer('creation.genders', writer))
     await writer.drain()
     
     while True:
@@ -213,21 +261,7 @@ async def confirm_character(writer: asyncio.StreamWriter, reader: asyncio.Stream
     if not cls or not race or not gender:
         return False
     
-    # Calcula estatísticas finais
-    final_stats = class_system.apply_race_bonuses(cls.base_stats, race_id)
-    
-    message = f"\r\n{ANSI.BOLD}{ANSI.BRIGHT_CYAN}=== Confirmação do Personagem ==={ANSI.RESET}\r\n\r\n"
-    message += f"{cls.icon} {ANSI.BRIGHT_GREEN}Classe:{ANSI.RESET} {cls.name}\r\n"
-    message += f"{race.icon} {ANSI.BRIGHT_GREEN}Raça:{ANSI.RESET} {race.name}\r\n"
-    message += f"{gender.icon} {ANSI.BRIGHT_GREEN}Gênero:{ANSI.RESET} {gender.name}\r\n\r\n"
-    message += f"{ANSI.BOLD}Estatísticas Iniciais:{ANSI.RESET}\r\n"
-    message += f"  {ANSI.BRIGHT_RED}Vida:{ANSI.RESET} {final_stats.get('max_hp', 100)}\r\n"
-    message += f"  {ANSI.BRIGHT_YELLOW}Ataque:{ANSI.RESET} {final_stats.get('attack', 10)}\r\n"
-    message += f"  {ANSI.BRIGHT_BLUE}Defesa:{ANSI.RESET} {final_stats.get('defense', 5)}\r\n"
-    message += f"  {ANSI.BRIGHT_MAGENTA}Ouro:{ANSI.RESET} {cls.starting_gold}\r\n\r\n"
-    message += f"{ANSI.BRIGHT_YELLOW}Confirmar criação? (sim/não):{ANSI.RESET} "
-    
-    writer.write(message.encode())
+    writer.write(screens.for_writer('creation.confirm', writer, class_id, race_id, gender_id))
     await writer.drain()
     
     try:
@@ -3,11 +3,11 @@ Sistema de combate do MUD
 """
 
 import random
-import asyncio
 from typing import Optional
 from mud.core.models import Player, Monster
-from mud.utils.ansi import ANSI
-from mud.utils.visuals import get_attack_animation, format_hp_bar, format_stamina_bar
+from mud.utils.ansi import ANSI, ANSIBytes
+from mud.utils.output import ANIMATION_FRAME_DELAY, COMBAT_PAUSE, OutputBuilder
+from mud.utils.visuals import encoded_animation, format_hp_bar, format_stamina_bar
 
 class CombatSystem:
     """Sistema de combate entre jogador e monstros"""
@@ -17,12 +17,12 @@ class CombatSystem:
         """
         Jogador ataca monstro. Retorna True se monstro morreu
         game_data: opcional, usado para calcular stats totais com equipamento
+        send_message_func(mensagem, delay): delay é o intervalo de apresentação após a
+        mensagem anterior; o ataque é resolvido na hora, só a saída é escalonada
         """
-        # Animação de ataque
-        animation = get_attack_animation()
-        for frame in animation:
-            await send_message_func(f"\r{ANSI.BRIGHT_GREEN}{frame}{ANSI.RESET}")
-            await asyncio.sleep(0.1)
+        # Animação de ataque (quadros já codificados)
+        for i, frame in enumerate(encoded_animation('attack', ANSI.BRIGHT_GREEN)):
+            await send_message_func(frame, ANIMATION_FRAME_DELAY if i else 0.0)
         
         # Calcula dano do jogador usando ataque total (com equipamento)
         total_attack = player.get_total_attack(game_data) if game_data else player.attack
@@ -30,23 +30,20 @@ class CombatSystem:
         actual_damage = monster.take_damage(player_damage, "physical")
         
         level_info = f" [Nível {monster.level}]" if monster.level > 1 else ""
-        await send_message_func(
-            f"\r{ANSI.BRIGHT_GREEN}⚔ Você ataca {monster.name}{level_info} causando {actual_damage} de dano! 💥{ANSI.RESET}\r\n"
-        )
+        output = OutputBuilder()
+        output.line(b"\r", ANSIBytes.BRIGHT_GREEN, f"⚔ Você ataca {monster.name}{level_info} causando {actual_damage} de dano! 💥", ANSIBytes.RESET)
         
         # Mostra barra de HP do monstro (usa format_hp_bar que já tem cores consistentes)
-        monster_hp_bar = format_hp_bar(monster.current_hp, monster.max_hp, f"{monster.name} HP")
-        await send_message_func(f"{monster_hp_bar}\r\n")
+        output.line(format_hp_bar(monster.current_hp, monster.max_hp, f"{monster.name} HP"))
         
         if not monster.is_alive():
-            await send_message_func(
-                f"{ANSI.BRIGHT_YELLOW}✨ {monster.name} foi derrotado! ✨{ANSI.RESET}\r\n"
-            )
+            output.line(ANSIBytes.BRIGHT_YELLOW, f"✨ {monster.name} foi derrotado! ✨", ANSIBytes.RESET)
+            await send_message_func(output.getvalue(), ANIMATION_FRAME_DELAY)
             return True
+        await send_message_func(output.getvalue(), ANIMATION_FRAME_DELAY)
+        output.clear()
         
         # Monstro contra-ataca usando o dano configurado
-        await asyncio.sleep(0.3)  # Pequena pausa para melhor visualização
-        
         monster_damage = monster.get_attack_damage()
         # Usa defesa total (com equipamento) para reduzir dano
         total_defense = player.get_total_defense(game_data) if game_data else player.defense
@@ -56,22 +53,18 @@ class CombatSystem:
         if monster.weapon:
             weapon_info = f" com {monster.weapon}"
         
-        await send_message_func(
-            f"{ANSI.RED}👹 {monster.name}{level_info} ataca você{weapon_info} causando {actual_damage} de dano! 💥{ANSI.RESET}\r\n"
-        )
+        output.line(ANSIBytes.RED, f"👹 {monster.name}{level_info} ataca você{weapon_info} causando {actual_damage} de dano! 💥", ANSIBytes.RESET)
         
         # Mostra barras de HP e Stamina do jogador
-        player_hp_bar = format_hp_bar(player.current_hp, player.max_hp)
-        player_stamina_bar = format_stamina_bar(player.current_stamina, player.max_stamina)
-        await send_message_func(f"{player_hp_bar}\r\n")
-        await send_message_func(f"{player_stamina_bar}\r\n")
+        output.line(format_hp_bar(player.current_hp, player.max_hp))
+        output.line(format_stamina_bar(player.current_stamina, player.max_stamina))
         
         if not player.is_alive():
-            await send_message_func(
-                f"{ANSI.BRIGHT_RED} Você foi derrotado!{ANSI.RESET}\r\n"
-            )
+            output.line(ANSIBytes.BRIGHT_RED, " Você foi derrotado!", ANSIBytes.RESET)
+            await send_message_func(output.getvalue(), COMBAT_PAUSE)  # Pequena pausa para melhor visualização
             return "player_died"
         
+        await send_message_func(output.getvalue(), COMBAT_PAUSE)
         return False
     
     @staticmethod
@@ -78,3 +78,19 @@ class Colors:
     # Reset
     RESET = ANSI.RESET
 
+
+
+def _encoded(cls, name: str):
+    """Cópia da classe de constantes com os valores já codificados em UTF-8"""
+    values = {key: value.encode() for key, value in vars(cls).items()
+              if not key.startswith('_') and isinstance(value, str)}
+    return type(name, (), values)
+
+
+# Versões em bytes (ANSIBytes.RED == b'\033[31m'), para montar a saída sem .encode()
+ANSIBytes = _encoded(ANSI, 'ANSIBytes')
+ColorsBytes = _encoded(Colors, 'ColorsBytes')
+
+# Limpa a linha atual antes de uma mensagem (\r volta ao início, \033[K limpa até o fim)
+CLEAR_LINE = b"\r\033[K"
+CRLF = b"\r\n"
@@ -0,0 +1,147 @@
+"""
+Montagem de saída direto em bytes
+Fragmentos já codificados (ANSIBytes/ColorsBytes, telas, barras) são anexados
+num bytearray reaproveitável; só o texto dinâmico é codificado, uma vez.
+Várias mensagens de um mesmo turno saem numa única escrita no writer.
+Saída com atraso (animações) passa pela OutputTimeline do jogador.
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Optional, Union
+
+from mud.utils.ansi import CLEAR_LINE, CRLF
+
+Fragment = Union[bytes, bytearray, str]
+
+# Animações de combate: intervalo entre quadros e pausa antes do revide (segundos).
+# ANIMATIONS=0 manda tudo de uma vez (útil também para testes e bots)
+ANIMATIONS_ENABLED = os.environ.get('ANIMATIONS', '1').lower() not in ('0', 'false', 'no')
+ANIMATION_FRAME_DELAY = float(os.environ.get('ANIMATION_FRAME_DELAY', 0.1))
+COMBAT_PAUSE = float(os.environ.get('COMBAT_PAUSE', 0.3))
+
+
+def encode_message(message: Fragment) -> bytes:
+    """Mensagem com o enquadramento do send_message (limpa a linha, termina com \\r\\n)"""
+    if isinstance(message, str):
+        message = message.encode()
+    return CLEAR_LINE + bytes(message).rstrip(CRLF) + CRLF
+
+
+class OutputBuilder:
+    """Buffer de saída de uma sessão (limpo a cada escrita, pode ser reutilizado)"""
+
+    __slots__ = ('_buffer',)
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def add(self, *parts: Fragment) -> 'OutputBuilder':
+        """Anexa fragmentos (bytes entram como estão, str é codificado)"""
+        buffer = self._buffer
+        for part in parts:
+            buffer += part.encode() if isinstance(part, str) else part
+        return self
+
+    def line(self, *parts: Fragment) -> 'OutputBuilder':
+        """Anexa fragmentos seguidos de \\r\\n"""
+        self.add(*parts)
+        self._buffer += CRLF
+        return self
+
+    def message(self, *parts: Fragment) -> 'OutputBuilder':
+        """Anexa uma mensagem como o send_message faria (limpa a linha, sem quebras extras no fim)"""
+        buffer = self._buffer
+        buffer += CLEAR_LINE
+        start = len(buffer)
+        self.add(*parts)
+        # Remove \r e \n do final da mensagem (o rstrip do send_message)
+        end = len(buffer)
+        while end > start and buffer[end - 1] in (10, 13):
+            end -= 1
+        del buffer[end:]
+        buffer += CRLF
+        return self
+
+    def getvalue(self) -> bytes:
+        return bytes(self._buffer)
+
+    def clear(self):
+        self._buffer.clear()
+
+    def write_to(self, writer) -> int:
+        """Escreve o conteúdo no writer e limpa o buffer; retorna quantos bytes saíram"""
+        size = len(self._buffer)
+        if size:
+            # Cópia imutável: o transporte pode guardar referência ao que não enviou
+            writer.write(bytes(self._buffer))
+            self._buffer.clear()
+        return size
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+
+class OutputTimeline:
+    """
+    Saída com atraso de um jogador (quadros de animação, pausas do combate).
+    Cada envio entra numa fila com o atraso relativo ao envio anterior e é escrito
+    por timers do loop: a lógica do comando termina na hora e o jogador pode
+    digitar o próximo comando. Enquanto houver algo na fila, tudo o que for
+    enviado ao jogador entra atrás, preservando a ordem.
+    """
+
+    def __init__(self, player, animate: bool = True):
+        self.player = player
+        # Sem animação os atrasos são ignorados: tudo sai numa rajada só
+        self.animate = animate
+        self._queue: deque = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._timer is not None
+
+    def send(self, data: bytes, delay: float = 0.0):
+        """Escreve agora (fila vazia e sem atraso) ou agenda atrás do que já está na fila"""
+        if not self.animate:
+            delay = 0.0
+        if self._timer is None and delay <= 0:
+            self._write(data)
+            return
+        self._queue.append((delay, data))
+        if self._timer is None:
+            self._schedule()
+
+    def cancel(self):
+        """Descarta o que ainda não saiu (desconexão)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._queue.clear()
+
+    def _schedule(self):
+        delay, _ = self._queue[0]
+        self._timer = asyncio.get_running_loop().call_later(delay, self._fire)
+
+    def _fire(self):
+        # Escreve o primeiro item e tudo o que vem logo atrás sem atraso
+        _, data = self._queue.popleft()
+        self._write(data)
+        while self._queue and self._queue[0][0] <= 0:
+            self._write(self._queue.popleft()[1])
+        if self._queue:
+            self._schedule()
+        else:
+            self._timer = None
+
+    def _write(self, data: bytes):
+        if not data:
+            return  # Pausa
+        writer = self.player.writer
+        try:
+            if not writer.is_closing():
+                writer.write(data)
+        except Exception:
+            pass
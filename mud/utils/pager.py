@@ -0,0 +1,76 @@
+"""
+Paginação de saídas longas no servidor
+Listagens grandes (status do servidor, quests, inventário, ajuda) são geradas
+sob demanda: o jogador recebe uma página e o cursor fica guardado na sessão
+até o próximo 'more'. Páginas já enviadas não são refeitas e o total enviado
+por comando fica limitado, então um cliente lento não acumula megabytes.
+"""
+
+import os
+from typing import Iterable, Iterator, Optional
+
+from mud.net.capabilities import capabilities_of
+from mud.utils.output import Fragment
+
+# Linhas por página quando o cliente não informa a altura do terminal (NAWS)
+PAGER_LINES = int(os.environ.get('PAGER_LINES', 20))
+# Limite de páginas de uma mesma listagem (o resto é descartado)
+PAGER_MAX_PAGES = int(os.environ.get('PAGER_MAX_PAGES', 50))
+
+# Linhas reservadas para o rodapé e o prompt
+_RESERVED_LINES = 4
+_MIN_PAGE_LINES = 5
+
+
+def page_size_for(writer) -> int:
+    """Linhas por página para o terminal da sessão"""
+    caps = capabilities_of(writer)
+    if caps.negotiated and caps.height:
+        return max(caps.height - _RESERVED_LINES, _MIN_PAGE_LINES)
+    return PAGER_LINES
+
+
+def line_pages(lines: Iterable[str], size: int, header: str = "") -> Iterator[str]:
+    """Agrupa linhas em páginas; o gerador de linhas só avança até a página pedida"""
+    batch = [header] if header else []
+    count = 0
+    for line in lines:
+        batch.append(line)
+        count += 1
+        if count == size:
+            yield "\r\n".join(batch)
+            batch = []
+            count = 0
+    if count or batch:
+        yield "\r\n".join(batch)
+
+
+class Pager:
+    """
+    Cursor de uma listagem paginada. A página seguinte é gerada junto com a
+    atual (para saber se ainda há mais), nunca antes disso.
+    """
+
+    def __init__(self, pages: Iterable[Fragment], max_pages: int = PAGER_MAX_PAGES):
+        self._pages = iter(pages)
+        self.max_pages = max_pages
+        self.page = 0
+        self.truncated = False
+        self._next = next(self._pages, None)
+
+    @property
+    def has_more(self) -> bool:
+        return self._next is not None
+
+    def next_page(self) -> Optional[Fragment]:
+        """Próxima página (None quando a listagem acabou)"""
+        page = self._next
+        if page is None:
+            return None
+        self.page += 1
+        if self.page < self.max_pages:
+            self._next = next(self._pages, None)
+        else:
+            self._next = None
+            self.truncated = next(self._pages, None) is not None
+        return page
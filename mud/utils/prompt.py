@@ -0,0 +1,69 @@
+"""
+Prompt do jogo com os vitais do jogador
+O texto vem de um template configurável (PROMPT) e fica guardado já codificado
+por jogador; só é refeito quando algum valor usado no template muda.
+Campos disponíveis: {name} {hp} {maxhp} {sp} {maxsp} {level} {xp} {gold}
+"""
+
+import os
+from typing import Dict, Tuple
+
+from mud.core.metrics import metrics
+from mud.utils.ansi import ANSI
+
+DEFAULT_PROMPT = '[HP {hp}/{maxhp} ST {sp}/{maxsp}]>'
+PROMPT_TEMPLATE = os.environ.get('PROMPT', DEFAULT_PROMPT)
+
+_FIELDS = ('name', 'hp', 'maxhp', 'sp', 'maxsp', 'level', 'xp', 'gold')
+
+
+def prompt_values(player) -> Tuple:
+    """Valores do template, na ordem de _FIELDS (comparados para detectar mudança)"""
+    return (
+        player.name,
+        player.current_hp,
+        player.max_hp,
+        player.current_stamina,
+        player.max_stamina,
+        player.level,
+        player.experience,
+        player.gold,
+    )
+
+
+def _valid_template(template: str) -> str:
+    """Template com campo desconhecido ou formato inválido cai no padrão"""
+    try:
+        template.format_map({**dict.fromkeys(_FIELDS, 0), 'name': ''})
+    except (KeyError, ValueError, IndexError, AttributeError, TypeError):
+        print(f"⚠ PROMPT inválido ({template!r}), usando o padrão")
+        return DEFAULT_PROMPT
+    return template
+
+
+class PromptCache:
+    """Último prompt renderizado por jogador (valores -> bytes)"""
+
+    def __init__(self, template: str = PROMPT_TEMPLATE):
+        self.template = _valid_template(template)
+        self._last: Dict[str, Tuple[Tuple, bytes]] = {}
+
+    def render(self, player) -> bytes:
+        """Bytes do prompt (\\r\\n antes, para o cliente reconhecer o fim da linha)"""
+        values = prompt_values(player)
+        cached = self._last.get(player.name)
+        if cached is not None and cached[0] == values:
+            metrics.incr('prompt.hits')
+            return cached[1]
+        metrics.incr('prompt.renders')
+        text = self.template.format_map(dict(zip(_FIELDS, values)))
+        data = f"\r\n{ANSI.BRIGHT_GREEN}{text}{ANSI.RESET} ".encode()
+        self._last[player.name] = (values, data)
+        return data
+
+    def forget(self, player_name: str):
+        self._last.pop(player_name, None)
+
+
+# Cache compartilhado por todas as sessões
+prompts = PromptCache()
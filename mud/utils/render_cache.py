@@ -0,0 +1,50 @@
+"""
+Cache de fragmentos de tela já renderizados
+Partes de telas que são iguais para todos os jogadores (título e descrição da
+sala, monstros/NPCs/itens, saídas) ficam em cache por chave. A chave inclui a
+versão do estado do que está sendo desenhado e o perfil do cliente, então uma
+mudança no estado gera uma chave nova em vez de exigir invalidação.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from mud.core.metrics import metrics
+
+# Fragmentos mantidos em memória (LRU)
+RENDER_CACHE_SIZE = int(os.environ.get('RENDER_CACHE_SIZE', 2048))
+
+
+class RenderCache:
+    """LRU de fragmentos renderizados (chave -> texto)"""
+
+    def __init__(self, name: str, max_size: int = RENDER_CACHE_SIZE):
+        self.name = name
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, str]' = OrderedDict()
+
+    def get_or_render(self, key: Hashable, render: Callable[[], str]) -> str:
+        """Retorna o fragmento em cache ou renderiza e guarda"""
+        entries = self._entries
+        text = entries.get(key)
+        if text is not None:
+            entries.move_to_end(key)
+            metrics.incr(f'render.{self.name}.hits')
+            return text
+        metrics.incr(f'render.{self.name}.misses')
+        text = render()
+        entries[key] = text
+        if len(entries) > self.max_size:
+            entries.popitem(last=False)
+        return text
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Cache compartilhado por todos os jogadores para a tela das salas (look)
+room_render_cache = RenderCache('room')
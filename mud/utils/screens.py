@@ -0,0 +1,77 @@
+"""
+Registro de telas estáticas (ajuda, menus de login/criação, lista de mundos, banners)
+Cada tela é renderizada uma vez por perfil do cliente (cores, UTF-8 e, se a tela
+depende da largura, a largura do terminal) e guardada já codificada em bytes.
+Partes que mudam por jogador (nome, contadores) são montadas à parte e
+concatenadas aos bytes prontos.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from mud.core.metrics import metrics
+from mud.net.capabilities import (
+    DEFAULT_CAPABILITIES, AdaptedBytes, ClientCapabilities, adapt_output, capabilities_of
+)
+
+
+class ScreenRegistry:
+    """Telas registradas por nome e cache dos bytes renderizados por perfil"""
+
+    def __init__(self):
+        # nome -> (render, largura máxima usada pela tela ou None)
+        self._screens: Dict[str, Tuple[Callable[..., str], Optional[int]]] = {}
+        # nome -> argumentos pré-renderizados no warm()
+        self._variants: Dict[str, list] = {}
+        self._cache: Dict[Hashable, bytes] = {}
+
+    def register(self, name: str, render: Callable[..., str], max_width: Optional[int] = None, variants=((),)):
+        """
+        Registra uma tela. render(*args) retorna o texto; com max_width, a tela
+        depende da largura e é chamada como render(largura, *args), com a
+        largura do cliente limitada a max_width.
+        """
+        self._screens[name] = (render, max_width)
+        self._variants[name] = list(variants)
+        self._drop(name)
+
+    def get(self, name: str, caps: ClientCapabilities = DEFAULT_CAPABILITIES, *args: Any) -> bytes:
+        """Bytes da tela para o perfil do cliente (renderiza só na primeira vez)"""
+        render, max_width = self._screens[name]
+        width = min(caps.layout_width, max_width) if max_width else None
+        profile = (caps.color > 0, caps.utf8, width)
+        key = (name, args, profile)
+        data = self._cache.get(key)
+        if data is None:
+            text = render(width, *args) if max_width else render(*args)
+            data = text.encode()
+            if caps.needs_adaptation:
+                data = AdaptedBytes(adapt_output(data, caps.color > 0, caps.utf8))
+            self._cache[key] = data
+            metrics.incr('screens.rendered')
+        return data
+
+    def for_writer(self, name: str, writer, *args: Any) -> bytes:
+        """Atalho: bytes da tela para o perfil da sessão dona do writer"""
+        return self.get(name, capabilities_of(writer), *args)
+
+    def warm(self):
+        """Renderiza todas as telas registradas para o perfil padrão (boot/reload)"""
+        for name, variants in self._variants.items():
+            for args in variants:
+                self.get(name, DEFAULT_CAPABILITIES, *args)
+
+    def reload(self):
+        """Descarta o que foi renderizado (dados de mundos/classes mudaram) e renderiza de novo"""
+        self._cache.clear()
+        self.warm()
+
+    def _drop(self, name: str):
+        for key in [key for key in self._cache if key[0] == name]:
+            del self._cache[key]
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# Registro compartilhado por todas as conexões
+screens = ScreenRegistry()
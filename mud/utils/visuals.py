@@ -2,9 +2,12 @@
 Sistema de visualizações e animações para o terminal
 """
 
-from typing import Optional
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from mud.utils.ansi import ANSI
 
+@lru_cache(maxsize=4096)
 def create_bar(current: int, maximum: int, width: int = 20, filled_char: str = "█", 
                empty_char: str = "░", color_full: str = ANSI.BRIGHT_GREEN,
                color_medium: str = ANSI.BRIGHT_YELLOW, color_low: str = ANSI.RED) -> str:
@@ -128,6 +131,18 @@ def get_heal_animation() -> list:
         "💚 💚 ✨ 🌟",
     ]
 
+_ANIMATIONS = {
+    'attack': get_attack_animation,
+    'spell': get_spell_animation,
+    'heal': get_heal_animation,
+}
+
+
+@lru_cache(maxsize=None)
+def encoded_animation(name: str, color: str = ANSI.BRIGHT_MAGENTA) -> Tuple[bytes, ...]:
+    """Quadros da animação já coloridos e codificados (montados uma vez)"""
+    return tuple(f"\r{color}{frame}{ANSI.RESET}".encode() for frame in _ANIMATIONS[name]())
+
 def display_animation(animation_frames: list, message: str = "") -> str:
     """Converte frames de animação em string"""
     if not animation_frames:
@@ -135,8 +150,8 @@ def display_animation(animation_frames: list, message: str = "") -> str:
     return f"{animation_frames[-1]} {message}"
 
 # Importa ASCII arts de arquivos separados
-from mud.utils.ascii_players import get_player_ascii
-from mud.utils.ascii_monsters import get_monster_ascii
+from mud.utils.ascii_players import PLAYER_ASCII, get_player_ascii
+from mud.utils.ascii_monsters import MONSTER_ASCII, get_monster_ascii
 from mud.utils.ascii_npcs import get_npc_ascii
 
 # Aliases para compatibilidade
@@ -144,133 +159,136 @@ def get_character_ascii(class_id: str, race_id: str) -> str:
     """Retorna ASCII art do personagem (alias para get_player_ascii)"""
     return get_player_ascii(class_id, race_id)
 
-def format_ascii_with_text(ascii_art: str, text: str, ascii_width: int = 20) -> str:
+# Códigos de cor ANSI (não ocupam coluna no terminal)
+_ANSI_PATTERN = re.compile(r'\x1b\[[0-9;]*m')
+
+# Larguras reservadas ao ASCII art nas telas (look usa 22)
+ASCII_LAYOUT_WIDTHS = (20, 22)
+
+
+@lru_cache(maxsize=4096)
+def visible_width(text: str) -> int:
+    """Largura visível do texto (sem os códigos ANSI)"""
+    if '\x1b' not in text:
+        return len(text)
+    return len(_ANSI_PATTERN.sub('', text))
+
+
+@lru_cache(maxsize=256)
+def normalize_ascii_art(ascii_art: str) -> Tuple[str, ...]:
+    """
+    Linhas do ASCII art sem linhas vazias nas pontas e sem indentação
+    (cada linha alinhada à esquerda)
+    """
+    lines = [line.lstrip() if line.strip() else "" for line in ascii_art.split('\n')]
+    while lines and not lines[0]:
+        lines.pop(0)
+    while lines and not lines[-1]:
+        lines.pop()
+    return tuple(lines)
+
+
+@lru_cache(maxsize=256)
+def padded_ascii_lines(ascii_art: str, ascii_width: int) -> Tuple[str, ...]:
+    """
+    Linhas do ASCII art com exatamente ascii_width colunas (preenchidas com
+    espaços ou truncadas), prontas para receber o texto ao lado
+    """
+    padded = []
+    for line in normalize_ascii_art(ascii_art):
+        line = line.rstrip()
+        padded.append(line[:ascii_width].ljust(ascii_width))
+    return tuple(padded)
+
+
+def _prerender_ascii_art():
+    """Normaliza todas as artes conhecidas na importação (os looks só consultam o cache)"""
+    arts = list(MONSTER_ASCII.values())
+    for races in PLAYER_ASCII.values():
+        arts.extend(races.values())
+    arts.append(get_monster_ascii(''))
+    arts.append(get_player_ascii('', ''))
+    arts.append(get_npc_ascii(''))
+    for art in arts:
+        for width in ASCII_LAYOUT_WIDTHS:
+            padded_ascii_lines(art, width)
+
+
+_prerender_ascii_art()
+
+
+def _wrap_text(text: str, max_text_width: int) -> List[str]:
+    """Quebra o texto (com códigos ANSI e \r\n) em linhas de até max_text_width colunas visíveis"""
+    text_lines = []
+    for paragraph in text.replace('\r', '').split('\n'):
+        if not paragraph.strip():
+            text_lines.append("")
+            continue
+        
+        # Se o texto cabe em uma linha, adiciona direto
+        if visible_width(paragraph) <= max_text_width:
+            text_lines.append(paragraph)
+            continue
+        
+        # Quebra em palavras, mas preserva códigos ANSI
+        current_line = ""
+        current_width = 0
+        for word in paragraph.split():
+            word_width = visible_width(word)
+            if current_width + word_width + 1 <= max_text_width:
+                if current_line:
+                    current_line += " " + word
+                    current_width += word_width + 1
+                else:
+                    current_line = word
+                    current_width = word_width
+            else:
+                if current_line:
+                    text_lines.append(current_line)
+                current_line = word
+                current_width = word_width
+        if current_line:
+            text_lines.append(current_line)
+    return text_lines
+
+
+def format_ascii_with_text(ascii_art: str, text: str, ascii_width: int = 20, max_text_width: int = 55) -> str:
     """
     Formata ASCII art à esquerda e texto à direita lado a lado.
     
+    As linhas do ASCII art já normalizadas e preenchidas até ascii_width vêm
+    do cache (padded_ascii_lines); aqui só o texto é quebrado e combinado.
+    
     Args:
         ascii_art: String com o ASCII art (pode ter múltiplas linhas)
         text: Texto a ser exibido à direita (pode conter códigos ANSI e \r\n)
         ascii_width: Largura reservada para o ASCII art (padrão 20)
+        max_text_width: Largura máxima do texto à direita (terminais estreitos:
+            abaixo de 20 colunas o texto vai embaixo do ASCII art)
     
     Returns:
         String formatada com ASCII à esquerda e texto à direita
     """
-    # Divide o ASCII art em linhas
-    ascii_lines_raw = ascii_art.split('\n')
-    
-    # Remove linhas vazias do início e fim
-    while ascii_lines_raw and not ascii_lines_raw[0].strip():
-        ascii_lines_raw.pop(0)
-    while ascii_lines_raw and not ascii_lines_raw[-1].strip():
-        ascii_lines_raw.pop()
-    
-    if not ascii_lines_raw:
+    ascii_lines = padded_ascii_lines(ascii_art, ascii_width)
+    if not ascii_lines:
         return text
     
-    # Remove toda a indentação inicial de todas as linhas, alinhando tudo à esquerda
-    # Isso garante que o ASCII art fique totalmente alinhado
-    ascii_lines = []
-    for line in ascii_lines_raw:
-        if line.strip():  # Linha com conteúdo
-            # Remove toda a indentação inicial, alinhando à esquerda
-            ascii_lines.append(line.lstrip())
-        else:  # Linha vazia
-            ascii_lines.append("")
-    
-    # Remove linhas vazias consecutivas no final
-    while ascii_lines and not ascii_lines[-1].strip():
-        ascii_lines.pop()
-    
-    # Processa o texto - remove \r e divide por \n primeiro
-    text_clean = text.replace('\r', '')
-    text_paragraphs = text_clean.split('\n')
-    
-    # Quebra cada parágrafo em linhas se necessário
-    text_lines = []
-    max_text_width = 55  # Largura máxima do texto à direita (aumentado para acomodar mais info)
-    
-    for paragraph in text_paragraphs:
-        if not paragraph.strip():
-            text_lines.append("")
-            continue
-            
-        # Remove códigos ANSI temporariamente para calcular largura
-        import re
-        ansi_pattern = re.compile(r'\x1b\[[0-9;]*m')
-        text_without_ansi = ansi_pattern.sub('', paragraph)
-        
-        # Se o texto cabe em uma linha, adiciona direto
-        if len(text_without_ansi) <= max_text_width:
-            text_lines.append(paragraph)
-        else:
-            # Quebra em palavras, mas preserva códigos ANSI
-            words = paragraph.split()
-            current_line = ""
-            current_line_no_ansi = ""
-            
-            for word in words:
-                word_no_ansi = ansi_pattern.sub('', word)
-                if len(current_line_no_ansi) + len(word_no_ansi) + 1 <= max_text_width:
-                    if current_line:
-                        current_line += " " + word
-                        current_line_no_ansi += " " + word_no_ansi
-                    else:
-                        current_line = word
-                        current_line_no_ansi = word_no_ansi
-                else:
-                    if current_line:
-                        text_lines.append(current_line)
-                    current_line = word
-                    current_line_no_ansi = word_no_ansi
-            if current_line:
-                text_lines.append(current_line)
-    
-    # Encontra a largura máxima do ASCII art (para alinhar todas as linhas)
-    max_ascii_width = 0
-    for line in ascii_lines:
-        if line.strip():
-            line_width = len(line.rstrip())
-            max_ascii_width = max(max_ascii_width, line_width)
+    # Terminal estreito: ASCII art em cima, texto embaixo
+    if max_text_width < 20:
+        return "\r\n".join(normalize_ascii_art(ascii_art)) + "\r\n" + text
     
-    # SEMPRE usa a largura desejada (ascii_width) para garantir alinhamento consistente
-    # entre diferentes ASCII arts. Se o ASCII for maior, ainda usa ascii_width para
-    # manter o texto sempre na mesma coluna (mas pode cortar ASCII muito grande)
-    # Se o ASCII for menor, preenche com espaços até ascii_width
-    final_ascii_width = ascii_width
+    text_lines = _wrap_text(text, max_text_width)
     
-    # Combina ASCII e texto linha por linha
+    # Todas as linhas do ASCII têm a mesma largura, então o texto começa sempre
+    # na mesma coluna; linhas extras de texto ficam alinhadas com espaços
+    blank = " " * ascii_width
     result_lines = []
-    max_lines = max(len(ascii_lines), len(text_lines))
-    
-    for i in range(max_lines):
-        ascii_part = ascii_lines[i] if i < len(ascii_lines) else ""
+    for i in range(max(len(ascii_lines), len(text_lines))):
+        ascii_part = ascii_lines[i] if i < len(ascii_lines) else blank
         text_part = text_lines[i] if i < len(text_lines) else ""
-        
-        # Remove espaços à direita e calcula largura real
-        ascii_clean = ascii_part.rstrip() if ascii_part.strip() else ""
-        ascii_real_width = len(ascii_clean)
-        
-        # Se o ASCII for maior que a largura desejada, trunca (mas preserva o máximo possível)
-        # Se for menor, preenche com espaços
-        if ascii_real_width > final_ascii_width:
-            # Trunca o ASCII se for muito grande (mantém alinhamento)
-            ascii_formatted = ascii_clean[:final_ascii_width]
-        else:
-            # Preenche o ASCII até a largura desejada (garantindo alinhamento consistente)
-            # Todas as linhas terão exatamente final_ascii_width caracteres
-            ascii_formatted = ascii_clean + " " * (final_ascii_width - ascii_real_width)
-        
-        # Combina ASCII e texto
-        # IMPORTANTE: Todas as linhas devem ter a mesma largura total (ASCII + espaços)
-        # para que o texto comece sempre na mesma coluna
         if text_part:
-            # Linha com texto: ASCII (final_ascii_width) + 2 espaços + texto
-            result_lines.append(f"{ascii_formatted}  {text_part}")
+            result_lines.append(f"{ascii_part}  {text_part}")
         else:
-            # Linha sem texto: apenas ASCII preenchido até final_ascii_width
-            # Isso mantém o alinhamento visual mesmo sem texto
-            result_lines.append(ascii_formatted)
+            result_lines.append(ascii_part)
     
     return "\r\n".join(result_lines)
-
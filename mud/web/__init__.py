@@ -0,0 +1,7 @@
+"""
+Web modules - Static file server and WebSocket gateway
+"""
+
+from mud.web.static_server import StaticAssetCache, StaticHTTPServer
+
+__all__ = ['StaticAssetCache', 'StaticHTTPServer']
@@ -0,0 +1,264 @@
+"""
+Gateway WebSocket dentro do processo do servidor MUD
+Cada conexão WebSocket é entregue diretamente ao handle_client através de
+um StreamReader/Writer adaptado, sem abrir uma conexão TCP até o MUD
+"""
+
+import asyncio
+import codecs
+import json
+import os
+from typing import Awaitable, Callable, Optional
+
+from mud.net import gmcp
+from mud.net.capabilities import ClientCapabilities
+from mud.net.flow import ReaderFlow
+
+# Tamanho máximo de um comando vindo do navegador
+MAX_INPUT_LENGTH = 4096
+
+# Agrupamento da saída: espera até FLUSH_DELAY segundos, ou envia antes
+# se acumular FLUSH_MAX_LINES linhas ou FLUSH_MAX_BYTES bytes
+FLUSH_DELAY = 0.05
+FLUSH_MAX_LINES = 15
+FLUSH_MAX_BYTES = 8192
+
+# Formato dos frames enviados ao navegador: 'text' (JSON) ou 'binary' (UTF-8 puro)
+WS_FRAME_MODE = os.environ.get('WS_FRAME_MODE', 'text').lower()
+# permessage-deflate nos WebSockets (desative com WS_COMPRESSION=0)
+WS_COMPRESSION = os.environ.get('WS_COMPRESSION', '1').lower() not in ('0', 'false', 'no')
+
+
+def websocket_serve_options() -> dict:
+    """Opções de compressão para websockets.serve"""
+    return {'compression': 'deflate' if WS_COMPRESSION else None}
+
+
+def parse_client_message(message) -> Optional[str]:
+    """Extrai o comando de uma mensagem do cliente web (JSON mud_input ou texto puro)"""
+    if isinstance(message, bytes):
+        message = message.decode('utf-8', errors='replace')
+    try:
+        data = json.loads(message)
+    except json.JSONDecodeError:
+        # Se não for JSON, trata como comando direto (fallback)
+        return message
+    if isinstance(data, dict):
+        if data.get('type') == 'mud_input':
+            return str(data.get('data', ''))
+        return None
+    return message
+
+
+class OutputFramer:
+    """
+    Agrupa a saída do MUD em frames WebSocket.
+    Os bytes são acumulados em um bytearray e enviados por um único timer por
+    conexão (ou imediatamente quando há muitas linhas/bytes pendentes).
+    Em modo texto cada frame é um JSON mud_output; em modo binário os bytes
+    UTF-8 são enviados sem cópia extra nem reempacotamento.
+    Eventos estruturados (GMCP) vão como frames JSON próprios, depois do texto pendente.
+    """
+
+    def __init__(self, send: Callable[[object], Awaitable[None]], binary: bool = False,
+                 flush_delay: float = FLUSH_DELAY, max_lines: int = FLUSH_MAX_LINES,
+                 max_buffer: int = FLUSH_MAX_BYTES):
+        self._send = send
+        self.binary = binary
+        self.flush_delay = flush_delay
+        self.max_lines = max_lines
+        self.max_buffer = max_buffer
+        self._buffer = bytearray()
+        self._events: list = []
+        self._pending_lines = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._send_lock = asyncio.Lock()
+        self.closed = False
+
+    def feed(self, data: bytes):
+        """Acumula dados e agenda o envio"""
+        if self.closed or not data:
+            return
+        self._buffer += data
+        self._pending_lines += data.count(b'\n')
+        if self._pending_lines >= self.max_lines or len(self._buffer) >= self.max_buffer:
+            self._start_flush()
+        elif self._timer is None and (self._flush_task is None or self._flush_task.done()):
+            self._timer = asyncio.get_running_loop().call_later(self.flush_delay, self._start_flush)
+
+    def send_event(self, event: dict):
+        """Agenda um frame JSON estruturado (enviado logo após o texto já acumulado)"""
+        if self.closed:
+            return
+        self._events.append(json.dumps(event, separators=(',', ':'), ensure_ascii=False))
+        self._start_flush()
+
+    @property
+    def pending(self) -> int:
+        """Bytes aguardando envio"""
+        return len(self._buffer)
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_quietly())
+
+    async def _flush_quietly(self):
+        try:
+            await self.flush()
+        except ConnectionResetError:
+            pass
+
+    async def flush(self):
+        """Envia imediatamente tudo que estiver acumulado"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._send_lock:
+            # Texto que chega enquanto os eventos são enviados (ex.: o prompt depois de
+            # um update GMCP) não agenda timer: é enviado nesta mesma rodada
+            while self._buffer or self._events:
+                while self._buffer:
+                    # Troca o buffer em vez de copiar/fatiar: o frame leva o bytearray atual
+                    data, self._buffer = self._buffer, bytearray()
+                    self._pending_lines = 0
+                    if self.binary:
+                        frame = data
+                    else:
+                        text = self._decoder.decode(data)
+                        if not text:
+                            continue
+                        frame = json.dumps({'type': 'mud_output', 'data': text})
+                    await self._send_frame(frame)
+                while self._events:
+                    events, self._events = self._events, []
+                    for frame in events:
+                        await self._send_frame(frame)
+
+    async def _send_frame(self, frame):
+        try:
+            await self._send(frame)
+        except Exception as e:
+            self.close()
+            raise ConnectionResetError(f"WebSocket fechado: {e}") from e
+
+    def close(self):
+        """Descarta dados pendentes e cancela o timer"""
+        self.closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._buffer.clear()
+        self._events.clear()
+
+
+class WebSocketStreamWriter:
+    """
+    Adaptador com a interface de asyncio.StreamWriter usada pelo jogo
+    (write, drain, close, wait_closed, get_extra_info) que envia a saída
+    para o navegador através de um OutputFramer.
+    """
+
+    def __init__(self, websocket, binary: bool = False):
+        self.websocket = websocket
+        self.framer = OutputFramer(websocket.send, binary=binary)
+        self._close_task: Optional[asyncio.Task] = None
+        # O navegador sempre recebe GMCP como frames {'type': 'gmcp'} (ignorados se não usados)
+        self.gmcp = gmcp.GMCPChannel(self.send_gmcp) if gmcp.GMCP_ENABLED else None
+        # O cliente web sempre renderiza cores ANSI e UTF-8
+        self.capabilities = ClientCapabilities(client_name='web', negotiated=True)
+
+    def write(self, data: bytes):
+        """Acumula dados; o framer envia após um pequeno atraso ou quando acumula muito"""
+        self.framer.feed(data)
+
+    def send_gmcp(self, package: str, data):
+        """Envia uma mensagem GMCP como frame estruturado"""
+        self.framer.send_event({'type': 'gmcp', 'package': package, 'data': data})
+
+    async def drain(self):
+        """Só espera pelo envio quando há muitos dados pendentes (como um StreamWriter)"""
+        if self.framer.closed and self._close_task is None:
+            raise ConnectionResetError("WebSocket fechado")
+        if self.framer.pending >= self.framer.max_buffer:
+            await self.framer.flush()
+
+    def is_closing(self) -> bool:
+        return self.framer.closed or self._close_task is not None
+
+    def close(self):
+        """Envia o que restou e fecha o WebSocket"""
+        if self._close_task is not None:
+            return
+        self._close_task = asyncio.ensure_future(self._close())
+
+    async def _close(self):
+        try:
+            await self.framer.flush()
+        except ConnectionResetError:
+            pass
+        self.framer.close()
+        try:
+            await self.websocket.close()
+        except Exception:
+            pass
+
+    async def wait_closed(self):
+        if self._close_task is not None:
+            await self._close_task
+
+    def get_extra_info(self, name: str, default=None):
+        if name == 'peername':
+            return getattr(self.websocket, 'remote_address', default)
+        return default
+
+
+ClientHandler = Callable[[asyncio.StreamReader, WebSocketStreamWriter], Awaitable[None]]
+
+
+class InProcessGateway:
+    """Servidor WebSocket que alimenta handle_client diretamente (sem salto TCP)"""
+
+    def __init__(self, client_handler: ClientHandler):
+        self.client_handler = client_handler
+
+    async def handle_websocket(self, websocket, path=None):
+        """Conecta um WebSocket ao handler de clientes do jogo"""
+        print(f"[WebSocket] Nova conexão (in-process): {getattr(websocket, 'remote_address', None)}")
+        reader = asyncio.StreamReader()
+        flow = ReaderFlow(reader)
+        writer = WebSocketStreamWriter(websocket, binary=WS_FRAME_MODE == 'binary')
+
+        async def client_to_game():
+            try:
+                async for message in websocket:
+                    # Jogo sem consumir a entrada: para de ler do WebSocket até liberar espaço
+                    await flow.wait()
+                    command = parse_client_message(message)
+                    if command is None:
+                        continue
+                    reader.feed_data(command[:MAX_INPUT_LENGTH].encode('utf-8') + b'\r\n')
+            except Exception:
+                pass
+            finally:
+                reader.feed_eof()
+
+        input_task = asyncio.create_task(client_to_game())
+        try:
+            await self.client_handler(reader, writer)
+        finally:
+            input_task.cancel()
+            writer.close()
+            await writer.wait_closed()
+            print(f"[WebSocket] Conexão fechada (in-process): {getattr(websocket, 'remote_address', None)}")
+
+    async def start(self, host: str, port: int, **kwargs):
+        """Inicia o servidor WebSocket e retorna o objeto do servidor"""
+        from websockets.server import serve  # dependência opcional do servidor de jogo
+        options = websocket_serve_options()
+        options.update(kwargs)
+        return await serve(self.handle_websocket, host, port, **options)
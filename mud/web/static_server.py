@@ -0,0 +1,259 @@
+"""
+Servidor HTTP assíncrono para os arquivos estáticos do cliente web
+Os arquivos são carregados uma vez em memória, pré-comprimidos (gzip/brotli)
+e servidos com ETag/Last-Modified e respostas 304 condicionais
+"""
+
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # brotli é opcional; sem ele serve apenas gzip
+
+# Tipos que valem a pena comprimir
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+# Tempo máximo ocioso de uma conexão keep-alive
+KEEP_ALIVE_TIMEOUT = 15.0
+
+STATUS_TEXT = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+}
+
+
+@dataclass
+class StaticAsset:
+    """Arquivo estático já carregado em memória com suas variantes comprimidas"""
+    path: str
+    content_type: str
+    body: bytes
+    etag: str
+    last_modified: str
+    mtime: int
+    encodings: Dict[str, bytes] = field(default_factory=dict)  # encoding -> corpo comprimido
+
+    def select(self, accept_encoding: str) -> Tuple[bytes, Optional[str], str]:
+        """Escolhe a melhor variante para o Accept-Encoding. Retorna (corpo, encoding, etag)"""
+        accepted = _parse_accept_encoding(accept_encoding)
+        for encoding in ('br', 'gzip'):
+            if encoding in self.encodings and encoding in accepted:
+                return self.encodings[encoding], encoding, f'"{self.etag}-{encoding}"'
+        return self.body, None, f'"{self.etag}"'
+
+    def matches_etag(self, if_none_match: str) -> bool:
+        """Verifica se algum ETag do cabeçalho If-None-Match corresponde a este arquivo"""
+        if if_none_match.strip() == '*':
+            return True
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            tag = tag.strip('"')
+            if tag == self.etag or tag.rsplit('-', 1)[0] == self.etag:
+                return True
+        return False
+
+
+def _parse_accept_encoding(header: str) -> set:
+    """Retorna os encodings aceitos (ignora os com q=0)"""
+    accepted = set()
+    for part in header.split(','):
+        params = part.strip().split(';')
+        name = params[0].strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params[1:]:
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(name)
+    return accepted
+
+
+class StaticAssetCache:
+    """Carrega e mantém em memória todos os arquivos de um diretório"""
+
+    def __init__(self, root: str = 'web'):
+        self.root = root
+        self.assets: Dict[str, StaticAsset] = {}
+
+    def load(self):
+        """(Re)carrega todos os arquivos do diretório, comprimindo os que valem a pena"""
+        assets = {}
+        if os.path.isdir(self.root):
+            for dirpath, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    file_path = os.path.join(dirpath, filename)
+                    url_path = '/' + os.path.relpath(file_path, self.root).replace(os.sep, '/')
+                    assets[url_path] = self._load_asset(file_path, url_path)
+        self.assets = assets
+        total = sum(len(a.body) for a in assets.values())
+        print(f"[Web Server] {len(assets)} arquivos estáticos carregados em memória ({total} bytes)")
+
+    @staticmethod
+    def _load_asset(file_path: str, url_path: str) -> StaticAsset:
+        with open(file_path, 'rb') as f:
+            body = f.read()
+        mtime = os.path.getmtime(file_path)
+
+        content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+
+        asset = StaticAsset(
+            path=url_path,
+            content_type=content_type,
+            body=body,
+            etag=hashlib.sha1(body).hexdigest()[:16],
+            last_modified=formatdate(mtime, usegmt=True),
+            mtime=int(mtime),
+        )
+
+        if content_type.startswith(COMPRESSIBLE_TYPES) and len(body) > 256:
+            gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(gzipped) < len(body):
+                asset.encodings['gzip'] = gzipped
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    asset.encodings['br'] = compressed
+        return asset
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        """Busca um arquivo pelo caminho da URL ('/' serve index.html)"""
+        if path == '/':
+            path = '/index.html'
+        return self.assets.get(path)
+
+
+class StaticHTTPServer:
+    """Servidor HTTP/1.1 mínimo rodando no loop asyncio"""
+
+    def __init__(self, cache: StaticAssetCache):
+        self.cache = cache
+
+    async def start(self, host: str, port: int):
+        """Inicia o servidor e retorna o asyncio.Server"""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atende requisições de uma conexão (com keep-alive)"""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout=KEEP_ALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+
+                keep_alive = self.handle_request(head, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    def handle_request(self, head: bytes, writer: asyncio.StreamWriter) -> bool:
+        """Processa uma requisição e escreve a resposta. Retorna True para manter a conexão"""
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ', 2)
+        except ValueError:
+            self._send(writer, 400, {}, b'400 Bad Request', False)
+            return False
+
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = (version == 'HTTP/1.1' and connection != 'close') or connection == 'keep-alive'
+
+        if method not in ('GET', 'HEAD'):
+            # Corpo da requisição não é lido, então a conexão é encerrada
+            self._send(writer, 405, {'Allow': 'GET, HEAD'}, b'405 Method Not Allowed', False)
+            return False
+
+        path = unquote(urlparse(target).path)
+        asset = self.cache.get(path)
+        if asset is None:
+            if path in ('/', '/index.html'):
+                body = b'<h1>Arquivo index.html nao encontrado</h1>'
+            else:
+                body = b'404 Not Found'
+            self._send(writer, 404, {}, body, keep_alive, head_only=method == 'HEAD')
+            return keep_alive
+
+        body, encoding, etag = asset.select(headers.get('accept-encoding', ''))
+        response_headers = {
+            'Content-Type': asset.content_type,
+            'ETag': etag,
+            'Last-Modified': asset.last_modified,
+            'Cache-Control': 'no-cache' if asset.content_type.startswith('text/html') else 'public, max-age=3600',
+            'Vary': 'Accept-Encoding',
+        }
+        if encoding:
+            response_headers['Content-Encoding'] = encoding
+
+        if self._not_modified(asset, headers):
+            self._send(writer, 304, response_headers, b'', keep_alive, head_only=True)
+            return keep_alive
+
+        self._send(writer, 200, response_headers, body, keep_alive, head_only=method == 'HEAD')
+        return keep_alive
+
+    @staticmethod
+    def _not_modified(asset: StaticAsset, headers: Dict[str, str]) -> bool:
+        """Verifica cabeçalhos condicionais (If-None-Match tem prioridade sobre If-Modified-Since)"""
+        if_none_match = headers.get('if-none-match')
+        if if_none_match is not None:
+            return asset.matches_etag(if_none_match)
+
+        if_modified_since = headers.get('if-modified-since')
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError, IndexError):
+                return False
+            return asset.mtime <= since
+        return False
+
+    @staticmethod
+    def _send(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], body: bytes,
+              keep_alive: bool, head_only: bool = False):
+        """Escreve status, cabeçalhos e corpo em uma única chamada"""
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+        for name, value in headers.items():
+            lines.append(f"{name}: {value}")
+        if status != 304:
+            lines.append(f"Content-Length: {len(body)}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        response = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        if not head_only:
+            response += body
+        writer.write(response)
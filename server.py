@@ -7,35 +7,63 @@ Compatível com TinTin++ e outros clientes MUD
 
 import asyncio
 import os
-from typing import Dict, Set, Optional
+from typing import Dict, Set, Optional, Tuple
 from datetime import datetime
 
 from mud.core.models import Player
 from mud.managers.world_manager import WorldManager
-from mud.core.database import Database
+from mud.core.storage import PlayerLoad, StorageBackend, create_storage, write_in_background
+from mud.core.journal import PlayerJournal, default_journal_path
+from mud.core.backup import BACKUP_INTERVAL, run_backups
+from mud.core.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH, ARCHIVE_INTERVAL
 from mud.commands.commands import CommandHandler
 from mud.auth.auth import authenticate
-from mud.systems.character_creation import create_character
+from mud.systems.character_creation import create_character, register_screens as register_creation_screens
 from mud.systems.classes import ClassSystem
 from mud.utils.compatibility_test import run_compatibility_test
 from mud.managers.world_lore_manager import WorldLoreManager
 from mud.managers.dungeon_manager import DungeonManager
 from mud.utils.ansi import ANSI
+from mud.core.rate_limit import SessionRateLimiter, INPUT_QUEUE_MAX, MAX_DEFER, publish_limits
+from mud.core.metrics import metrics
+from mud.web.gateway import InProcessGateway
+from mud.net.telnet import TelnetSession
+from mud.net import gmcp
+from mud.net.capabilities import capabilities_of
+from mud.utils.screens import screens
+from mud.utils.output import encode_message
+from mud.utils.prompt import prompts
+from mud.web.static_server import StaticAssetCache, StaticHTTPServer
 
 # Configurações do servidor
 # Aceita conexões de qualquer IP (0.0.0.0 = todas as interfaces)
 HOST = '0.0.0.0'
 # Porta padrão: 4000, mas pode ser sobrescrita por variável de ambiente (útil para Railway, Heroku, etc.)
 PORT = int(os.environ.get('PORT', 4000))
+# Cliente web embutido: HTTP + WebSocket no mesmo processo do jogo (sem proxy TCP)
+EMBED_WEB = os.environ.get('EMBED_WEB', '').lower() in ('1', 'true', 'yes')
+WEB_PORT = int(os.environ.get('WEB_PORT', 8000))
+WS_PORT = int(os.environ.get('WS_PORT', 8080))
+# Tempo (segundos) que um jogador com conexão perdida fica em memória aguardando reconexão
+LINKDEAD_GRACE = float(os.environ.get('LINKDEAD_GRACE', 180))
+# Banner de boas-vindas: até 60 colunas com as bordas
+BANNER_MAX_WIDTH = 60
+DEVELOPERS = ["Luan Schons Griebler"]
 
 class MUDGame:
     """Gerenciador principal do jogo MUD"""
     
-    def __init__(self, world_manager: WorldManager, database: Database):
+    def __init__(self, world_manager: WorldManager, database: StorageBackend, journal: Optional[PlayerJournal] = None):
         self.players: Dict[str, Player] = {}
         self.world_manager = world_manager
         self.database = database
+        # Stats dos jogadores passam pelo journal antes de chegar ao armazenamento
+        self.journal = journal or PlayerJournal(database)
         self.player_connections: Set[asyncio.StreamWriter] = set()
+        # Handlers de comandos por jogador (preservam estado de combate ao reconectar)
+        self.command_handlers: Dict[str, object] = {}
+        # Jogadores com conexão perdida aguardando reconexão: nome -> (player, timer de expiração)
+        self.linkdead: Dict[str, Tuple[Player, asyncio.TimerHandle]] = {}
     
     def get_players_in_room(self, world_id: str, room_id: str) -> list:
         """Retorna lista de jogadores em uma sala"""
@@ -98,46 +126,204 @@ class MUDGame:
             player = self.players[name]
             self.player_connections.discard(player.writer)
             del self.players[name]
+        handler = self.command_handlers.pop(name, None)
+        if handler:
+            handler.cancel_output(name)
+        prompts.forget(name)
+        self.journal.forget_player(name)
+        self.database.forget_player(name)
+    
+    def save_player(self, player: Player):
+        """Salva localização e estatísticas do jogador no banco"""
+        self.database.update_player_location(player.name, player.world_id, player.room_id)
+        stats = {
+            'hp': player.current_hp,
+            'max_hp': player.max_hp,
+            'current_stamina': player.current_stamina,
+            'max_stamina': player.max_stamina,
+            'level': player.level,
+            'experience': player.experience,
+            'attack': player.attack,
+            'defense': player.defense,
+            'gold': player.gold,
+            'inventory': player.inventory,
+            'equipment': player.equipment,
+            'active_quests': player.active_quests,
+            'quest_progress': player.quest_progress,
+            'completed_quests': player.completed_quests,
+            'known_spells': player.known_spells,
+            'equipped_spells': player.equipped_spells,
+            'active_perks': player.active_perks,
+            'spell_cooldowns': player.spell_cooldowns,
+            'unspent_points': player.unspent_points,
+            'channels': player.channels if hasattr(player, 'channels') else ["local"]
+        }
+        self.journal.record(player.name, stats)
+    
+    async def park_player(self, player: Player):
+        """
+        Conexão caiu: salva o estado e mantém o jogador em memória (link-dead)
+        por LINKDEAD_GRACE segundos, para que uma reconexão o reanexe sem recarregar
+        """
+        self.player_connections.discard(player.writer)
+        del self.players[player.name]
+        self.save_player(player)
+        
+        loop = asyncio.get_running_loop()
+        timer = loop.call_later(LINKDEAD_GRACE, lambda: asyncio.ensure_future(self._expire_linkdead(player.name)))
+        self.linkdead[player.name] = (player, timer)
+        metrics.incr('sessions.linkdead')
+        metrics.set_gauge('sessions.linkdead_now', len(self.linkdead))
+        
+        await self.broadcast_to_room(
+            player.world_id,
+            player.room_id,
+            f"{player.name} perdeu a conexão.",
+            exclude_player=player.name
+        )
+    
+    async def _expire_linkdead(self, name: str):
+        """Fim do período de graça: descarta o jogador (estado já foi salvo ao cair)"""
+        entry = self.linkdead.pop(name, None)
+        metrics.set_gauge('sessions.linkdead_now', len(self.linkdead))
+        if not entry:
+            return
+        player, _ = entry
+        handler = self.command_handlers.pop(name, None)
+        if handler:
+            handler.cancel_output(name)
+        prompts.forget(name)
+        self.journal.forget_player(name)
+        self.database.forget_player(name)
+        metrics.incr('sessions.linkdead_expired')
+        await self.broadcast_to_room(
+            player.world_id,
+            player.room_id,
+            f"{player.name} desconectou.",
+            exclude_player=player.name
+        )
+    
+    def has_session(self, name: str) -> bool:
+        """Jogador já carregado em memória (sessão aberta ou link-dead)"""
+        return name in self.command_handlers and (name in self.players or name in self.linkdead)
+    
+    def resume_player(self, name: str, writer: asyncio.StreamWriter, reader: asyncio.StreamReader) -> Optional[Tuple[Player, object]]:
+        """
+        Reanexa uma nova conexão a um jogador já carregado em memória: um jogador
+        link-dead ou uma sessão ainda aberta (a conexão antiga é fechada).
+        Retorna (player, handler) ou None se o jogador precisa ser carregado do banco
+        """
+        handler = self.command_handlers.get(name)
+        if handler is None:
+            return None
+        
+        entry = self.linkdead.pop(name, None)
+        if entry:
+            player, timer = entry
+            timer.cancel()
+            metrics.set_gauge('sessions.linkdead_now', len(self.linkdead))
+        elif name in self.players:
+            # Sessão ainda aberta (ex.: conexão meio-aberta): a nova conexão assume
+            player = self.players[name]
+            old_writer = player.writer
+            self.player_connections.discard(old_writer)
+            try:
+                old_writer.write(f"\r\n{ANSI.YELLOW}Sessão assumida por outra conexão.{ANSI.RESET}\r\n".encode())
+                old_writer.close()
+            except Exception:
+                pass
+        else:
+            return None
+        
+        player.writer = writer
+        player.reader = reader
+        self.players[name] = player
+        self.player_connections.add(writer)
+        metrics.incr('sessions.resumed')
+        return player, handler
+    
+    async def deliver(self, player: Player, data: bytes):
+        """
+        Entrega bytes já codificados pela fila de saída do jogador (atrás das animações).
+        Erros do socket do destinatário não chegam a quem enviou
+        """
+        handler = self.command_handlers.get(player.name)
+        try:
+            if handler is not None:
+                await handler.deliver(player, data)
+            else:
+                player.writer.write(data)
+                await player.writer.drain()
+        except:
+            pass
     
     async def broadcast_to_room(self, world_id: str, room_id: str, message: str, exclude_player: Optional[str] = None):
         """Envia mensagem para todos os jogadores na sala"""
         players = self.get_players_in_room(world_id, room_id)
+        # Codificada uma vez para todos (limpa a linha antes, como o send_message)
+        data = encode_message(message)
         for player in players:
             if exclude_player and player.name == exclude_player:
                 continue
-            try:
-                # Remove qualquer quebra de linha no final
-                message_clean = message.rstrip('\r\n')
-                
-                # Limpa a linha atual antes de enviar a mensagem
-                # Isso evita que mensagens apareçam no meio da linha quando o jogador está digitando
-                # Sequência ANSI: \r volta ao início da linha, \033[K limpa até o final da linha
-                clear_line = "\r\033[K"
-                player.writer.write(f"{clear_line}{message_clean}\r\n".encode())
-                await player.writer.drain()
-            except:
-                pass
+            await self.deliver(player, data)
     
     async def broadcast_global(self, message: str, exclude_player: Optional[str] = None):
         """Envia mensagem para todos os jogadores online que estão no canal global"""
-        for player in self.players.values():
+        data = encode_message(message)
+        for player in list(self.players.values()):
             if exclude_player and player.name == exclude_player:
                 continue
             # Só envia para jogadores que estão no canal global
             if "global" not in player.channels:
                 continue
-            try:
-                # Remove qualquer quebra de linha no final
-                message_clean = message.rstrip('\r\n')
-                
-                # Limpa a linha atual antes de enviar a mensagem
-                # Isso evita que mensagens apareçam no meio da linha quando o jogador está digitando
-                # Sequência ANSI: \r volta ao início da linha, \033[K limpa até o final da linha
-                clear_line = "\r\033[K"
-                player.writer.write(f"{clear_line}{message_clean}\r\n".encode())
-                await player.writer.drain()
-            except:
-                pass
+            await self.deliver(player, data)
+
+def render_world_menu(world_manager: WorldManager) -> str:
+    """Lista de mundos disponíveis"""
+    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Escolha um Mundo ==={ANSI.RESET}\r\n\r\n"
+    for i, world in enumerate(world_manager.list_worlds(), 1):
+        message += f"{ANSI.BRIGHT_GREEN}{i}.{ANSI.RESET} {ANSI.BRIGHT_CYAN}{world['name']}{ANSI.RESET} ({world['id']})\r\n"
+        message += f"   {world['description']}\r\n\r\n"
+    
+    message += f"{ANSI.BRIGHT_YELLOW}Digite o número ou ID do mundo:{ANSI.RESET} "
+    return message
+
+def _banner_border() -> str:
+    return f"{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}"
+
+def _banner_blank(width: int) -> str:
+    return f"{_banner_border()}{' ' * width}{_banner_border()}\r\n"
+
+def banner_line(width: int, text: str, content: str) -> str:
+    """Linha do banner com o conteúdo centralizado (text = conteúdo sem cores, para medir)"""
+    pad = (width - len(text)) // 2
+    return f"{_banner_border()}{' ' * pad}{content}{ANSI.RESET}{' ' * (width - len(text) - pad)}{_banner_border()}\r\n"
+
+def render_banner_top(width: int) -> str:
+    """Borda superior e título do banner de boas-vindas"""
+    inner = width - 2
+    title = "Bem-vindo ao OpenMud Dungeon Server!"
+    message = f"\r\n{ANSI.BOLD}{ANSI.BRIGHT_CYAN}{'═' * width}{ANSI.RESET}\r\n"
+    message += _banner_blank(inner)
+    message += banner_line(inner, title, f"{ANSI.BRIGHT_CYAN}{title}")
+    message += _banner_blank(inner)
+    return message
+
+def render_banner_bottom(width: int) -> str:
+    """Créditos e borda inferior do banner de boas-vindas"""
+    inner = width - 2
+    dev_line = f"Desenvolvido por: {', '.join(DEVELOPERS)}"
+    message = _banner_blank(inner)
+    message += banner_line(inner, dev_line, f"{ANSI.BRIGHT_MAGENTA}{dev_line}")
+    message += _banner_blank(inner)
+    message += f"{ANSI.BOLD}{ANSI.BRIGHT_CYAN}{'═' * width}{ANSI.RESET}\r\n\r\n"
+    return message
+
+# Telas fixas da conexão (mundos e menus da criação são registrados no boot)
+screens.register('welcome', lambda: f"{ANSI.BRIGHT_GREEN}Bem-vindo ao OpenMud MUD!{ANSI.RESET}\r\n")
+screens.register('banner.top', render_banner_top, max_width=BANNER_MAX_WIDTH)
+screens.register('banner.spacer', lambda width: _banner_blank(width - 2), max_width=BANNER_MAX_WIDTH)
+screens.register('banner.bottom', render_banner_bottom, max_width=BANNER_MAX_WIDTH)
 
 async def select_world(writer: asyncio.StreamWriter, reader: asyncio.StreamReader, world_manager: WorldManager) -> Optional[str]:
     """Permite ao jogador escolher um mundo"""
@@ -149,13 +335,7 @@ async def select_world(writer: asyncio.StreamWriter, reader: asyncio.StreamReade
         return None
     
     # Mostra mundos disponíveis
-    message = f"\r\n{ANSI.BOLD}{ANSI.CYAN}=== Escolha um Mundo ==={ANSI.RESET}\r\n\r\n"
-    for i, world in enumerate(worlds, 1):
-        message += f"{ANSI.BRIGHT_GREEN}{i}.{ANSI.RESET} {ANSI.BRIGHT_CYAN}{world['name']}{ANSI.RESET} ({world['id']})\r\n"
-        message += f"   {world['description']}\r\n\r\n"
-    
-    message += f"{ANSI.BRIGHT_YELLOW}Digite o número ou ID do mundo:{ANSI.RESET} "
-    writer.write(message.encode())
+    writer.write(screens.for_writer('worlds', writer))
     await writer.drain()
     
     # Aguarda escolha
@@ -189,290 +369,354 @@ async def select_world(writer: asyncio.StreamWriter, reader: asyncio.StreamReade
         await writer.drain()
         return worlds[0]['id'] if worlds else None
 
-async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, game: MUDGame, world_manager: WorldManager, database: Database, game_data, lore_manager, quest_manager, class_system: ClassSystem, world_lore_manager: WorldLoreManager, dungeon_manager: DungeonManager):
-    """Gerencia conexão de um cliente"""
-    addr = writer.get_extra_info('peername')
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] Nova conexão TCP recebida de {addr}")
-    
-    # Envia uma mensagem de boas-vindas imediata para testar a conexão
+async def read_input_lines(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, input_queue: asyncio.Queue):
+    """
+    Lê linhas do cliente para uma fila limitada.
+    Se a fila estiver cheia, a linha é descartada (flood control).
+    Coloca None na fila quando a conexão termina.
+    """
     try:
-        welcome_msg = f"{ANSI.BRIGHT_GREEN}Bem-vindo ao OpenMud MUD!{ANSI.RESET}\r\n"
-        writer.write(welcome_msg.encode())
-        await writer.drain()
-    except Exception as e:
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Erro ao enviar mensagem de boas-vindas: {e}")
-        writer.close()
-        return
+        while True:
+            data = await reader.readline()
+            if not data:
+                break
+            if input_queue.full():
+                # Fila cheia não é uma categoria de comando: métrica própria
+                metrics.incr('input.queue_full')
+                try:
+                    writer.write(f"\r\n{ANSI.YELLOW}Muitos comandos na fila. Comando ignorado.{ANSI.RESET}\r\n".encode())
+                except Exception:
+                    pass
+                continue
+            input_queue.put_nowait(data)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        pass
+    # Sinaliza fim da conexão (aguarda espaço se a fila estiver cheia)
+    await input_queue.put(None)
+
+async def enter_game(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, game: MUDGame, player_name: str, load: PlayerLoad, world_manager: WorldManager, database: StorageBackend, game_data, lore_manager, quest_manager, class_system: ClassSystem, world_lore_manager: WorldLoreManager, dungeon_manager: DungeonManager):
+    """
+    Carrega o jogador (teste de compatibilidade, criação de personagem, stats)
+    e o coloca no jogo, reaproveitando os dados lidos no login (PlayerLoad).
+    Retorna (player, handler) ou None se a entrada foi cancelada.
+    """
+    username = player_name
     
-    try:
-        # Autenticação (login/registro)
-        auth_success, username = await authenticate(writer, reader, database)
-        if not auth_success:
-            writer.write(f"{ANSI.RED}Falha na autenticação. Desconectando...{ANSI.RESET}\r\n".encode())
+    # Teste de compatibilidade visual (apenas uma vez; dispensado se o cliente
+    # já informou o terminal via TTYPE/MTTS/NAWS ou é o cliente web)
+    capabilities = capabilities_of(writer)
+    if not load.compatibility_test_done and capabilities.negotiated:
+        write_in_background(database.mark_compatibility_test_done, username)
+    elif not load.compatibility_test_done:
+        test_completed = await run_compatibility_test(writer, reader, database, username)
+        if not test_completed:
+            writer.write(f"{ANSI.YELLOW}Teste não concluído. Você poderá continuar mesmo assim.{ANSI.RESET}\r\n".encode())
             await writer.drain()
-            writer.close()
-            return
-        
-        player_name = username
-        
-        # Teste de compatibilidade visual (apenas uma vez)
-        if not database.has_done_compatibility_test(username):
-            test_completed = await run_compatibility_test(writer, reader, database, username)
-            if not test_completed:
-                writer.write(f"{ANSI.YELLOW}Teste não concluído. Você poderá continuar mesmo assim.{ANSI.RESET}\r\n".encode())
-                await writer.drain()
-                # Aguarda um pouco antes de continuar
-                await asyncio.sleep(1)
-        
-        # Verifica se jogador existe no banco
-        player_data = database.get_player(player_name)
+            # Aguarda um pouco antes de continuar
+            await asyncio.sleep(1)
+    
+    # Jogador carregado junto com a conta no login (None se ainda não existe)
+    player_data = load.player
+    if player_data:
+        # Alterações ainda não compactadas do journal (relogin rápido) têm precedência
+        player_data['stats'].update(game.journal.pending_state(player_name))
+    
+    if player_data:
+        # Jogador existente - verifica se tem classe/raça/gênero
+        class_id = player_data.get('class_id', '')
+        race_id = player_data.get('race_id', '')
+        gender_id = player_data.get('gender_id', '')
         
-        if player_data:
-            # Jogador existente - verifica se tem classe/raça/gênero
-            class_id = player_data.get('class_id', '')
-            race_id = player_data.get('race_id', '')
-            gender_id = player_data.get('gender_id', '')
+        # Se não tem classe/raça/gênero, força criação
+        if not class_id or not race_id or not gender_id:
+            writer.write(f"{ANSI.YELLOW}Você precisa completar a criação do seu personagem.{ANSI.RESET}\r\n".encode())
+            await writer.drain()
             
-            # Se não tem classe/raça/gênero, força criação
+            class_id, race_id, gender_id = await create_character(writer, reader, class_system)
             if not class_id or not race_id or not gender_id:
-                writer.write(f"{ANSI.YELLOW}Você precisa completar a criação do seu personagem.{ANSI.RESET}\r\n".encode())
-                await writer.drain()
-                
-                class_id, race_id, gender_id = await create_character(writer, reader, class_system)
-                if not class_id or not race_id or not gender_id:
-                    writer.write(f"{ANSI.RED}Criação de personagem cancelada. Desconectando...{ANSI.RESET}\r\n".encode())
-                    await writer.drain()
-                    writer.close()
-                    return
-                
-                # Atualiza no banco
-                database.update_player_class_race_gender(player_name, class_id, race_id, gender_id)
-            
-            world_id = player_data['world_id']
-            room_id = player_data['room_id']
-            
-            # Verifica se mundo ainda existe
-            if not world_manager.get_world(world_id):
-                writer.write(f"{ANSI.YELLOW}Seu mundo anterior não existe mais. Escolha um novo:{ANSI.RESET}\r\n".encode())
+                writer.write(f"{ANSI.RED}Criação de personagem cancelada. Desconectando...{ANSI.RESET}\r\n".encode())
                 await writer.drain()
-                world_id = await select_world(writer, reader, world_manager)
-                if not world_id:
-                    writer.close()
-                    return
-                world = world_manager.get_world(world_id)
-                room_id = world.start_room if world else None
-                if not room_id:
-                    writer.close()
-                    return
-            
-            # Verifica se sala ainda existe
-            if not world_manager.get_room(world_id, room_id):
-                world = world_manager.get_world(world_id)
-                room_id = world.start_room if world else None
-                if not room_id:
-                    writer.close()
-                    return
+                writer.close()
+                return None
             
-            welcome_back = f"{ANSI.BRIGHT_GREEN}Bem-vindo de volta, {player_name}!{ANSI.RESET}\r\n"
-            writer.write(welcome_back.encode())
+            # Atualiza no banco
+            database.update_player_class_race_gender(player_name, class_id, race_id, gender_id)
+            player_data.update(class_id=class_id, race_id=race_id, gender_id=gender_id)
+        
+        world_id = player_data['world_id']
+        room_id = player_data['room_id']
+        
+        # Verifica se mundo ainda existe
+        if not world_manager.get_world(world_id):
+            writer.write(f"{ANSI.YELLOW}Seu mundo anterior não existe mais. Escolha um novo:{ANSI.RESET}\r\n".encode())
             await writer.drain()
-        else:
-            # Novo jogador - escolhe mundo primeiro
             world_id = await select_world(writer, reader, world_manager)
             if not world_id:
                 writer.close()
-                return
-            
+                return None
             world = world_manager.get_world(world_id)
             room_id = world.start_room if world else None
             if not room_id:
                 writer.close()
-                return
-            
-            # Criação de personagem (classe, raça, gênero)
-            class_id, race_id, gender_id = await create_character(writer, reader, class_system)
-            if not class_id or not race_id or not gender_id:
-                writer.write(f"{ANSI.RED}Criação de personagem cancelada. Desconectando...{ANSI.RESET}\r\n".encode())
-                await writer.drain()
+                return None
+        
+        # Verifica se sala ainda existe
+        if not world_manager.get_room(world_id, room_id):
+            world = world_manager.get_world(world_id)
+            room_id = world.start_room if world else None
+            if not room_id:
                 writer.close()
-                return
-            
-            # Cria jogador no banco com classe/raça/gênero
-            database.create_player(player_name, world_id, room_id, class_id, race_id, gender_id)
+                return None
         
-        # Carrega dados do jogador do banco
-        player_data = database.get_player(player_name)
-        class_id = player_data.get('class_id', '') if player_data else ''
-        race_id = player_data.get('race_id', '') if player_data else ''
-        gender_id = player_data.get('gender_id', '') if player_data else ''
+        welcome_back = f"{ANSI.BRIGHT_GREEN}Bem-vindo de volta, {player_name}!{ANSI.RESET}\r\n"
+        writer.write(welcome_back.encode())
+        await writer.drain()
+    else:
+        # Novo jogador - escolhe mundo primeiro
+        world_id = await select_world(writer, reader, world_manager)
+        if not world_id:
+            writer.close()
+            return None
         
-        # Aplica estatísticas da classe e raça
-        stats = {}
-        player_stats = {}
-        if player_data:
-            player_stats = player_data.get('stats', {})
+        world = world_manager.get_world(world_id)
+        room_id = world.start_room if world else None
+        if not room_id:
+            writer.close()
+            return None
         
-        if class_id and race_id:
-            cls = class_system.get_class(class_id)
-            if cls:
-                stats = class_system.apply_race_bonuses(cls.base_stats, race_id)
-                # Adiciona itens iniciais
-                if player_data:
-                    if not player_stats.get('inventory'):
-                        # Primeiro login, adiciona itens iniciais
-                        stats['inventory'] = cls.starting_items.copy()
-                        stats['gold'] = cls.starting_gold
-                    else:
-                        stats['inventory'] = player_stats.get('inventory', [])
-                        stats['gold'] = player_stats.get('gold', 0)
-        else:
-            # Se não tem classe/raça ainda, carrega stats básicos do banco
-            if player_data:
-                stats['hp'] = player_stats.get('hp', 100)
-                stats['max_hp'] = player_stats.get('max_hp', 100)
-                stats['current_hp'] = player_stats.get('hp', player_stats.get('current_hp', 100))
-                stats['level'] = player_stats.get('level', 1)
-                stats['experience'] = player_stats.get('experience', 0)
-                stats['attack'] = player_stats.get('attack', 10)
-                stats['defense'] = player_stats.get('defense', 5)
-                stats['inventory'] = player_stats.get('inventory', [])
-                stats['gold'] = player_stats.get('gold', 0)
-                stats['equipment'] = player_stats.get('equipment', {})
+        # Criação de personagem (classe, raça, gênero)
+        class_id, race_id, gender_id = await create_character(writer, reader, class_system)
+        if not class_id or not race_id or not gender_id:
+            writer.write(f"{ANSI.RED}Criação de personagem cancelada. Desconectando...{ANSI.RESET}\r\n".encode())
+            await writer.drain()
+            writer.close()
+            return None
         
-        # Preserva quests e progresso do banco (sempre)
+        # Cria jogador no banco com classe/raça/gênero
+        database.create_player(player_name, world_id, room_id, class_id, race_id, gender_id)
+        player_data = database.new_player_data(player_name, world_id, room_id, class_id, race_id, gender_id)
+    
+    class_id = player_data.get('class_id', '') if player_data else ''
+    race_id = player_data.get('race_id', '') if player_data else ''
+    gender_id = player_data.get('gender_id', '') if player_data else ''
+    
+    # Aplica estatísticas da classe e raça
+    stats = {}
+    player_stats = {}
+    if player_data:
+        player_stats = player_data.get('stats', {})
+    
+    if class_id and race_id:
+        cls = class_system.get_class(class_id)
+        if cls:
+            stats = class_system.apply_race_bonuses(cls.base_stats, race_id)
+            # Adiciona itens iniciais
+            if player_data:
+                if not player_stats.get('inventory'):
+                    # Primeiro login, adiciona itens iniciais
+                    stats['inventory'] = cls.starting_items.copy()
+                    stats['gold'] = cls.starting_gold
+                else:
+                    stats['inventory'] = player_stats.get('inventory', [])
+                    stats['gold'] = player_stats.get('gold', 0)
+    else:
+        # Se não tem classe/raça ainda, carrega stats básicos do banco
         if player_data:
-            stats['active_quests'] = player_stats.get('active_quests', [])
-            stats['quest_progress'] = player_stats.get('quest_progress', {})
-            stats['completed_quests'] = player_stats.get('completed_quests', [])
-            
-            # Preserva magias e perks
-            stats['known_spells'] = player_stats.get('known_spells', {})
-            stats['equipped_spells'] = player_stats.get('equipped_spells', [])
-            stats['active_perks'] = player_stats.get('active_perks', [])
-            stats['spell_cooldowns'] = player_stats.get('spell_cooldowns', {})
-            stats['unspent_points'] = player_stats.get('unspent_points', 0)
-            
-            # Preserva stamina
-            stats['current_stamina'] = player_stats.get('current_stamina', player_stats.get('max_stamina', 100))
-            stats['max_stamina'] = player_stats.get('max_stamina', 100)
-            
-            # Preserva outros stats importantes
-            if player_stats.get('hp') and 'current_hp' not in stats:
-                stats['current_hp'] = player_stats.get('hp')
-            if player_stats.get('max_hp') and 'max_hp' not in stats:
-                stats['max_hp'] = player_stats.get('max_hp')
-            if player_stats.get('level') and 'level' not in stats:
-                stats['level'] = player_stats.get('level')
-            if player_stats.get('experience') and 'experience' not in stats:
-                stats['experience'] = player_stats.get('experience')
-            if player_stats.get('attack') and 'attack' not in stats:
-                stats['attack'] = player_stats.get('attack')
-            if player_stats.get('defense') and 'defense' not in stats:
-                stats['defense'] = player_stats.get('defense')
-            if player_stats.get('equipment') and 'equipment' not in stats:
-                stats['equipment'] = player_stats.get('equipment', {})
-            if player_stats.get('has_seen_lore'):
-                stats['has_seen_lore'] = player_stats.get('has_seen_lore', False)
-        
-        # Adiciona jogador ao jogo
-        player = game.add_player(player_name, world_id, room_id, writer, reader, 
-                                 class_id=class_id, race_id=race_id, gender_id=gender_id,
-                                 stats=stats)
-        
-        # Notifica entrada do jogador
-        await game.broadcast_to_room(
-            player.world_id,
-            player.room_id,
-            f"{player_name} entrou no jogo.",
-            exclude_player=player_name
-        )
-        
-        # Cria handler de comandos
-        handler = CommandHandler(game, world_manager, database, game_data, lore_manager, quest_manager, world_lore_manager, dungeon_manager)
-        
-        # Verifica se é novo jogador (primeira vez conectando) - APENAS se nunca viu a lore
-        player_stats = player_data.get('stats', {}) if player_data else {}
-        has_seen_lore = player_stats.get('has_seen_lore', False)
-        is_new_player = not has_seen_lore
+            stats['hp'] = player_stats.get('hp', 100)
+            stats['max_hp'] = player_stats.get('max_hp', 100)
+            stats['current_hp'] = player_stats.get('hp', player_stats.get('current_hp', 100))
+            stats['level'] = player_stats.get('level', 1)
+            stats['experience'] = player_stats.get('experience', 0)
+            stats['attack'] = player_stats.get('attack', 10)
+            stats['defense'] = player_stats.get('defense', 5)
+            stats['inventory'] = player_stats.get('inventory', [])
+            stats['gold'] = player_stats.get('gold', 0)
+            stats['equipment'] = player_stats.get('equipment', {})
+    
+    # Preserva quests e progresso do banco (sempre)
+    if player_data:
+        stats['active_quests'] = player_stats.get('active_quests', [])
+        stats['quest_progress'] = player_stats.get('quest_progress', {})
+        stats['completed_quests'] = player_stats.get('completed_quests', [])
         
-        # Mostra lore APENAS se for a primeira vez
-        if is_new_player:
-            lore_text = world_lore_manager.format_world_lore(player.world_id)
-            if lore_text:
-                await handler.send_message(player, lore_text)
-                await handler.send_message(player, f"\r\n{ANSI.BRIGHT_YELLOW}Deseja ler esta introdução novamente? Use o comando 'lore' ou 'world'.{ANSI.RESET}\r\n")
-                await handler.send_message(player, f"{ANSI.BRIGHT_GREEN}Pressione Enter para continuar...{ANSI.RESET}\r\n")
-                
-                # Aguarda Enter para continuar
-                try:
-                    await asyncio.wait_for(player.reader.readline(), timeout=60.0)
-                except asyncio.TimeoutError:
-                    pass
-                
-                # Marca como tendo visto a lore no banco de dados
-                current_player_data = database.get_player(player_name)
-                if current_player_data:
-                    current_stats = current_player_data.get('stats', {}).copy()
-                    current_stats['has_seen_lore'] = True
-                    database.update_player_stats(player_name, current_stats)
-                else:
-                    # Se não existe ainda, cria stats básicos
-                    new_stats = {'has_seen_lore': True}
-                    database.update_player_stats(player_name, new_stats)
+        # Preserva magias e perks
+        stats['known_spells'] = player_stats.get('known_spells', {})
+        stats['equipped_spells'] = player_stats.get('equipped_spells', [])
+        stats['active_perks'] = player_stats.get('active_perks', [])
+        stats['spell_cooldowns'] = player_stats.get('spell_cooldowns', {})
+        stats['unspent_points'] = player_stats.get('unspent_points', 0)
         
-        # Mensagem de boas-vindas ao servidor
-        # Conta players online (incluindo o que acabou de conectar)
-        online_count = len(game.players)
-        developers = ["Luan Schons Griebler"]
+        # Preserva stamina
+        stats['current_stamina'] = player_stats.get('current_stamina', player_stats.get('max_stamina', 100))
+        stats['max_stamina'] = player_stats.get('max_stamina', 100)
         
-        # Calcula espaçamento para centralizar melhor
-        title = "Bem-vindo ao OpenMud Dungeon Server!"
-        greeting = f"Olá, {player_name}!"
-        online_text = f"Jogadores Online: {online_count}"
-        dev_text = ", ".join(developers)
-        dev_line = f"Desenvolvido por: {dev_text}"
+        # Preserva outros stats importantes
+        if player_stats.get('hp') and 'current_hp' not in stats:
+            stats['current_hp'] = player_stats.get('hp')
+        if player_stats.get('max_hp') and 'max_hp' not in stats:
+            stats['max_hp'] = player_stats.get('max_hp')
+        if player_stats.get('level') and 'level' not in stats:
+            stats['level'] = player_stats.get('level')
+        if player_stats.get('experience') and 'experience' not in stats:
+            stats['experience'] = player_stats.get('experience')
+        if player_stats.get('attack') and 'attack' not in stats:
+            stats['attack'] = player_stats.get('attack')
+        if player_stats.get('defense') and 'defense' not in stats:
+            stats['defense'] = player_stats.get('defense')
+        if player_stats.get('equipment') and 'equipment' not in stats:
+            stats['equipment'] = player_stats.get('equipment', {})
+        if player_stats.get('has_seen_lore'):
+            stats['has_seen_lore'] = player_stats.get('has_seen_lore', False)
+    
+    # Adiciona jogador ao jogo
+    player = game.add_player(player_name, world_id, room_id, writer, reader, 
+                             class_id=class_id, race_id=race_id, gender_id=gender_id,
+                             stats=stats)
+    player.viewed_lores = load.viewed_lores
+    
+    # Notifica entrada do jogador
+    await game.broadcast_to_room(
+        player.world_id,
+        player.room_id,
+        f"{player_name} entrou no jogo.",
+        exclude_player=player_name
+    )
+    
+    # Cria handler de comandos
+    handler = CommandHandler(game, world_manager, database, game_data, lore_manager, quest_manager, world_lore_manager, dungeon_manager)
+
+    game.command_handlers[player_name] = handler
+    
+    # Verifica se é novo jogador (primeira vez conectando) - APENAS se nunca viu a lore
+    player_stats = player_data.get('stats', {}) if player_data else {}
+    has_seen_lore = player_stats.get('has_seen_lore', False)
+    is_new_player = not has_seen_lore
+    
+    # Mostra lore APENAS se for a primeira vez
+    if is_new_player:
+        lore_text = world_lore_manager.format_world_lore(player.world_id)
+        if lore_text:
+            await handler.send_message(player, lore_text)
+            await handler.send_message(player, f"\r\n{ANSI.BRIGHT_YELLOW}Deseja ler esta introdução novamente? Use o comando 'lore' ou 'world'.{ANSI.RESET}\r\n")
+            await handler.send_message(player, f"{ANSI.BRIGHT_GREEN}Pressione Enter para continuar...{ANSI.RESET}\r\n")
+            
+            # Aguarda Enter para continuar
+            try:
+                await asyncio.wait_for(player.reader.readline(), timeout=60.0)
+            except asyncio.TimeoutError:
+                pass
+            
+            # Marca como tendo visto a lore no banco de dados (atualização parcial)
+            game.journal.record(player_name, {'has_seen_lore': True})
+    
+    # Mensagem de boas-vindas ao servidor
+    # Conta players online (incluindo o que acabou de conectar)
+    online_count = len(game.players)
+    greeting = f"Olá, {player_name}!"
+    online_text = f"Jogadores Online: {online_count}"
+    
+    # Banner na largura do terminal: bordas, título e créditos vêm prontos do registro de telas,
+    # só a saudação e o contador de jogadores são montados aqui
+    max_width = min(BANNER_MAX_WIDTH, capabilities_of(writer).layout_width) - 2
+    welcome_banner = screens.for_writer('banner.top', writer)
+    welcome_banner += banner_line(max_width, greeting, f"{ANSI.BRIGHT_YELLOW}{greeting}").encode()
+    welcome_banner += screens.for_writer('banner.spacer', writer)
+    welcome_banner += banner_line(max_width, online_text, f"{ANSI.BRIGHT_WHITE}Jogadores Online: {ANSI.BRIGHT_GREEN}{online_count}").encode()
+    welcome_banner += screens.for_writer('banner.bottom', writer)
+    
+    await handler.send_bytes(player, welcome_banner)
+    await handler.cmd_look(player)
+    help_hint = f"{ANSI.BRIGHT_YELLOW}Digite 'help' para ver os comandos disponíveis.{ANSI.RESET}\r\n"
+    await handler.send_message(player, help_hint)
+    
+    return player, handler
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, game: MUDGame, world_manager: WorldManager, database: StorageBackend, game_data, lore_manager, quest_manager, class_system: ClassSystem, world_lore_manager: WorldLoreManager, dungeon_manager: DungeonManager):
+    """Gerencia conexão de um cliente"""
+    addr = writer.get_extra_info('peername')
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] Nova conexão TCP recebida de {addr}")
+    
+    # Envia uma mensagem de boas-vindas imediata para testar a conexão
+    try:
+        writer.write(screens.for_writer('welcome', writer))
+        await writer.drain()
+    except Exception as e:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Erro ao enviar mensagem de boas-vindas: {e}")
+        writer.close()
+        return
+    
+    try:
+        # Autenticação (login/registro)
+        auth_success, username, load = await authenticate(writer, reader, database, game.has_session)
+        if not auth_success:
+            writer.write(f"{ANSI.RED}Falha na autenticação. Desconectando...{ANSI.RESET}\r\n".encode())
+            await writer.drain()
+            writer.close()
+            return
         
-        max_width = 58
-        title_pad = (max_width - len(title)) // 2
-        greeting_pad = (max_width - len(greeting)) // 2
-        online_pad = (max_width - len(online_text)) // 2
-        dev_pad = (max_width - len(dev_line)) // 2
+        player_name = username
         
-        welcome_banner = f"\r\n{ANSI.BOLD}{ANSI.BRIGHT_CYAN}{'═' * 60}{ANSI.RESET}\r\n"
-        welcome_banner += f"{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}{' ' * 58}{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}\r\n"
-        welcome_banner += f"{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}{' ' * title_pad}{ANSI.BRIGHT_CYAN}{title}{ANSI.RESET}{' ' * (max_width - len(title) - title_pad)}{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}\r\n"
-        welcome_banner += f"{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}{' ' * 58}{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}\r\n"
-        welcome_banner += f"{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}{' ' * greeting_pad}{ANSI.BRIGHT_YELLOW}{greeting}{ANSI.RESET}{' ' * (max_width - len(greeting) - greeting_pad)}{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}\r\n"
-        welcome_banner += f"{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}{' ' * 58}{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}\r\n"
-        welcome_banner += f"{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}{' ' * online_pad}{ANSI.BRIGHT_WHITE}Jogadores Online: {ANSI.BRIGHT_GREEN}{online_count}{ANSI.RESET}{' ' * (max_width - len(online_text) - online_pad)}{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}\r\n"
-        welcome_banner += f"{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}{' ' * 58}{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}\r\n"
-        welcome_banner += f"{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}{' ' * dev_pad}{ANSI.BRIGHT_MAGENTA}{dev_line}{ANSI.RESET}{' ' * (max_width - len(dev_line) - dev_pad)}{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}\r\n"
-        welcome_banner += f"{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}{' ' * 58}{ANSI.BOLD}{ANSI.BRIGHT_GREEN}║{ANSI.RESET}\r\n"
-        welcome_banner += f"{ANSI.BOLD}{ANSI.BRIGHT_CYAN}{'═' * 60}{ANSI.RESET}\r\n\r\n"
+        # Sessão em estado link-dead (ou ainda aberta em outra conexão): reanexa sem recarregar
+        resumed = game.resume_player(player_name, writer, reader)
+        if resumed:
+            player, handler = resumed
+            await handler.send_message(player, f"{ANSI.BRIGHT_GREEN}Conexão restaurada. Bem-vindo de volta, {player_name}!{ANSI.RESET}")
+            await game.broadcast_to_room(
+                player.world_id,
+                player.room_id,
+                f"{player_name} reconectou.",
+                exclude_player=player_name
+            )
+            await handler.cmd_look(player)
+        else:
+            if not load.player_loaded:
+                # A sessão expirou enquanto o login autenticava: carrega do banco
+                load.player = await asyncio.to_thread(database.get_player, player_name)
+                if load.player:
+                    load.viewed_lores = await asyncio.to_thread(database.get_viewed_lores, player_name)
+            entered = await enter_game(reader, writer, game, player_name, load, world_manager, database, game_data, lore_manager, quest_manager, class_system, world_lore_manager, dungeon_manager)
+            if not entered:
+                return
+            player, handler = entered
         
-        await handler.send_message(player, welcome_banner)
-        await handler.cmd_look(player)
-        help_hint = f"{ANSI.BRIGHT_YELLOW}Digite 'help' para ver os comandos disponíveis.{ANSI.RESET}\r\n"
-        await handler.send_message(player, help_hint)
+        # Entrada do jogador passa por uma fila limitada e por baldes de tokens por categoria
+        input_queue = asyncio.Queue(maxsize=INPUT_QUEUE_MAX)
+        input_task = asyncio.create_task(read_input_lines(reader, writer, input_queue))
+        rate_limiter = SessionRateLimiter()
+        timed_out = False
         
         # Loop principal de comandos
         while True:
-            # Sempre envia \r\n antes do prompt para garantir que o cliente MUD
-            # reconheça o final da linha e reposicione corretamente o cursor
-            prompt = f"\r\n{ANSI.BRIGHT_GREEN}>{ANSI.RESET} "
-            writer.write(prompt.encode())
-            await writer.drain()
+            # Dados estruturados (GMCP) que mudaram com o último comando
+            gmcp.sync_player(player, handler)
+            # Saída do último comando e prompt (com os vitais) numa única escrita;
+            # se ainda há animação agendada, o prompt sai depois dela
+            await handler.flush_output(player, prompts.render(player))
             
             # Se o jogador está AFK, não desconecta por timeout (timeout muito longo)
             timeout = 86400.0 if (hasattr(player, 'is_afk') and player.is_afk) else 300.0
             
             try:
-                data = await asyncio.wait_for(reader.readline(), timeout=timeout)
+                data = await asyncio.wait_for(input_queue.get(), timeout=timeout)
                 if not data:
                     break
                 
-                command = data.decode().strip()
+                command = data.decode(errors='replace').strip()
+                handler.begin_output(player)
                 if command:
+                    # Controle de taxa: espera pelo token (até MAX_DEFER) ou descarta o comando
+                    category = handler.get_command_category(player, command)
+                    wait_time = rate_limiter.acquire(category)
+                    if wait_time > MAX_DEFER:
+                        rate_limiter.shed(category)
+                        await handler.send_message(player, f"{ANSI.YELLOW}Devagar! Comando ignorado por excesso de envios.{ANSI.RESET}")
+                        continue
+                    if wait_time > 0:
+                        await asyncio.sleep(wait_time)
+                        rate_limiter.force(category)
+                    
                     # Se estava AFK e digitou algo, remove o status AFK
                     if hasattr(player, 'is_afk') and player.is_afk:
                         player.is_afk = False
@@ -483,6 +727,7 @@ async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWrit
                 # Só desconecta se não estiver AFK
                 if not (hasattr(player, 'is_afk') and player.is_afk):
                     writer.write(f"\r\n{ANSI.YELLOW}Tempo de inatividade excedido. Desconectando...{ANSI.RESET}\r\n".encode())
+                    timed_out = True
                     break
                 # Se estiver AFK, continua o loop (não desconecta)
                 continue
@@ -494,44 +739,47 @@ async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWrit
     except Exception as e:
         print(f"[{datetime.now().strftime('%H:%M:%S')}] Erro com {addr}: {e}")
     finally:
+        if 'input_task' in locals():
+            input_task.cancel()
         player_name = locals().get('player_name', None) or addr
         print(f"[{datetime.now().strftime('%H:%M:%S')}] {player_name} desconectou")
-        if 'player' in locals() and player.name in game.players:
-            await game.broadcast_to_room(
-                player.world_id,
-                player.room_id,
-                f"{player.name} desconectou.",
-                exclude_player=player.name
-            )
-            # Salva estado final
-            database.update_player_location(player.name, player.world_id, player.room_id)
-            stats = {
-                'hp': player.current_hp,
-                'max_hp': player.max_hp,
-                'current_stamina': player.current_stamina,
-                'max_stamina': player.max_stamina,
-                'level': player.level,
-                'experience': player.experience,
-                'attack': player.attack,
-                'defense': player.defense,
-                'gold': player.gold,
-                'inventory': player.inventory,
-                'equipment': player.equipment,
-                'active_quests': player.active_quests,
-                'quest_progress': player.quest_progress,
-            'completed_quests': player.completed_quests,
-            'known_spells': player.known_spells,
-            'equipped_spells': player.equipped_spells,
-            'active_perks': player.active_perks,
-            'spell_cooldowns': player.spell_cooldowns,
-            'unspent_points': player.unspent_points,
-            'channels': player.channels if hasattr(player, 'channels') else ["local"]
-        }
-            database.update_player_stats(player.name, stats)
-            game.remove_player(player.name)
+        # Só a conexão que ainda controla o jogador salva/remove (outra pode ter assumido a sessão)
+        if 'player' in locals() and player.writer is writer and player.name in game.players:
+            if not locals().get('timed_out', True):
+                # Queda de conexão: mantém o jogador em memória durante o período de graça
+                await game.park_player(player)
+            else:
+                await game.broadcast_to_room(
+                    player.world_id,
+                    player.room_id,
+                    f"{player.name} desconectou.",
+                    exclude_player=player.name
+                )
+                # Salva estado final
+                game.save_player(player)
+                game.remove_player(player.name)
         writer.close()
         await writer.wait_closed()
 
+async def start_embedded_web(client_handler) -> list:
+    """
+    Inicia o cliente web dentro do processo do jogo.
+    Conexões WebSocket são entregues ao handle_client por um StreamReader/Writer
+    adaptado, evitando a conexão TCP extra do web_server.py.
+    """
+    try:
+        ws_server = await InProcessGateway(client_handler).start(HOST, WS_PORT)
+    except ImportError:
+        print("✗ Pacote 'websockets' não instalado. Cliente web embutido desativado.")
+        return []
+    print(f"✓ WebSocket (in-process) em {HOST}:{WS_PORT}")
+    
+    cache = StaticAssetCache('web')
+    cache.load()
+    http_server = await StaticHTTPServer(cache).start(HOST, WEB_PORT)
+    print(f"✓ Cliente web (HTTP) em {HOST}:{WEB_PORT}")
+    return [ws_server, http_server]
+
 async def main():
     """Função principal do servidor"""
     print("=" * 50)
@@ -540,7 +788,9 @@ async def main():
     
     # Inicializa componentes
     print("Inicializando banco de dados...")
-    database = Database()
+    database = create_storage()
+    journal = PlayerJournal(database, default_journal_path(database))
+    journal.recover()
     
     print("Carregando mundos...")
     world_manager = WorldManager()
@@ -568,7 +818,14 @@ async def main():
     print(f"Classes disponíveis: {len(class_system.classes)}")
     print(f"Raças disponíveis: {len(class_system.races)}")
     
-    game = MUDGame(world_manager, database)
+    # Telas estáticas (login, criação, mundos, banner, ajuda) renderizadas uma vez no boot
+    screens.register('worlds', lambda: render_world_menu(world_manager))
+    register_creation_screens(class_system)
+    screens.warm()
+    print(f"Telas pré-renderizadas: {len(screens)}")
+    
+    game = MUDGame(world_manager, database, journal)
+    publish_limits()
     
     async def stamina_regeneration_task():
         """Task que regenera stamina de todos os players a cada 3 segundos"""
@@ -593,6 +850,7 @@ async def main():
                         player.restore_stamina(regen_amount)
                         # Atualiza timestamp
                         player._last_stamina_regen = current_time - (time_passed % 3.0)
+                        gmcp.sync_vitals(player)
                         
                         # Nota: Stamina será salva quando o player se desconectar ou fizer ações importantes
                         # Não precisamos salvar a cada regeneração para evitar sobrecarga no banco
@@ -688,7 +946,7 @@ async def main():
                                 'unspent_points': player.unspent_points,
                                 'channels': player.channels if hasattr(player, 'channels') else ["local"]
                             }
-                            database.update_player_stats(player.name, stats)
+                            game.journal.record(player.name, stats)
                         except Exception as e:
                             # Se houver erro ao enviar mensagem (jogador desconectado), ignora
                             print(f"[Pomodoro] Erro ao processar Pomodoro para {player_name}: {e}")
@@ -697,6 +955,41 @@ async def main():
     # Inicia task de Pomodoro
     asyncio.create_task(pomodoro_task())
     
+    # Inicia task de compactação do journal
+    if journal.enabled:
+        asyncio.create_task(journal.run_compaction())
+    
+    # Inicia task de backups online (apenas para o banco SQLite)
+    db_path = getattr(database, 'db_path', None)
+    if db_path and BACKUP_INTERVAL > 0:
+        asyncio.create_task(run_backups(db_path))
+    
+    async def archival_task():
+        """Task que move jogadores inativos para o arquivo, em lotes pequenos"""
+        while True:
+            await asyncio.sleep(ARCHIVE_INTERVAL)
+            total = 0
+            while True:
+                # Nunca arquiva quem está no jogo, link-dead ou com stats pendentes no journal
+                exclude = set(game.players) | set(game.linkdead) | game.journal.pending_players()
+                try:
+                    # Mesma thread das gravações: não disputa o banco com o journal
+                    archived = await asyncio.wrap_future(
+                        write_in_background(database.archive_inactive_players, ARCHIVE_AFTER_DAYS, exclude)
+                    )
+                except Exception as e:
+                    print(f"[Archive] Erro ao arquivar jogadores: {e}")
+                    break
+                total += archived
+                if archived < ARCHIVE_BATCH:
+                    break
+            if total:
+                print(f"[Archive] {total} jogadores inativos arquivados")
+    
+    # Inicia task de arquivamento de jogadores inativos
+    if ARCHIVE_INTERVAL > 0:
+        asyncio.create_task(archival_task())
+    
     print(f"\n{'=' * 50}")
     print(f"Servidor OpenMud MUD iniciado!")
     print(f"{'=' * 50}")
@@ -713,10 +1006,13 @@ async def main():
     print(f"\nPressione Ctrl+C para encerrar")
     print("=" * 50)
     
+    web_servers = []
     try:
         print(f"\n[DEBUG] Iniciando servidor TCP em {HOST}:{PORT}...")
+        client_handler = lambda r, w: handle_client(r, w, game, world_manager, database, game_data, lore_manager, quest_manager, class_system, world_lore_manager, dungeon_manager)
+        # Conexões TCP passam pela camada telnet (negociação de opções e MCCP2)
         server = await asyncio.start_server(
-            lambda r, w: handle_client(r, w, game, world_manager, database, game_data, lore_manager, quest_manager, class_system, world_lore_manager, dungeon_manager),
+            lambda r, w: client_handler(*TelnetSession(r, w).streams()),
             HOST,
             PORT
         )
@@ -725,6 +1021,11 @@ async def main():
         addrs = ', '.join(str(sock.getsockname()) for sock in server.sockets)
         print(f"\n✓ Servidor escutando em: {addrs}")
         print(f"✓ Aceitando conexões TCP em {HOST}:{PORT}")
+        
+        # Cliente web dentro do processo (opcional): WebSocket alimenta handle_client diretamente
+        if EMBED_WEB:
+            web_servers = await start_embedded_web(client_handler)
+        
         print(f"✓ Servidor pronto para receber conexões!\n")
         
         async with server:
@@ -742,6 +1043,11 @@ async def main():
         import traceback
         traceback.print_exc()
         raise
+    finally:
+        for web_server in web_servers:
+            web_server.close()
+        # Aplica o que resta do journal antes de sair
+        journal.close()
 
 if __name__ == '__main__':
     try: